@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from contextlib import suppress
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from eidolon.api.dependencies import get_audit_store, get_graph_repository
+from eidolon.api.dependencies import close_app_state, init_app_state
 from eidolon.api.handlers import tasks
 from eidolon.api.middleware.auth import AuthMiddleware
+from eidolon.api.middleware.cors import ALLOWED_METHODS, WildcardCORSMiddleware
 from eidolon.api.middleware.rate_limit import RateLimitMiddleware
 from eidolon.api.routes import (
     agent,
@@ -24,9 +26,49 @@ from eidolon.api.routes import (
 )
 from eidolon.api.routes import settings as settings_router
 from eidolon.config.settings import get_settings
-from eidolon.runtime.task_events import task_event_bus
+from eidolon.runtime.task_events import task_event_bus, task_event_pump
+from eidolon.worker.audit_sink import AuditSink
 from eidolon.worker.retention import RetentionWorker
 
+# Paths served without identity resolution or rate limiting (liveness probes).
+_UNAUTHENTICATED_PATHS = frozenset({"/healthz"})
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Store construction probes Postgres and reads LLM settings; keep it off the loop.
+    await asyncio.to_thread(init_app_state, app.state)
+
+    # Audit writes off the request path, flushed in batches
+    audit_sink = AuditSink(app.state.audit_store)
+    audit_sink.start()
+    app.state.audit_sink = audit_sink
+
+    # Start retention worker to clean up old audit events
+    retention_worker = RetentionWorker(app.state.audit_store, retention_days=90)
+    retention_task = asyncio.create_task(retention_worker.run_forever(interval_hours=24))
+    app.state.retention_task = retention_task
+    try:
+        yield
+    finally:
+        retention_worker.stop()
+        retention_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await retention_task
+
+        # Stop scans before the stores they write to are closed
+        await asyncio.to_thread(collector.shutdown_scans)
+
+        # Deliver queued task events, then shut down streaming connections
+        await asyncio.to_thread(task_event_pump.close)
+        task_event_bus.shutdown()
+
+        # Flush pending audit events while the pool is still open
+        await asyncio.to_thread(audit_sink.close)
+
+        # Close graph repository and the Postgres pool
+        close_app_state(app.state)
+
 
 def create_app() -> FastAPI:
     settings = get_settings()
@@ -35,6 +77,7 @@ def create_app() -> FastAPI:
         title="Eidolon API",
         version="0.1.0",
         description="Evidence-backed infrastructure graph and agent runtime.",
+        lifespan=lifespan,
     )
 
     # Add routers first
@@ -53,28 +96,27 @@ def create_app() -> FastAPI:
 
     # Add middleware in reverse order (they execute in reverse)
     # CORS must be added LAST so it executes FIRST
-    app.add_middleware(RateLimitMiddleware, capacity=300, window_seconds=60)
-    app.add_middleware(AuthMiddleware)
+    app.add_middleware(
+        RateLimitMiddleware,
+        capacity=300,
+        window_seconds=60,
+        exempt_paths=_UNAUTHENTICATED_PATHS,
+    )
+    app.add_middleware(AuthMiddleware, settings=settings.auth, exempt_paths=_UNAUTHENTICATED_PATHS)
 
     # CORS middleware LAST = executes FIRST
     # For development: allow all origins without credentials
     # For production: specify exact origins in settings.api.cors_origins
     if "*" in settings.api.cors_origins:
-        # Development mode: wildcard origins, no credentials
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=settings.api.cors_origins,
-            allow_credentials=False,
-            allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-            allow_headers=["*"],
-        )
+        # Development mode: wildcard origins, no credentials, constant headers
+        app.add_middleware(WildcardCORSMiddleware)
     else:
         # Production mode: specific origins, allow credentials
         app.add_middleware(
             CORSMiddleware,
             allow_origins=settings.api.cors_origins,
             allow_credentials=True,
-            allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+            allow_methods=list(ALLOWED_METHODS),
             allow_headers=["*"],
         )
 
@@ -82,27 +124,6 @@ def create_app() -> FastAPI:
     def health() -> dict:
         return {"status": "ok"}
 
-    @app.on_event("startup")
-    async def startup() -> None:
-        # Start retention worker to clean up old audit events
-        audit_store = get_audit_store()
-        retention_worker = RetentionWorker(audit_store, retention_days=90)
-        app.state.retention_task = asyncio.create_task(
-            retention_worker.run_forever(interval_hours=24)
-        )
-
-    @app.on_event("shutdown")
-    def shutdown() -> None:
-        # Signal task event bus to shutdown streaming connections
-        task_event_bus.shutdown()
-
-        # Close graph repository
-        with suppress(Exception):
-            repo = get_graph_repository()
-            close = getattr(repo, "close", None)
-            if close:
-                close()
-
     return app
 
 
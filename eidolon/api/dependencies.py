@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-from functools import lru_cache
+from contextlib import suppress
+from functools import cache
 
-from fastapi import HTTPException, Request
+from fastapi import Depends, HTTPException, Request
+from starlette.datastructures import State
 
 from eidolon.config.settings import get_settings
 from eidolon.core.graph.neo4j import Neo4jGraphRepository
 from eidolon.core.graph.repository import GraphRepository
 from eidolon.core.reasoning.entity import EntityResolver
 from eidolon.core.reasoning.llm import LiteLLMClient
+from eidolon.core.reasoning.planner import Planner
 from eidolon.core.stores import (
     ApprovalStore,
     AuditStore,
@@ -22,88 +25,191 @@ from eidolon.core.stores import (
     SettingsStore,
 )
 from eidolon.db.postgres.store import (
+    ConnectionPool,
     PostgresApprovalStore,
     PostgresAuditStore,
     PostgresChatStore,
     PostgresScannerStore,
     PostgresSettingsStore,
+    create_pool,
+    open_pool,
     postgres_available,
 )
+from eidolon.runtime.executor import ExecutionEngine
+from eidolon.worker.audit_sink import AuditSink
 
 
-@lru_cache(maxsize=1)
-def get_graph_repository() -> GraphRepository:
+def build_graph_repository() -> GraphRepository:
     return Neo4jGraphRepository()
 
 
-@lru_cache(maxsize=1)
-def get_entity_resolver() -> EntityResolver:
-    return EntityResolver()
+def build_llm_client(settings_store: SettingsStore) -> LiteLLMClient:
+    app_settings = settings_store.get_app_settings()
+    return LiteLLMClient(settings=app_settings.llm)
 
 
-@lru_cache(maxsize=1)
-def get_llm_client() -> LiteLLMClient:
-    store = get_settings_store()
-    app_settings = store.get_app_settings()
-    return LiteLLMClient(settings=app_settings.llm)
+def build_planner(llm_client: LiteLLMClient) -> Planner:
+    return Planner(llm_client=llm_client)
+
+
+def build_execution_engine(repository: GraphRepository) -> ExecutionEngine:
+    return ExecutionEngine(repository, runtime_settings=get_settings().sandbox)
+
 
+def build_pg_pool() -> ConnectionPool | None:
+    if not postgres_available():
+        return None
+    return create_pool(get_settings().postgres)
 
-@lru_cache(maxsize=1)
-def get_audit_store() -> AuditStore:
-    settings = get_settings()
+
+def build_audit_store(pool: ConnectionPool | None) -> AuditStore:
     fallback = InMemoryAuditStore()
-    if postgres_available():
-        return PostgresAuditStore(settings.postgres.url, fallback=fallback)
+    if pool is not None:
+        return PostgresAuditStore(pool, fallback=fallback)
     return fallback
 
 
-@lru_cache(maxsize=1)
-def get_approval_store() -> ApprovalStore:
-    settings = get_settings()
+def build_approval_store(pool: ConnectionPool | None) -> ApprovalStore:
     fallback = InMemoryApprovalStore()
-    if postgres_available():
-        return PostgresApprovalStore(settings.postgres.url, fallback=fallback)
+    if pool is not None:
+        return PostgresApprovalStore(pool, fallback=fallback)
     return fallback
 
 
-@lru_cache(maxsize=1)
-def get_chat_store() -> ChatStore:
-    settings = get_settings()
+def build_chat_store(pool: ConnectionPool | None) -> ChatStore:
     fallback = InMemoryChatStore()
-    if postgres_available():
-        return PostgresChatStore(settings.postgres.url, fallback=fallback)
+    if pool is not None:
+        return PostgresChatStore(
+            pool,
+            fallback=fallback,
+            synchronous_commit=get_settings().postgres.chat_synchronous_commit,
+        )
     return fallback
 
 
-@lru_cache(maxsize=1)
-def get_settings_store() -> SettingsStore:
-    settings = get_settings()
-    if postgres_available():
-        return PostgresSettingsStore(settings.postgres.url)
+def build_settings_store(pool: ConnectionPool | None) -> SettingsStore:
+    if pool is not None:
+        return PostgresSettingsStore(pool)
     # Fallback: return in-memory that always returns defaults
     store = InMemorySettingsStore()
-    store.update_settings(settings.sandbox)
+    store.update_settings(get_settings().sandbox)
     return store
 
 
-@lru_cache(maxsize=1)
-def get_scanner_store() -> ScannerStore:
-    settings = get_settings()
+def build_scanner_store(pool: ConnectionPool | None) -> ScannerStore:
     fallback = InMemoryScannerStore()
-    if postgres_available():
-        return PostgresScannerStore(settings.postgres.url, fallback=fallback)
+    if pool is not None:
+        return PostgresScannerStore(pool, fallback=fallback)
     return fallback
 
 
+def init_app_state(state: State) -> None:
+    """Build the shared repository, stores and clients onto ``state`` at startup.
+
+    Everything is constructed eagerly so no request pays cold-start costs or races
+    another request into a second construction.
+    """
+    pool = build_pg_pool()
+    if pool is not None:
+        open_pool(pool)
+    state.pg_pool = pool
+    state.graph_repository = build_graph_repository()
+    state.entity_resolver = EntityResolver()
+    state.execution_engine = build_execution_engine(state.graph_repository)
+    state.audit_store = build_audit_store(pool)
+    state.approval_store = build_approval_store(pool)
+    state.chat_store = build_chat_store(pool)
+    state.settings_store = build_settings_store(pool)
+    state.scanner_store = build_scanner_store(pool)
+    state.llm_client = build_llm_client(state.settings_store)
+    state.planner = build_planner(state.llm_client)
+
+
+def close_app_state(state: State) -> None:
+    with suppress(Exception):
+        close = getattr(state.graph_repository, "close", None)
+        if close:
+            close()
+    if state.pg_pool is not None:
+        state.pg_pool.close()
+
+
+# Dependencies are ``async def`` attribute reads so FastAPI resolves them on the event
+# loop instead of dispatching a threadpool hop per request.
+
+
+async def get_graph_repository(request: Request) -> GraphRepository:
+    return request.app.state.graph_repository
+
+
+async def get_entity_resolver(request: Request) -> EntityResolver:
+    return request.app.state.entity_resolver
+
+
+async def get_llm_client(request: Request) -> LiteLLMClient:
+    return request.app.state.llm_client
+
+
+# The app-scoped planner and engine are only reused when they were built from the
+# resolved upstream dependency, so overriding that dependency still takes effect.
+_GRAPH_REPOSITORY = Depends(get_graph_repository)
+_LLM_CLIENT = Depends(get_llm_client)
+
+
+async def get_execution_engine(
+    request: Request, repository: GraphRepository = _GRAPH_REPOSITORY
+) -> ExecutionEngine:
+    engine: ExecutionEngine = request.app.state.execution_engine
+    if engine.repository is not repository:
+        return build_execution_engine(repository)
+    # Tools are built once per app; the todo list is per request
+    return engine.for_request()
+
+
+async def get_planner(request: Request, llm_client: LiteLLMClient = _LLM_CLIENT) -> Planner:
+    planner: Planner = request.app.state.planner
+    if planner.llm_client is not llm_client:
+        return build_planner(llm_client)
+    return planner
+
+
+async def get_audit_store(request: Request) -> AuditStore:
+    return request.app.state.audit_store
+
+
+async def get_audit_sink(request: Request) -> AuditSink:
+    return request.app.state.audit_sink
+
+
+async def get_approval_store(request: Request) -> ApprovalStore:
+    return request.app.state.approval_store
+
+
+async def get_chat_store(request: Request) -> ChatStore:
+    return request.app.state.chat_store
+
+
+async def get_settings_store(request: Request) -> SettingsStore:
+    return request.app.state.settings_store
+
+
+async def get_scanner_store(request: Request) -> ScannerStore:
+    return request.app.state.scanner_store
+
+
+@cache
 def require_roles(*roles: str):
-    def _dependency(request: Request):
+    # Cached so routes asking for the same roles share one dependency callable
+    required = frozenset(roles)
+
+    async def _dependency(request: Request):
         auth_error = getattr(request.state, "auth_error", None)
         if auth_error:
             raise HTTPException(status_code=401, detail=str(auth_error))
         identity = getattr(request.state, "identity", None)
         if not identity:
             raise HTTPException(status_code=403, detail="missing identity")
-        if not any(identity.has_role(role) for role in roles):
+        if required.isdisjoint(identity.roles):
             raise HTTPException(status_code=403, detail="insufficient role")
         return identity
 
@@ -1,43 +1,65 @@
 from __future__ import annotations
 
 import asyncio
-import json
 from collections.abc import AsyncGenerator
 
+import orjson
 from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 
 from eidolon.api.dependencies import require_roles
 from eidolon.api.middleware.auth import IdentityContext
-from eidolon.runtime.task_events import task_event_bus
+from eidolon.runtime.task_events import TaskEvent, task_event_bus
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 _TASK_STREAM_IDENTITY = Depends(require_roles("viewer", "planner", "executor"))
 
 
+def _frame(event: TaskEvent) -> bytes:
+    return b"data: " + event.serialized + b"\n\n"
+
+
 async def _stream() -> AsyncGenerator[bytes, None]:
     subscriber = task_event_bus.subscribe_async()
     try:
-        # Send history first
-        for event in task_event_bus.history():
-            payload = json.dumps(event.to_payload())
-            yield f"data: {payload}\n\n".encode()
+        # Send history first, as a single body chunk rather than one send per event
+        history = b"".join(_frame(event) for event in task_event_bus.history())
+        if history:
+            yield history
 
         # Stream live events with proper cancellation support
         while True:
             try:
-                # Wait for event with timeout for keepalive
-                event = await asyncio.wait_for(subscriber.get(), timeout=15.0)
-
-                # None is shutdown sentinel
-                if event is None:
-                    break
-
-                payload = json.dumps(event.to_payload())
-                yield f"data: {payload}\n\n".encode()
+                # Wait for event with timeout for keepalive. asyncio.timeout only arms a
+                # timer on the current task, unlike wait_for which wraps get() in a new one.
+                async with asyncio.timeout(15.0):
+                    event = await subscriber.get()
             except TimeoutError:
                 # Send keepalive to prevent client timeout
                 yield b": keepalive\n\n"
+                continue
+
+            # None is shutdown sentinel
+            if event is None:
+                break
+
+            # Coalesce a burst: anything already queued goes out in the same write
+            chunk = bytearray()
+            dropped = subscriber.take_dropped()
+            if dropped:
+                # Tell the client it fell behind so it can reload history
+                chunk += b"event: overflow\ndata: " + orjson.dumps({"dropped": dropped}) + b"\n\n"
+            chunk += _frame(event)
+            shutting_down = False
+            while not subscriber.empty():
+                queued = subscriber.get_nowait()
+                if queued is None:
+                    shutting_down = True
+                    break
+                chunk += _frame(queued)
+            yield bytes(chunk)
+            if shutting_down:
+                break
     except asyncio.CancelledError:
         # Client disconnected or server shutting down - clean exit
         pass
@@ -6,15 +6,17 @@ import hashlib
 import hmac
 import json
 import time
-from collections.abc import Mapping
+from collections import OrderedDict
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from eidolon.config.settings import AuthSettings, get_settings
 
+RawHeaders = Sequence[tuple[bytes, bytes]]
+
 
 @dataclass
 class IdentityContext:
@@ -44,6 +46,37 @@ def _b64url_decode(segment: str) -> bytes:
     return base64.urlsafe_b64decode(padded.encode("utf-8"))
 
 
+def _raw_header(headers: RawHeaders, name: bytes) -> str | None:
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _raw_bearer_token(headers: RawHeaders) -> str | None:
+    """Pull the bearer token straight from ASGI ``(name, value)`` byte pairs."""
+    for key, value in headers:
+        if key == b"authorization":
+            # Any whitespace run separates the scheme, as with str.split() in
+            # extract_bearer_token
+            parts = value.split(None, 1)
+            if len(parts) == 2 and parts[0].lower() == b"bearer":
+                token = parts[1].strip()
+                if len(token.split(None, 1)) == 1:
+                    return token.decode("latin-1")
+            return None
+    return None
+
+
+def _as_raw_headers(headers: Mapping[str, str]) -> RawHeaders:
+    raw = getattr(headers, "raw", None)
+    if raw is not None:
+        return raw
+    return [
+        (key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()
+    ]
+
+
 def extract_bearer_token(headers: Mapping[str, str]) -> str | None:
     auth_header = headers.get("authorization") or headers.get("Authorization")
     if not auth_header:
@@ -54,8 +87,18 @@ def extract_bearer_token(headers: Mapping[str, str]) -> str | None:
     return None
 
 
-def _verify_jwt(token: str, settings: AuthSettings) -> dict[str, Any]:
-    if not settings.jwt_secret:
+def _check_validity_window(payload: dict[str, Any]) -> None:
+    now = int(time.time())
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and int(exp) < now:
+        raise AuthError("token expired")
+    nbf = payload.get("nbf")
+    if isinstance(nbf, (int, float)) and int(nbf) > now:
+        raise AuthError("token not yet valid")
+
+
+def _verify_jwt(token: str, settings: AuthSettings, secret: bytes) -> dict[str, Any]:
+    if not secret:
         raise AuthError("JWT secret not configured")
     parts = token.split(".")
     if len(parts) != 3:
@@ -68,21 +111,12 @@ def _verify_jwt(token: str, settings: AuthSettings) -> dict[str, Any]:
     if header.get("alg") != "HS256":
         raise AuthError("unsupported JWT algorithm")
     signing_input = f"{parts[0]}.{parts[1]}".encode()
-    expected_sig = hmac.new(
-        settings.jwt_secret.encode("utf-8"),
-        signing_input,
-        hashlib.sha256,
-    ).digest()
+    # One-shot C/OpenSSL HMAC; avoids building a Python HMAC object per token
+    expected_sig = hmac.digest(secret, signing_input, "sha256")
     actual_sig = _b64url_decode(parts[2])
     if not hmac.compare_digest(actual_sig, expected_sig):
         raise AuthError("invalid token signature")
-    now = int(time.time())
-    exp = payload.get("exp")
-    if isinstance(exp, (int, float)) and int(exp) < now:
-        raise AuthError("token expired")
-    nbf = payload.get("nbf")
-    if isinstance(nbf, (int, float)) and int(nbf) > now:
-        raise AuthError("token not yet valid")
+    _check_validity_window(payload)
     if settings.jwt_issuer and payload.get("iss") != settings.jwt_issuer:
         raise AuthError("token issuer mismatch")
     if settings.jwt_audience:
@@ -95,42 +129,112 @@ def _verify_jwt(token: str, settings: AuthSettings) -> dict[str, Any]:
     return payload
 
 
+_VERIFIED_TOKEN_CACHE_SIZE = 4096
+
+IdentityResult = tuple[IdentityContext | None, str | None]
+IdentityResolver = Callable[[RawHeaders, str | None], IdentityResult]
+
+# Shared identity for auth mode "none"; handlers treat identities as read-only.
+ANONYMOUS_IDENTITY = IdentityContext(user_id="anonymous", roles=["viewer", "planner", "executor"])
+
+
+def build_identity_resolver(settings: AuthSettings) -> IdentityResolver:
+    """Return a resolver specialized for the configured auth mode."""
+    if settings.mode == "none":
+
+        def _resolve_anonymous(headers: RawHeaders, token: str | None = None) -> IdentityResult:
+            return ANONYMOUS_IDENTITY, None
+
+        return _resolve_anonymous
+
+    if settings.mode == "header":
+        # ASGI header names are lowercase bytes
+        user_id_header = settings.header_user_id.lower().encode("latin-1")
+        roles_header = settings.header_roles.lower().encode("latin-1")
+
+        def _resolve_header(headers: RawHeaders, token: str | None = None) -> IdentityResult:
+            # Not interned: the header is client-controlled and interned strings are
+            # never freed, so unique ids would grow memory without bound
+            user_id = _raw_header(headers, user_id_header) or "anonymous"
+            roles = _parse_roles(_raw_header(headers, roles_header) or "viewer") or ["viewer"]
+            return IdentityContext(user_id=user_id, roles=roles), None
+
+        return _resolve_header
+
+    secret = (settings.jwt_secret or "").encode("utf-8")
+    # Verified identities keyed by a digest of the token, so clients re-presenting the
+    # same bearer skip signature and JSON work; exp/nbf are re-checked on every hit.
+    verified: OrderedDict[bytes, IdentityContext] = OrderedDict()
+
+    def _resolve_jwt(headers: RawHeaders, token: str | None = None) -> IdentityResult:
+        bearer = token or _raw_bearer_token(headers)
+        if not bearer:
+            return None, "missing bearer token"
+        key = hashlib.blake2b(bearer.encode("utf-8"), digest_size=16).digest()
+        identity = verified.get(key)
+        if identity is not None:
+            try:
+                _check_validity_window(identity.claims)
+            except AuthError as exc:
+                verified.pop(key, None)
+                return None, str(exc)
+            verified.move_to_end(key)
+            return identity, None
+        try:
+            claims = _verify_jwt(bearer, settings, secret)
+        except AuthError as exc:
+            return None, str(exc)
+        roles = _parse_roles(claims.get("roles") or claims.get("role") or claims.get("scope"))
+        if not roles:
+            roles = ["viewer"]
+        user_id = str(
+            claims.get("sub") or claims.get("user_id") or claims.get("uid") or "anonymous"
+        )
+        identity = IdentityContext(user_id=user_id, roles=roles, claims=claims)
+        verified[key] = identity
+        if len(verified) > _VERIFIED_TOKEN_CACHE_SIZE:
+            verified.popitem(last=False)
+        return identity, None
+
+    return _resolve_jwt
+
+
 def resolve_identity(
     headers: Mapping[str, str],
     settings: AuthSettings,
     token: str | None = None,
-) -> tuple[IdentityContext | None, str | None]:
-    if settings.mode == "none":
-        return IdentityContext(user_id="anonymous", roles=["viewer", "planner", "executor"]), None
-    if settings.mode == "header":
-        user_id = headers.get(settings.header_user_id, "anonymous")
-        roles_header = headers.get(settings.header_roles, "viewer")
-        roles = _parse_roles(roles_header) or ["viewer"]
-        return IdentityContext(user_id=user_id, roles=roles), None
-
-    bearer = token or extract_bearer_token(headers)
-    if not bearer:
-        return None, "missing bearer token"
-    try:
-        claims = _verify_jwt(bearer, settings)
-    except AuthError as exc:
-        return None, str(exc)
-    roles = _parse_roles(claims.get("roles") or claims.get("role") or claims.get("scope"))
-    if not roles:
-        roles = ["viewer"]
-    user_id = str(claims.get("sub") or claims.get("user_id") or claims.get("uid") or "anonymous")
-    return IdentityContext(user_id=user_id, roles=roles, claims=claims), None
-
-
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Attach identity to request.state using configured auth mode."""
-
-    async def dispatch(self, request: Request, call_next):
-        settings = get_settings().auth
-        identity, error = resolve_identity(request.headers, settings)
+) -> IdentityResult:
+    return build_identity_resolver(settings)(_as_raw_headers(headers), token)
+
+
+class AuthMiddleware:
+    """Attach identity to the request state using configured auth mode.
+
+    Plain ASGI middleware: the identity is stored in ``scope["state"]``, which backs
+    ``request.state`` for downstream handlers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        settings: AuthSettings | None = None,
+        exempt_paths: frozenset[str] = frozenset(),
+    ) -> None:
+        self.app = app
+        self.exempt_paths = exempt_paths
+        # Auth settings are immutable at runtime: snapshot them and pick the resolver once.
+        self.settings = settings or get_settings().auth
+        self._resolve = build_identity_resolver(self.settings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Unauthenticated endpoints such as health probes bypass identity resolution.
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        identity, error = self._resolve(scope["headers"], None)
+        state = scope.setdefault("state", {})
         if identity:
-            request.state.identity = identity
+            state["identity"] = identity
         if error:
-            request.state.auth_error = error
-        response = await call_next(request)
-        return response
+            state["auth_error"] = error
+        await self.app(scope, receive, send)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALLOWED_METHODS = ("GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS")
+
+_SIMPLE_HEADERS = ((b"access-control-allow-origin", b"*"),)
+_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-methods", ", ".join(ALLOWED_METHODS).encode("latin-1")),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+    (b"content-length", b"0"),
+]
+_PREFLIGHT_START: Message = {
+    "type": "http.response.start",
+    "status": 204,
+    "headers": _PREFLIGHT_HEADERS,
+}
+_PREFLIGHT_BODY: Message = {"type": "http.response.body", "body": b""}
+
+
+class WildcardCORSMiddleware:
+    """CORS for ``allow_origins=["*"]`` without credentials, using prebuilt headers.
+
+    Starlette's CORSMiddleware handles arbitrary origin lists and rebuilds its headers per
+    response; the wildcard case only ever needs the same constant headers.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        has_origin = False
+        is_preflight = False
+        for name, _value in scope["headers"]:
+            if name == b"origin":
+                has_origin = True
+            elif name == b"access-control-request-method":
+                is_preflight = True
+        if not has_origin:
+            await self.app(scope, receive, send)
+            return
+        if is_preflight and scope["method"] == "OPTIONS":
+            await send(_PREFLIGHT_START)
+            await send(_PREFLIGHT_BODY)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *_SIMPLE_HEADERS]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -1,53 +1,82 @@
 from __future__ import annotations
 
 import time
+from collections import OrderedDict
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_UNKNOWN_CLIENT = "unknown"
 
 
 class SlidingWindowLimiter:
-    def __init__(self, capacity: int, window_seconds: int) -> None:
+    def __init__(self, capacity: int, window_seconds: int, max_keys: int = 100_000) -> None:
         self.capacity = capacity
         self.window_seconds = window_seconds
-        self.buckets: dict[str, tuple[int, float]] = {}
-
-    def allow(self, key: str) -> bool:
-        now = time.time()
-        count, reset = self.buckets.get(key, (0, now + self.window_seconds))
-        if now > reset:
-            count = 0
-            reset = now + self.window_seconds
-        if count >= self.capacity:
-            self.buckets[key] = (count, reset)
-            return False
-        self.buckets[key] = (count + 1, reset)
-        return True
+        self.max_keys = max_keys
+        # Insertion order tracks recency so the least recently seen key is evicted first.
+        self.buckets: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def allow(self, key: str) -> tuple[bool, float]:
+        """Record a hit for ``key`` and return whether it is allowed plus the window reset."""
+        now = time.monotonic()
+        # Popping and re-inserting moves the key to the most recently used end.
+        bucket = self.buckets.pop(key, None)
+        if bucket is None or now > bucket[1]:
+            count, reset = 0, now + self.window_seconds
+        else:
+            count, reset = bucket
+        allowed = count < self.capacity
+        self.buckets[key] = (count + 1 if allowed else count, reset)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return allowed, reset
 
     def reset_at(self, key: str) -> float:
-        return self.buckets.get(key, (0, time.time() + self.window_seconds))[1]
+        return self.buckets.get(key, (0, time.monotonic() + self.window_seconds))[1]
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+class RateLimitMiddleware:
     """
     Simple per-identity sliding window limiter for API routes.
     Replace with Redis-backed limiter in production.
+
+    Implemented as plain ASGI middleware: BaseHTTPMiddleware would add a task group and
+    memory stream per request just to expose a Request/Response API.
     """
 
-    def __init__(self, app, capacity: int = 60, window_seconds: int = 60) -> None:
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        capacity: int = 60,
+        window_seconds: int = 60,
+        exempt_paths: frozenset[str] = frozenset(),
+    ) -> None:
+        self.app = app
         self.limiter = SlidingWindowLimiter(capacity, window_seconds)
+        self.exempt_paths = exempt_paths
 
-    async def dispatch(self, request: Request, call_next):
-        identity = getattr(request.state, "identity", None)
-        key = identity.user_id if identity else request.client.host
-        if not self.limiter.allow(key):
-            reset_at = self.limiter.reset_at(key)
-            retry_after = max(1, int(reset_at - time.time()))
-            return JSONResponse(
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Probes on exempt paths skip the limiter entirely.
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        identity = scope.get("state", {}).get("identity")
+        if identity:
+            key = identity.user_id
+        else:
+            # scope["client"] is the (host, port) pair the server recorded; it is absent
+            # for unix-socket listeners, which then share one anonymous bucket.
+            client = scope.get("client")
+            key = client[0] if client else _UNKNOWN_CLIENT
+        allowed, reset_at = self.limiter.allow(key)
+        if not allowed:
+            retry_after = max(1, int(reset_at - time.monotonic()))
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "rate limit exceeded"},
                 headers={"Retry-After": str(retry_after)},
             )
-        return await call_next(request)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
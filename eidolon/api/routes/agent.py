@@ -5,11 +5,6 @@ import json
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel, ValidationError
 
-from eidolon.api.dependencies import (
-    get_approval_store,
-    get_graph_repository,
-    get_llm_client,
-)
 from eidolon.api.middleware.auth import extract_bearer_token, resolve_identity
 from eidolon.config.settings import get_settings
 from eidolon.core.graph.algorithms import blast_radius
@@ -19,7 +14,6 @@ from eidolon.core.models.plan import (
     ExecutionResponse,
     ToolExecutionResult,
 )
-from eidolon.core.reasoning.llm import LiteLLMClient
 from eidolon.core.reasoning.planner import Planner
 from eidolon.core.stores import ApprovalStore
 from eidolon.runtime.executor import ExecutionEngine
@@ -55,23 +49,20 @@ async def agent_ws(websocket: WebSocket) -> None:
         await websocket.close(code=4403)
         return
     await websocket.accept()
-    approval_store: ApprovalStore = get_approval_store()
-    repository = get_graph_repository()
-    llm_client: LiteLLMClient = get_llm_client()
-    planner = Planner(llm_client=llm_client)
+    approval_store: ApprovalStore = websocket.app.state.approval_store
+    repository = websocket.app.state.graph_repository
+    planner: Planner = websocket.app.state.planner
+    shared_engine: ExecutionEngine = websocket.app.state.execution_engine
 
     def _execute_request(request: ExecutionRequest) -> ExecutionResponse:
-        needs_approval = request.requires_approval or any(
-            step.requires_approval for step in request.steps
-        )
-        if not request.dry_run and needs_approval:
+        if not request.dry_run and request.needs_approval:
             if not request.approval_token:
                 raise RuntimeError("approval token required for execution")
             approval = approval_store.get_by_token(request.approval_token)
             if not approval or approval.action != "execute":
                 raise RuntimeError("invalid approval token")
 
-        engine = ExecutionEngine(repository, runtime_settings=settings.sandbox)
+        engine = shared_engine.for_request()
         results: list[ToolExecutionResult] = []
         for step in request.steps:
             results.append(engine.execute_step(step, dry_run=request.dry_run))
@@ -1,28 +1,33 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import threading
-from datetime import datetime
+import time
+import weakref
+from collections.abc import AsyncGenerator, Iterable, Iterator
+from contextlib import aclosing, contextmanager, suppress
+from functools import partial
 from typing import Any, Literal
 from uuid import UUID, uuid4
 
 import anyio
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from eidolon.api.dependencies import (
     get_chat_store,
     get_graph_repository,
     get_llm_client,
+    get_settings_store,
     require_roles,
 )
 from eidolon.api.middleware.auth import IdentityContext
 from eidolon.core.graph.repository import GraphRepository
-from eidolon.core.models.chat import ChatMessage, ChatSession
+from eidolon.core.models.chat import ChatMessage, ChatSession, ChatSessionSummary
 from eidolon.core.reasoning.llm import LiteLLMClient
-from eidolon.core.stores import ChatStore
+from eidolon.core.stores import ChatStore, SettingsStore
 from eidolon.runtime.assistant import AssistantAgent, build_system_prompt
 from eidolon.runtime.sandbox import SandboxRuntime
 from eidolon.runtime.tools.browser import BrowserTool
@@ -39,20 +44,14 @@ router = APIRouter(prefix="/chat", tags=["chat"])
 _CHAT_STORE = Depends(get_chat_store)
 _LLM_CLIENT = Depends(get_llm_client)
 _GRAPH_REPOSITORY = Depends(get_graph_repository)
+_SETTINGS_STORE = Depends(get_settings_store)
 _VIEWER_IDENTITY = Depends(require_roles("viewer", "planner", "executor"))
 _EXECUTOR_IDENTITY = Depends(require_roles("executor"))
 
 
-def _build_sandbox(
-    repository: GraphRepository, settings_store: ChatStore | None = None
-) -> SandboxRuntime:
+def _build_sandbox(repository: GraphRepository, settings_store: SettingsStore) -> SandboxRuntime:
     """Build the sandbox runtime with all tools and permission checking."""
-    from eidolon.api.dependencies import get_settings_store
-
-    # Get runtime permissions from database if available, otherwise use config file defaults
-    if settings_store is None:
-        settings_store = get_settings_store()
-
+    # Runtime permissions come from the database if available, otherwise config defaults
     sandbox_settings = settings_store.get_settings()
     runtime = SandboxRuntime(settings=sandbox_settings)
 
@@ -68,18 +67,14 @@ def _build_sandbox(
     return runtime
 
 
-def _find_last_request_id(messages: list[ChatMessage]) -> str | None:
-    for msg in reversed(messages):
-        request_id = msg.metadata.get("request_id")
-        if isinstance(request_id, str) and request_id:
-            return request_id
-    return None
-
-
 def _is_cancelled_message(msg: ChatMessage) -> bool:
     return msg.role == "assistant" and msg.metadata.get("cancelled") is True
 
 
+# Messages the server authors itself (cancellation notices, error replies) are built
+# from trusted values, so they use model_construct and skip pydantic validation.
+
+
 def _append_cancelled_tool_responses(
     store: ChatStore,
     session_id: UUID,
@@ -96,7 +91,7 @@ def _append_cancelled_tool_responses(
         metadata = {"tool_call_id": tool_call_id, "tool_name": call.get("name", "unknown")}
         if request_id:
             metadata["request_id"] = request_id
-        tool_response = ChatMessage(
+        tool_response = ChatMessage.model_construct(
             role="tool",
             content="Cancelled by user",
             metadata=metadata,
@@ -114,7 +109,7 @@ def _append_cancellation_message(
     metadata: dict[str, Any] = {"kind": "internal", "cancelled": True}
     if request_id:
         metadata["request_id"] = request_id
-    assistant_message = ChatMessage(
+    assistant_message = ChatMessage.model_construct(
         role="assistant",
         content=reason,
         metadata=metadata,
@@ -134,12 +129,9 @@ def _finalize_cancelled_request(
     last_msg = session.messages[-1]
     if _is_cancelled_message(last_msg):
         return
-    if last_msg.role == "assistant" and "tool_calls" in last_msg.metadata:
-        tool_calls = last_msg.metadata.get("tool_calls", [])
-        if isinstance(tool_calls, list):
-            _append_cancelled_tool_responses(
-                store, session.session_id, user_id, request_id, tool_calls
-            )
+    tool_calls = session.pending_tool_calls
+    if tool_calls:
+        _append_cancelled_tool_responses(store, session.session_id, user_id, request_id, tool_calls)
     _append_cancellation_message(store, session.session_id, user_id, request_id, reason)
 
 
@@ -148,53 +140,57 @@ def _auto_cancel_pending_request(
     store: ChatStore,
     user_id: str,
 ) -> None:
-    if not session.messages:
+    if not session.has_pending_request:
         return
-    last_msg = session.messages[-1]
-    if last_msg.role == "assistant" and "tool_calls" not in last_msg.metadata:
-        return
-    if _is_cancelled_message(last_msg):
-        return
-    request_id = _find_last_request_id(session.messages)
     _finalize_cancelled_request(
         session,
         store,
         user_id,
-        request_id,
+        session.last_request_id,
         "Previous request cancelled by a newer message.",
     )
 
 
 class CancellationToken:
-    def __init__(self, session_id: UUID, request_id: str, registry: CancellationRegistry) -> None:
+    __slots__ = ("_event", "_registry", "_request_id", "_session_id")
+
+    def __init__(
+        self,
+        session_id: UUID,
+        request_id: str,
+        registry: CancellationRegistry,
+        event: threading.Event,
+    ) -> None:
         self._session_id = session_id
         self._request_id = request_id
         self._registry = registry
+        # The registry's event itself, so per-message checks are a single flag read
+        self._event = event
 
     def is_set(self) -> bool:
-        return self._registry.is_cancelled(self._session_id, self._request_id)
+        return self._event.is_set()
 
     def set(self) -> None:
-        self._registry.cancel(self._session_id, self._request_id)
+        self._event.set()
 
 
 class CancellationRegistry:
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._events: dict[str, threading.Event] = {}
+        self._events: dict[tuple[UUID, str], threading.Event] = {}
 
     def register(self, session_id: UUID, request_id: str) -> CancellationToken:
-        token_key = self._token_key(session_id, request_id)
+        token_key = (session_id, request_id)
         with self._lock:
             event = self._events.get(token_key)
             if event is None:
                 event = threading.Event()
                 self._events[token_key] = event
-        return CancellationToken(session_id, request_id, self)
+        return CancellationToken(session_id, request_id, self, event)
 
     def cancel(self, session_id: UUID, request_id: str) -> bool:
         found = False
-        token_key = self._token_key(session_id, request_id)
+        token_key = (session_id, request_id)
         with self._lock:
             event = self._events.get(token_key)
             if event is not None:
@@ -203,20 +199,23 @@ class CancellationRegistry:
         return found
 
     def is_cancelled(self, session_id: UUID, request_id: str) -> bool:
-        token_key = self._token_key(session_id, request_id)
-        with self._lock:
-            event = self._events.get(token_key)
-            if event is not None and event.is_set():
-                return True
-        return False
+        # Lock-free: dict.get and Event.is_set are atomic, so concurrent streams polling
+        # their own tokens don't serialize on the registry lock.
+        event = self._events.get((session_id, request_id))
+        return event is not None and event.is_set()
 
     def clear(self, session_id: UUID, request_id: str) -> None:
-        token_key = self._token_key(session_id, request_id)
         with self._lock:
-            self._events.pop(token_key, None)
+            self._events.pop((session_id, request_id), None)
 
-    def _token_key(self, session_id: UUID, request_id: str) -> str:
-        return f"{session_id}:{request_id}"
+    @contextmanager
+    def scoped(self, session_id: UUID, request_id: str) -> Iterator[CancellationToken]:
+        """Register a token for the duration of the block and always clear it afterwards."""
+        token = self.register(session_id, request_id)
+        try:
+            yield token
+        finally:
+            self.clear(session_id, request_id)
 
 
 _cancellation_registry = CancellationRegistry()
@@ -226,14 +225,6 @@ class CreateSessionRequest(BaseModel):
     title: str | None = Field(default=None)
 
 
-class ChatSessionSummary(BaseModel):
-    session_id: UUID
-    title: str | None
-    created_at: datetime
-    updated_at: datetime
-    message_count: int
-
-
 class ChatMessageRequest(BaseModel):
     role: Literal["user", "assistant", "system"] = Field(default="user")
     content: str
@@ -250,22 +241,40 @@ class CancelChatRequest(BaseModel):
     request_id: str = Field(..., min_length=1)
 
 
+def _json_response(content: bytes) -> Response:
+    # Session payloads are already-validated models; returning a Response makes FastAPI
+    # skip re-validating them against response_model, which stays for the OpenAPI schema.
+    return Response(content, media_type="application/json")
+
+
+_JSON_ARRAY_CHUNK_BYTES = 64 * 1024
+
+
+def _json_array(items: Iterable[BaseModel]) -> Iterator[bytes]:
+    """Encode ``items`` as one JSON array, emitted in chunks of roughly 64 KiB.
+
+    Rows are serialized as the store yields them, so memory stays flat for long lists
+    while short lists still go out in a single write.
+    """
+    chunk = bytearray(b"[")
+    for index, item in enumerate(items):
+        if index:
+            chunk += b","
+        chunk += item.model_dump_json().encode()
+        if len(chunk) >= _JSON_ARRAY_CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    chunk += b"]"
+    yield bytes(chunk)
+
+
 @router.get("/sessions", response_model=list[ChatSessionSummary])
 def list_sessions(
     store: ChatStore = _CHAT_STORE,
     identity: IdentityContext = _VIEWER_IDENTITY,
-) -> list[ChatSessionSummary]:
-    sessions = store.list_sessions(limit=50, user_id=identity.user_id)
-    return [
-        ChatSessionSummary(
-            session_id=session.session_id,
-            title=session.title,
-            created_at=session.created_at,
-            updated_at=session.updated_at,
-            message_count=len(session.messages),
-        )
-        for session in sessions
-    ]
+) -> StreamingResponse:
+    summaries = store.iter_session_summaries(limit=50, user_id=identity.user_id)
+    return StreamingResponse(_json_array(summaries), media_type="application/json")
 
 
 @router.post("/sessions", response_model=ChatSession)
@@ -273,8 +282,9 @@ def create_session(
     request: CreateSessionRequest,
     store: ChatStore = _CHAT_STORE,
     identity: IdentityContext = _VIEWER_IDENTITY,
-) -> ChatSession:
-    return store.create_session(title=request.title, user_id=identity.user_id)
+) -> Response:
+    session = store.create_session(title=request.title, user_id=identity.user_id)
+    return _json_response(session.model_dump_json().encode())
 
 
 @router.get("/sessions/{session_id}", response_model=ChatSession)
@@ -282,11 +292,11 @@ def get_session(
     session_id: UUID,
     store: ChatStore = _CHAT_STORE,
     identity: IdentityContext = _VIEWER_IDENTITY,
-) -> ChatSession:
+) -> Response:
     session = store.get_session(session_id, user_id=identity.user_id)
     if not session:
         raise HTTPException(status_code=404, detail="session not found")
-    return session
+    return _json_response(session.model_dump_json().encode())
 
 
 @router.delete("/sessions/{session_id}")
@@ -306,150 +316,314 @@ def delete_sessions(
     store: ChatStore = _CHAT_STORE,
     identity: IdentityContext = _EXECUTOR_IDENTITY,
 ) -> BulkDeleteResponse:
-    deleted = 0
-    while True:
-        sessions = store.list_sessions(limit=200, user_id=identity.user_id)
-        if not sessions:
-            break
-        for session in sessions:
-            if store.delete_session(session.session_id, user_id=identity.user_id):
-                deleted += 1
+    deleted = store.delete_all_sessions(user_id=identity.user_id)
     return BulkDeleteResponse(status="deleted", deleted=deleted)
 
 
+_DONE_LINE = b'{"type":"done"}\n'
+# Streamed messages are written once this many are pending or this long after the last write
+_STREAM_FLUSH_MESSAGES = 8
+_STREAM_FLUSH_SECONDS = 1.0
+# Agent messages produced ahead of the client before the agent thread blocks
+_STREAM_BUFFER_MESSAGES = 16
+
+
+def _message_line(msg: ChatMessage) -> bytes:
+    # Envelope spliced around pydantic-core's JSON output; no intermediate dict.
+    return b'{"type":"message","message":' + msg.model_dump_json().encode() + b"}\n"
+
+
+def _record_incoming_message(
+    store: ChatStore,
+    session_id: UUID,
+    message: ChatMessage,
+    user_id: str,
+) -> ChatSession:
+    if message.role == "user":
+        existing_session = store.get_session(session_id, user_id=user_id)
+        if not existing_session:
+            raise HTTPException(status_code=404, detail="session not found")
+        _auto_cancel_pending_request(existing_session, store, user_id)
+    session = store.append_message(session_id, message, user_id=user_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="session not found")
+    return session
+
+
+def _build_agent(
+    llm_client: LiteLLMClient,
+    repository: GraphRepository,
+    settings_store: SettingsStore,
+) -> AssistantAgent:
+    sandbox = _build_sandbox(repository, settings_store)
+    return AssistantAgent(
+        llm_client=llm_client,
+        sandbox=sandbox,
+        system_prompt=_system_prompt(sandbox, repository),
+        max_iterations=10,
+    )
+
+
+# The sandbox itself is built per request because tools such as TodoTool hold
+# conversation state; the prompt only depends on the tool set, the permissions and a
+# graph summary, so it is reused for a short while per settings generation.
+_SYSTEM_PROMPT_TTL_SECONDS = 60.0
+_SYSTEM_PROMPT_SETTINGS_LIMIT = 16
+# Keyed by the repository object itself, so a collected repository takes its prompts
+# (and their embedded graph summary) with it; inner dicts are keyed by settings JSON.
+_system_prompt_cache: weakref.WeakKeyDictionary[GraphRepository, dict[str, tuple[float, str]]] = (
+    weakref.WeakKeyDictionary()
+)
+_system_prompt_lock = threading.Lock()
+
+
+def _system_prompt(sandbox: SandboxRuntime, repository: GraphRepository) -> str:
+    settings_key = sandbox.settings.model_dump_json()
+    now = time.monotonic()
+    with _system_prompt_lock:
+        cached = _system_prompt_cache.get(repository, {}).get(settings_key)
+    if cached is not None and now - cached[0] < _SYSTEM_PROMPT_TTL_SECONDS:
+        return cached[1]
+    prompt = build_system_prompt(sandbox.active_tools.values(), sandbox.settings, repository)
+    with _system_prompt_lock:
+        prompts = _system_prompt_cache.setdefault(repository, {})
+        if len(prompts) >= _SYSTEM_PROMPT_SETTINGS_LIMIT:
+            prompts.clear()
+        prompts[settings_key] = (now, prompt)
+    return prompt
+
+
+def _error_message(error: Exception, request_id: str | None) -> ChatMessage:
+    error_metadata = {"kind": "error"}
+    if request_id:
+        error_metadata["request_id"] = request_id
+    return ChatMessage.model_construct(
+        role="assistant",
+        content=f"I encountered an error: {error}",
+        metadata=error_metadata,
+    )
+
+
+def _run_agent(
+    agent: AssistantAgent,
+    session: ChatSession,
+    store: ChatStore,
+    user_id: str,
+    request_id: str | None,
+) -> ChatSession:
+    # Nothing is returned until the loop ends, so the replies are written in one batch
+    produced: list[ChatMessage] = []
+    try:
+        for msg in agent.run_iter(session.messages):
+            if request_id:
+                msg.metadata["request_id"] = request_id
+            produced.append(msg)
+    except Exception as e:
+        logger.exception("Agent loop failed")
+        produced.append(_error_message(e, request_id))
+    if not produced:
+        return session
+    return store.append_messages(session.session_id, produced, user_id=user_id)
+
+
+_PUMP_DONE = object()
+
+
+def _pump_agent(
+    messages: Iterable[ChatMessage],
+    token: CancellationToken,
+    loop: asyncio.AbstractEventLoop,
+    buffer: asyncio.Queue[Any],
+    slots: threading.Semaphore,
+) -> None:
+    """Feed agent messages to the stream's loop, blocking while ``slots`` are exhausted.
+
+    An agent error is handed over as the exception object; ``_PUMP_DONE`` always follows.
+    """
+
+    def put(item: Any) -> None:
+        with suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(buffer.put_nowait, item)
+
+    try:
+        for msg in messages:
+            while not slots.acquire(timeout=0.5):
+                if token.is_set():
+                    return
+            put(msg)
+    except Exception as exc:  # noqa: BLE001 - re-raised on the consumer side
+        put(exc)
+    finally:
+        put(_PUMP_DONE)
+
+
+async def _cancel_on_disconnect(request: Request, token: CancellationToken) -> None:
+    # The body has been read, so the next ASGI message is the client disconnect
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            token.set()
+            return
+
+
+def _finalize_stream(
+    store: ChatStore,
+    session_id: UUID,
+    user_id: str,
+    request_id: str,
+    unsaved: list[ChatMessage],
+    cancelled: bool,
+) -> None:
+    if unsaved:
+        store.append_messages(session_id, unsaved, user_id=user_id)
+    if cancelled:
+        current_session = store.get_session(session_id, user_id=user_id)
+        _finalize_cancelled_request(
+            current_session, store, user_id, request_id, "Request cancelled by user."
+        )
+
+
+async def _stream_agent(
+    agent: AssistantAgent,
+    session: ChatSession,
+    store: ChatStore,
+    user_id: str,
+    request_id: str,
+    request: Request,
+    cancellation_token: CancellationToken,
+) -> AsyncGenerator[bytes, None]:
+    session_id = session.session_id
+    cancelled = False
+    # Streamed messages are persisted in batches rather than one transaction each
+    unsaved: list[ChatMessage] = []
+    last_flush = time.monotonic()
+    # The agent runs ahead on a worker thread into a bounded buffer: a fast client never
+    # waits on a per-message thread hop and a slow one stalls the agent after a few
+    # messages instead of letting them pile up.
+    loop = asyncio.get_running_loop()
+    buffer: asyncio.Queue[Any] = asyncio.Queue()
+    slots = threading.Semaphore(_STREAM_BUFFER_MESSAGES)
+    loop.run_in_executor(
+        None,
+        _pump_agent,
+        agent.run_iter(session.messages, cancellation_token=cancellation_token),
+        cancellation_token,
+        loop,
+        buffer,
+        slots,
+    )
+    # One task waits for the disconnect and trips the token; the loop only reads it
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, cancellation_token))
+    try:
+        while True:
+            msg = await buffer.get()
+            slots.release()
+            if msg is _PUMP_DONE:
+                break
+            if isinstance(msg, Exception):
+                # Only agent failures become an error message; a failed store write
+                # below propagates instead of being reported as an agent error
+                logger.error("Agent loop failed", exc_info=msg)
+                assistant_message = _error_message(msg, request_id)
+                unsaved.append(assistant_message)
+                yield _message_line(assistant_message)
+                break
+            if cancellation_token.is_set():
+                cancelled = True
+                break
+            msg.metadata["request_id"] = request_id
+            unsaved.append(msg)
+            # Saved before the client sees it: tool calls must already be in the store
+            # when a concurrent cancel or newer message looks up the pending request
+            if (
+                "tool_calls" in msg.metadata
+                or len(unsaved) >= _STREAM_FLUSH_MESSAGES
+                or time.monotonic() - last_flush >= _STREAM_FLUSH_SECONDS
+            ):
+                await anyio.to_thread.run_sync(
+                    partial(store.append_messages, session_id, unsaved, user_id=user_id)
+                )
+                unsaved = []
+                last_flush = time.monotonic()
+            yield _message_line(msg)
+    except anyio.get_cancelled_exc_class():
+        # Response task torn down (client gone): stop the agent between LLM calls
+        cancelled = True
+        cancellation_token.set()
+        raise
+    finally:
+        watcher.cancel()
+        was_cancelled = cancelled or cancellation_token.is_set()
+        # Releases the agent thread if it is still producing; the token is discarded next
+        cancellation_token.set()
+        # Shielded so the remaining messages and the cancellation bookkeeping still
+        # reach the store when the stream is cancelled
+        with anyio.CancelScope(shield=True):
+            await anyio.to_thread.run_sync(
+                _finalize_stream, store, session_id, user_id, request_id, unsaved, was_cancelled
+            )
+    yield _DONE_LINE
+
+
 @router.post("/sessions/{session_id}/messages", response_model=ChatSession)
-def add_message(
+async def add_message(
     request: Request,
     session_id: UUID,
     payload: ChatMessageRequest,
     store: ChatStore = _CHAT_STORE,
     llm_client: LiteLLMClient = _LLM_CLIENT,
     repository: GraphRepository = _GRAPH_REPOSITORY,
+    settings_store: SettingsStore = _SETTINGS_STORE,
     stream: bool = False,
     identity: IdentityContext = _VIEWER_IDENTITY,
-) -> ChatSession | StreamingResponse:
-    from eidolon.api.dependencies import get_settings_store
-
+) -> Response:
+    # Runs on the event loop; store, sandbox and agent calls block, so each is handed to
+    # a worker thread and no thread is pinned for the lifetime of a stream.
+    user_id = identity.user_id
     request_id = payload.request_id
     if stream and not request_id:
         request_id = f"req_{uuid4()}"
-    metadata = dict(payload.metadata or {})
+    # ChatMessage validation builds its own dict, so only copy when adding the request id
     if request_id:
-        metadata["request_id"] = request_id
-    if payload.role == "user":
-        existing_session = store.get_session(session_id, user_id=identity.user_id)
-        if not existing_session:
-            raise HTTPException(status_code=404, detail="session not found")
-        _auto_cancel_pending_request(existing_session, store, identity.user_id)
+        metadata = {**(payload.metadata or {}), "request_id": request_id}
+    else:
+        metadata = payload.metadata or {}
     message = ChatMessage(
         role=payload.role,
         content=payload.content,
         metadata=metadata,
     )
-    session = store.append_message(session_id, message, user_id=identity.user_id)
-    if not session:
-        raise HTTPException(status_code=404, detail="session not found")
+    session = await anyio.to_thread.run_sync(
+        _record_incoming_message, store, session_id, message, user_id
+    )
 
     # If user message, run the agent loop to generate response
-    if payload.role == "user" and llm_client.is_available():
-        settings_store = get_settings_store()
-        sandbox = _build_sandbox(repository, settings_store)
-        system_prompt = build_system_prompt(
-            sandbox.active_tools.values(), sandbox.settings, repository
-        )
-        agent = AssistantAgent(
-            llm_client=llm_client,
-            sandbox=sandbox,
-            system_prompt=system_prompt,
-            max_iterations=10,
+    if payload.role != "user" or not llm_client.is_available():
+        return _json_response(session.model_dump_json().encode())
+    agent = await anyio.to_thread.run_sync(_build_agent, llm_client, repository, settings_store)
+    if not stream:
+        session = await anyio.to_thread.run_sync(
+            _run_agent, agent, session, store, user_id, request_id
         )
-        if stream:
-            cancellation_token = (
-                _cancellation_registry.register(session_id, request_id) if request_id else None
+        return _json_response(session.model_dump_json().encode())
+
+    async def event_stream() -> AsyncGenerator[bytes, None]:
+        # Registered inside the generator so the entry is cleared by the same frame that
+        # created it; streaming requests always carry a request id (generated above).
+        with _cancellation_registry.scoped(session_id, request_id) as cancellation_token:
+            lines = _stream_agent(
+                agent, session, store, user_id, request_id, request, cancellation_token
             )
-
-            def event_stream():
-                cancelled = False
-                try:
-                    for msg in agent.run_iter(
-                        session.messages, cancellation_token=cancellation_token
-                    ):
-                        if cancellation_token and cancellation_token.is_set():
-                            cancelled = True
-                            break
-                        if anyio.from_thread.run(request.is_disconnected):
-                            cancelled = True
-                            if cancellation_token:
-                                cancellation_token.set()
-                            break
-                        if request_id:
-                            msg.metadata["request_id"] = request_id
-                        stored = store.append_message(session_id, msg, user_id=identity.user_id)
-                        if stored:
-                            payload = {
-                                "type": "message",
-                                "message": msg.model_dump(mode="json"),
-                            }
-                            yield json.dumps(payload) + "\n"
-                except Exception as e:
-                    logger.exception("Agent loop failed")
-                    error_metadata = {"kind": "error"}
-                    if request_id:
-                        error_metadata["request_id"] = request_id
-                    assistant_message = ChatMessage(
-                        role="assistant",
-                        content=f"I encountered an error: {e}",
-                        metadata=error_metadata,
-                    )
-                    store.append_message(session_id, assistant_message, user_id=identity.user_id)
-                    payload = {
-                        "type": "message",
-                        "message": assistant_message.model_dump(mode="json"),
-                    }
-                    yield json.dumps(payload) + "\n"
-                finally:
-                    if request_id:
-                        was_cancelled = cancelled or (
-                            cancellation_token and cancellation_token.is_set()
-                        )
-                        _cancellation_registry.clear(session_id, request_id)
-                        if was_cancelled:
-                            current_session = store.get_session(
-                                session_id, user_id=identity.user_id
-                            )
-                            _finalize_cancelled_request(
-                                current_session,
-                                store,
-                                identity.user_id,
-                                request_id,
-                                "Request cancelled by user.",
-                            )
-                yield json.dumps({"type": "done"}) + "\n"
-
-            return StreamingResponse(
-                event_stream(),
-                media_type="application/x-ndjson",
-                headers={"Cache-Control": "no-cache"},
-            )
-
-        try:
-            for msg in agent.run_iter(session.messages):
-                if request_id:
-                    msg.metadata["request_id"] = request_id
-                session = store.append_message(session_id, msg, user_id=identity.user_id)
-        except Exception as e:
-            logger.exception("Agent loop failed")
-            error_metadata = {"kind": "error"}
-            if request_id:
-                error_metadata["request_id"] = request_id
-            assistant_message = ChatMessage(
-                role="assistant",
-                content=f"I encountered an error: {e}",
-                metadata=error_metadata,
-            )
-            session = store.append_message(session_id, assistant_message, user_id=identity.user_id)
-
-    return session
+            # aclosing runs the inner generator's cleanup before the token is cleared
+            async with aclosing(lines):
+                async for line in lines:
+                    yield line
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/sessions/{session_id}/cancel")
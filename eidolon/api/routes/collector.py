@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 import ipaddress
+import logging
+import os
+import re
+import socket
+import struct
 import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from uuid import uuid4
+from functools import partial
+from itertools import islice, pairwise
+from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ValidationError
 
 from eidolon.api.dependencies import (
@@ -26,6 +37,8 @@ from eidolon.core.stores import AuditStore, ScannerStore
 from eidolon.runtime.task_events import TaskEvent, task_event_bus
 from eidolon.worker.ingest import IngestWorker
 
+logger = logging.getLogger(__name__)
+
 
 class CollectorRunResponse(BaseModel):
     task_id: str
@@ -59,9 +72,10 @@ _VIEWER_IDENTITY = Depends(require_roles("viewer", "planner", "executor"))
 _PLANNER_EXECUTOR_IDENTITY = Depends(require_roles("planner", "executor"))
 
 
-PORT_PRESET_PORTS: dict[str, list[int]] = {
-    "fast": [80, 443],
-    "normal": [
+# Immutable so no scan config can mutate a preset shared by every other config
+PORT_PRESET_PORTS: dict[str, tuple[int, ...]] = {
+    "fast": (80, 443),
+    "normal": (
         21,
         22,
         23,
@@ -80,42 +94,144 @@ PORT_PRESET_PORTS: dict[str, list[int]] = {
         5432,
         8080,
         8443,
-    ],
+    ),
 }
 VALID_PORT_PRESETS = {"fast", "normal", "full", "custom"}
 
 
+_SCAN_ACTIVE = 0
+_SCAN_CANCELLED = 1
+
+
 class _ScanRegistry:
     def __init__(self) -> None:
-        self._active: set[str] = set()
-        self._cancelled: set[str] = set()
+        self._state: dict[str, int] = {}
         self._lock = threading.Lock()
 
     def register(self, task_id: str) -> None:
         with self._lock:
-            self._active.add(task_id)
+            self._state[task_id] = _SCAN_ACTIVE
 
     def cancel(self, task_id: str) -> bool:
         with self._lock:
-            if task_id in self._active:
-                self._cancelled.add(task_id)
+            if task_id in self._state:
+                self._state[task_id] = _SCAN_CANCELLED
                 return True
             return False
 
     def is_cancelled(self, task_id: str) -> bool:
-        with self._lock:
-            return task_id in self._cancelled
+        # Polled from scanner callbacks; a single dict lookup is atomic, so reads skip the lock
+        return self._state.get(task_id, _SCAN_ACTIVE) == _SCAN_CANCELLED
 
     def clear(self, task_id: str) -> None:
         with self._lock:
-            self._active.discard(task_id)
-            self._cancelled.discard(task_id)
+            self._state.pop(task_id, None)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            for task_id in self._state:
+                self._state[task_id] = _SCAN_CANCELLED
 
 
 _scan_registry = _ScanRegistry()
 
+_TASK_ID_BATCH = 256
+
+
+def _task_id_source() -> Iterator[str]:
+    """Yield random version-4 UUID strings, reading entropy 256 ids at a time."""
+    while True:
+        entropy = os.urandom(16 * _TASK_ID_BATCH)
+        for offset in range(0, len(entropy), 16):
+            yield str(UUID(bytes=entropy[offset : offset + 16], version=4))
+
+
+# Only advanced from trigger_scan on the event loop, so it is never resumed concurrently
+_task_ids = _task_id_source()
+
+# Scans hold a thread for minutes; keep them off the shared anyio pool that sync
+# endpoints and dependencies run on, so concurrent scans cannot starve requests.
+# Created on first use and torn down by shutdown_scans() when the app stops.
+_scan_executor: ThreadPoolExecutor | None = None
+_scan_executor_lock = threading.Lock()
+
+
+def _submit_scan(task_id: str, **kwargs) -> None:
+    global _scan_executor
+    with _scan_executor_lock:
+        if _scan_executor is None:
+            _scan_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="scan")
+        future = _scan_executor.submit(_run_scan_sync, task_id=task_id, **kwargs)
+    future.add_done_callback(partial(_log_scan_failure, task_id))
+
+
+def _log_scan_failure(task_id: str, future: Future) -> None:
+    if future.cancelled():
+        # Queued when the app shut down; it never started, so nothing else clears it
+        _scan_registry.clear(task_id)
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Scan %s failed", task_id, exc_info=exc)
+
+
+def shutdown_scans() -> None:
+    """Cancel queued and running scans and wait for their threads to exit.
+
+    Called from the app lifespan before the stores close, so no scan is left writing
+    to a closed pool or driver.
+    """
+    global _scan_executor
+    with _scan_executor_lock:
+        executor, _scan_executor = _scan_executor, None
+    if executor is None:
+        return
+    _scan_registry.cancel_all()
+    executor.shutdown(wait=True, cancel_futures=True)
+
+
+_OCTET = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_IPV4 = rf"{_OCTET}(?:\.{_OCTET}){{3}}"
+# Canonical dotted-quad targets only: "a.b.c.d", "a.b.c.d/nn", "a.b.c.d-a.b.c.d", "a.b.c.d-n"
+_IPV4_TARGET = re.compile(rf"({_IPV4})(?:/(3[0-2]|[12]?\d)|-(?:({_IPV4})|({_OCTET})))?")
+_IPV4_INT = struct.Struct(">I")
+
+
+def _ipv4_int(value: str) -> int:
+    return _IPV4_INT.unpack(socket.inet_aton(value))[0]
+
+
+def _parse_ipv4_fast(value: str) -> tuple[int, int] | None:
+    """Parse a canonical IPv4 target straight to integers, skipping ``ipaddress`` objects.
+
+    Returns ``None`` for anything else so the caller can fall back to the strict parser,
+    which also produces the user-facing error messages.
+    """
+    match = _IPV4_TARGET.fullmatch(value)
+    if match is None:
+        return None
+    address, prefix, end_address, end_octet = match.groups()
+    start = _ipv4_int(address)
+    if prefix is not None:
+        mask = (0xFFFFFFFF << (32 - int(prefix))) & 0xFFFFFFFF
+        start &= mask
+        return start, start | (~mask & 0xFFFFFFFF)
+    if end_address is not None:
+        end = _ipv4_int(end_address)
+    elif end_octet is not None:
+        end = (start & 0xFFFFFF00) | int(end_octet)
+    else:
+        return start, start
+    if end < start:
+        raise ValueError("Range end must be greater than start")
+    return start, end
+
 
 def _parse_target_range(value: str) -> tuple[int, int]:
+    fast = _parse_ipv4_fast(value)
+    if fast is not None:
+        return fast
+
     if "/" in value:
         network = ipaddress.ip_network(value, strict=False)
         if network.version != 4:
@@ -154,22 +270,29 @@ def _validate_targets(targets: list[str]) -> None:
         raise HTTPException(status_code=422, detail="At least one target is required")
     if len(targets) > 50:
         raise HTTPException(status_code=422, detail="Maximum of 50 targets allowed")
-    normalized = [target.strip() for target in targets if target.strip()]
-    if len(set(normalized)) != len(normalized):
-        raise HTTPException(status_code=422, detail="Duplicate targets are not allowed")
+    seen: dict[str, None] = {}
+    for target in targets:
+        stripped = target.strip()
+        if not stripped:
+            continue
+        if stripped in seen:
+            raise HTTPException(
+                status_code=422, detail=f"Duplicate target {stripped} is not allowed"
+            )
+        seen[stripped] = None
 
     ranges = []
-    for target in normalized:
+    for target in seen:
         try:
             start, end = _parse_target_range(target)
         except ValueError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
         ranges.append((start, end, target))
 
-    ranges.sort(key=lambda item: item[0])
-    for idx in range(1, len(ranges)):
-        _prev_start, prev_end, prev_target = ranges[idx - 1]
-        curr_start, _curr_end, curr_target = ranges[idx]
+    # Sorted by start, any overlap shows up between neighbours; for at most 50 targets
+    # this beats a bitset over the address span.
+    ranges.sort()
+    for (_, prev_end, prev_target), (curr_start, _, curr_target) in pairwise(ranges):
         if curr_start <= prev_end:
             raise HTTPException(
                 status_code=422,
@@ -178,12 +301,13 @@ def _validate_targets(targets: list[str]) -> None:
 
 
 def _validate_ports(port_preset: str, ports: list[int]) -> list[int]:
+    preset_ports = PORT_PRESET_PORTS.get(port_preset)
+    if preset_ports is not None:
+        return list(preset_ports)
+
     if port_preset not in VALID_PORT_PRESETS:
         raise HTTPException(status_code=422, detail="Invalid port preset")
 
-    if port_preset in PORT_PRESET_PORTS:
-        return PORT_PRESET_PORTS[port_preset]
-
     if port_preset == "full":
         return []
 
@@ -217,6 +341,35 @@ def _normalize_config(config: ScannerConfig) -> ScannerConfig:
     return config
 
 
+ConfigKey = tuple[tuple[str, ...], str, tuple[int, ...]]
+
+# Last validated targets/ports per user, keyed by the raw values they were derived from.
+# A stored config only changes through PUT /config, so POST /scan normally skips
+# re-parsing every target; a mismatched key (e.g. another worker updated it) recomputes.
+_normalized_configs: dict[str, tuple[ConfigKey, list[str], list[int]]] = {}
+_normalized_configs_lock = threading.Lock()
+
+
+def _normalize_stored_config(user_id: str, config: ScannerConfig) -> ScannerConfig:
+    key = (tuple(config.network_cidrs), config.port_preset, tuple(config.ports))
+    with _normalized_configs_lock:
+        cached = _normalized_configs.get(user_id)
+    if cached is not None and cached[0] == key:
+        config.network_cidrs = list(cached[1])
+        config.ports = list(cached[2])
+        return config
+
+    config = _normalize_config(config)
+    with _normalized_configs_lock:
+        _normalized_configs[user_id] = (key, list(config.network_cidrs), list(config.ports))
+    return config
+
+
+def _forget_normalized_config(user_id: str) -> None:
+    with _normalized_configs_lock:
+        _normalized_configs.pop(user_id, None)
+
+
 def _format_config_summary(config: ScannerConfig) -> str:
     targets = ", ".join(config.network_cidrs)
     if config.port_preset == "full":
@@ -235,6 +388,7 @@ def _build_scan_config(config: ScannerConfig) -> dict:
             "cidrs": config.network_cidrs,
             "ping_concurrency": config.options.ping_concurrency,
             "port_scan_workers": config.options.port_scan_workers,
+            "min_rate": config.options.min_rate,
             "ports": config.ports,
             "port_preset": config.port_preset,
             "dns_resolution": config.options.dns_resolution,
@@ -243,6 +397,54 @@ def _build_scan_config(config: ScannerConfig) -> dict:
     }
 
 
+_SCAN_EVENT_BATCH_SIZE = 32
+_SCAN_EVENT_BATCH_SECONDS = 0.5
+
+
+class _ScanEventBatch:
+    """Buffers a scan's audit writes and task events so they go out in batches.
+
+    Progress lines are held until the batch fills or ages; status events flush
+    immediately, carrying anything queued before them in the same write.
+    """
+
+    def __init__(self, audit_store: AuditStore) -> None:
+        self._audit_store = audit_store
+        self._audit: list[AuditEvent] = []
+        self._events: list[TaskEvent] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add_audit(self, event: AuditEvent) -> None:
+        with self._lock:
+            self._audit.append(event)
+
+    def publish(self, event: TaskEvent, flush: bool = True) -> None:
+        with self._lock:
+            self._events.append(event)
+            if not flush:
+                flush = len(self._events) >= _SCAN_EVENT_BATCH_SIZE or self._due()
+        if flush:
+            self.flush()
+
+    def flush_if_due(self) -> None:
+        if (self._events or self._audit) and self._due():
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            audit, self._audit = self._audit, []
+            events, self._events = self._events, []
+            self._last_flush = time.monotonic()
+            # Held across the writes so concurrent flushes cannot reorder events
+            if audit:
+                self._audit_store.add_many(audit)
+            task_event_bus.publish_many(events)
+
+    def _due(self) -> bool:
+        return time.monotonic() - self._last_flush >= _SCAN_EVENT_BATCH_SECONDS
+
+
 def _run_scan_sync(
     task_id: str,
     config: dict,
@@ -251,38 +453,47 @@ def _run_scan_sync(
     resolver: EntityResolver,
     audit_store: AuditStore,
 ) -> None:
-    """Synchronous scan logic that runs in background."""
+    """Synchronous scan logic that runs in background.
+
+    Audit events here are built from trusted values, so they skip pydantic validation.
+    """
     worker = IngestWorker(repository, resolver)
+    batch = _ScanEventBatch(audit_store)
 
     # Track stats per collector
     collector_stats: dict[str, dict] = {}
-    current_collector: str | None = None
+    # Stats of the running collector, bound once per collector rather than per event
+    current_stats: dict | None = None
 
     def emit_fn(event) -> None:
-        nonlocal current_collector
-        if current_collector:
-            stats = collector_stats[current_collector]
+        stats = current_stats
+        if stats is not None:
             stats["events_processed"] += 1
             # Track entity types
-            entity_type = event.entity_type
-            stats["by_type"][entity_type] = stats["by_type"].get(entity_type, 0) + 1
+            stats["by_type"][event.entity_type] += 1
         worker.process_event(event)
 
     def progress_fn(line: str) -> None:
         """Publish scan progress output to event bus."""
-        task_event_bus.publish(
+        batch.publish(
             TaskEvent(
                 event_type="collector.scan",
                 status="progress",
                 payload={"task_id": task_id, "output": line},
-            )
+            ),
+            flush=False,
         )
 
+    def is_cancelled() -> bool:
+        # Polled throughout a scan, so it also pushes out progress lines left waiting
+        batch.flush_if_due()
+        return _scan_registry.is_cancelled(task_id)
+
     try:
         manager = build_manager(
             config,
             emit_fn,
-            cancellation_checker=lambda: _scan_registry.is_cancelled(task_id),
+            cancellation_checker=is_cancelled,
             progress_callback=progress_fn,
         )
         collectors = manager.list_collectors()
@@ -291,13 +502,13 @@ def _run_scan_sync(
         for name in collectors:
             collector_stats[name] = {
                 "events_processed": 0,
-                "by_type": {},
+                "by_type": Counter(),
                 "status": "pending",
             }
 
         # Emit scan start events
-        audit_store.add(
-            AuditEvent(
+        batch.add_audit(
+            AuditEvent.model_construct(
                 event_type="collector.scan.started",
                 details={
                     "collectors": collectors,
@@ -307,7 +518,7 @@ def _run_scan_sync(
                 status="running",
             )
         )
-        task_event_bus.publish(
+        batch.publish(
             TaskEvent(
                 event_type="collector.scan",
                 status="started",
@@ -317,16 +528,16 @@ def _run_scan_sync(
 
         # Run each collector and track results
         errors: list[Exception] = []
-        for collector_name in collectors:
+        for collector_name, collector in manager.iter_collectors():
             if _scan_registry.is_cancelled(task_id):
-                audit_store.add(
-                    AuditEvent(
+                batch.add_audit(
+                    AuditEvent.model_construct(
                         event_type="collector.scan.cancelled",
                         details={"task_id": task_id, "config_summary": config_summary},
                         status="cancelled",
                     )
                 )
-                task_event_bus.publish(
+                batch.publish(
                     TaskEvent(
                         event_type="collector.scan",
                         status="cancelled",
@@ -335,11 +546,11 @@ def _run_scan_sync(
                 )
                 return
 
-            current_collector = collector_name
-            collector = manager._collectors[collector_name]
+            stats = collector_stats[collector_name]
+            current_stats = stats
 
             # Publish task event for this collector starting
-            task_event_bus.publish(
+            batch.publish(
                 TaskEvent(
                     event_type="collector.scan",
                     status="running",
@@ -349,16 +560,15 @@ def _run_scan_sync(
 
             try:
                 collector.run()
-                collector_stats[collector_name]["status"] = "ok"
+                stats["status"] = "ok"
 
                 # Emit per-collector audit event
-                stats = collector_stats[collector_name]
-                audit_store.add(
-                    AuditEvent(
+                batch.add_audit(
+                    AuditEvent.model_construct(
                         event_type=f"collector.{collector_name}",
                         details={
                             "events_processed": stats["events_processed"],
-                            "by_type": stats["by_type"],
+                            "by_type": dict(stats["by_type"]),
                             "task_id": task_id,
                         },
                         status="ok",
@@ -366,7 +576,7 @@ def _run_scan_sync(
                 )
 
                 # Publish task event for collector completion
-                task_event_bus.publish(
+                batch.publish(
                     TaskEvent(
                         event_type="collector.scan",
                         status="progress",
@@ -379,9 +589,9 @@ def _run_scan_sync(
                 )
             except ScanCancelledError:
                 # Scan was cancelled during this collector
-                collector_stats[collector_name]["status"] = "cancelled"
-                audit_store.add(
-                    AuditEvent(
+                stats["status"] = "cancelled"
+                batch.add_audit(
+                    AuditEvent.model_construct(
                         event_type="collector.scan.cancelled",
                         details={
                             "task_id": task_id,
@@ -391,7 +601,7 @@ def _run_scan_sync(
                         status="cancelled",
                     )
                 )
-                task_event_bus.publish(
+                batch.publish(
                     TaskEvent(
                         event_type="collector.scan",
                         status="cancelled",
@@ -401,12 +611,12 @@ def _run_scan_sync(
                 return
             except Exception as exc:  # noqa: BLE001
                 errors.append(exc)
-                collector_stats[collector_name]["status"] = "failed"
-                collector_stats[collector_name]["error"] = str(exc)
-                events_processed = collector_stats[collector_name]["events_processed"]
+                stats["status"] = "failed"
+                stats["error"] = str(exc)
+                events_processed = stats["events_processed"]
 
-                audit_store.add(
-                    AuditEvent(
+                batch.add_audit(
+                    AuditEvent.model_construct(
                         event_type=f"collector.{collector_name}",
                         details={
                             "events_processed": events_processed,
@@ -417,7 +627,7 @@ def _run_scan_sync(
                     )
                 )
 
-        current_collector = None
+        current_stats = None
         total_events = sum(stats["events_processed"] for stats in collector_stats.values())
         if errors and total_events == 0:
             status = "failed"
@@ -425,9 +635,11 @@ def _run_scan_sync(
             status = "partial"
         else:
             status = "complete"
+        for stats in collector_stats.values():
+            stats["by_type"] = dict(stats["by_type"])
 
-        audit_store.add(
-            AuditEvent(
+        batch.add_audit(
+            AuditEvent.model_construct(
                 event_type="collector.scan.complete",
                 details={
                     "collectors": collectors,
@@ -445,7 +657,7 @@ def _run_scan_sync(
                 ),
             )
         )
-        task_event_bus.publish(
+        batch.publish(
             TaskEvent(
                 event_type="collector.scan",
                 status="complete" if status == "complete" else status,
@@ -458,14 +670,14 @@ def _run_scan_sync(
             )
         )
     except Exception as exc:  # noqa: BLE001
-        audit_store.add(
-            AuditEvent(
+        batch.add_audit(
+            AuditEvent.model_construct(
                 event_type="collector.scan.failed",
                 details={"error": str(exc), "task_id": task_id, "config_summary": config_summary},
                 status="failed",
             )
         )
-        task_event_bus.publish(
+        batch.publish(
             TaskEvent(
                 event_type="collector.scan",
                 status="failed",
@@ -473,7 +685,12 @@ def _run_scan_sync(
             )
         )
     finally:
-        _scan_registry.clear(task_id)
+        try:
+            batch.flush()
+        except Exception:
+            logger.exception("Failed to write the results of scan %s", task_id)
+        finally:
+            _scan_registry.clear(task_id)
 
 
 @router.get("/config", response_model=ScannerConfig)
@@ -498,9 +715,23 @@ async def update_config(
 
     config = _normalize_config(config)
     record = scanner_store.update_config(identity.user_id, config)
+    _forget_normalized_config(identity.user_id)
     return record.config
 
 
+def _scan_history_item(event: AuditEvent) -> ScanHistoryItem:
+    details = event.details or {}
+    return ScanHistoryItem(
+        id=str(event.audit_id),
+        started_at=event.timestamp,
+        completed_at=event.timestamp,
+        status=details.get("status", "complete"),
+        events_collected=details.get("total_events", 0),
+        error_message=("; ".join(details.get("errors", [])) if details.get("errors") else None),
+        config_summary=details.get("config_summary"),
+    )
+
+
 @router.get("/scan/history", response_model=ScanHistoryResponse)
 async def scan_history(
     limit: int = 10,
@@ -508,36 +739,18 @@ async def scan_history(
     identity: IdentityContext = _VIEWER_IDENTITY,
 ) -> ScanHistoryResponse:
     """Get scan history from audit log instead of separate scan_runs table."""
-    # Query audit events for scan completions
-    events = audit_store.list_filtered(
-        page=1,
-        page_size=limit,
+    # Query audit events for scan completions, reading only as many rows as are returned
+    events = audit_store.iter_filtered(
         event_type="collector.scan.complete",
+        chunk_size=max(1, min(limit, 50)),
     )
-
-    scans = []
-    for event in events:
-        details = event.details or {}
-        scans.append(
-            ScanHistoryItem(
-                id=str(event.audit_id),
-                started_at=event.timestamp,
-                completed_at=event.timestamp,
-                status=details.get("status", "complete"),
-                events_collected=details.get("total_events", 0),
-                error_message=(
-                    "; ".join(details.get("errors", [])) if details.get("errors") else None
-                ),
-                config_summary=details.get("config_summary"),
-            )
-        )
+    scans = [_scan_history_item(event) for event in islice(events, max(limit, 0))]
 
     return ScanHistoryResponse(scans=scans)
 
 
 @router.post("/scan", response_model=CollectorRunResponse)
 async def trigger_scan(
-    background_tasks: BackgroundTasks,
     repository: GraphRepository = _GRAPH_REPOSITORY,
     resolver: EntityResolver = _ENTITY_RESOLVER,
     audit_store: AuditStore = _AUDIT_STORE,
@@ -545,16 +758,15 @@ async def trigger_scan(
     identity: IdentityContext = _PLANNER_EXECUTOR_IDENTITY,
 ) -> CollectorRunResponse:
     """Start a network scan in the background and return immediately."""
-    task_id = str(uuid4())
+    task_id = next(_task_ids)
     record = scanner_store.get_config(identity.user_id)
-    config = _normalize_config(record.config)
+    config = _normalize_stored_config(identity.user_id, record.config)
     config_summary = _format_config_summary(config)
 
     _scan_registry.register(task_id)
 
-    # Schedule background task
-    background_tasks.add_task(
-        _run_scan_sync,
+    # Queued behind running scans once all workers are busy
+    _submit_scan(
         task_id=task_id,
         config=_build_scan_config(config),
         config_summary=config_summary,
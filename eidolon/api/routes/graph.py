@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from neo4j.exceptions import Neo4jError
 from pydantic import BaseModel, Field
 
@@ -58,13 +58,44 @@ class GraphQueryResponse(BaseModel):
     records: list[dict[str, Any]]
 
 
+# One round trip: the node page and the edges between those nodes come back together
+_CYPHER_OVERVIEW = """
+MATCH (n)
+WITH n LIMIT $node_limit
+WITH collect(n) AS ns
+CALL {
+    WITH ns
+    UNWIND ns AS a
+    MATCH (a)-[r]->(b)
+    WHERE b IN ns
+    WITH a, r, b LIMIT $edge_limit
+    RETURN collect({
+        source: a.node_id,
+        target: b.node_id,
+        type: type(r),
+        confidence: r.confidence
+    }) AS edges
+}
+RETURN [n IN ns | {
+           node_id: n.node_id,
+           label: head(labels(n)),
+           cidr: n.cidr,
+           name: n.name,
+           kind: n.kind,
+           metadata: n.metadata
+       }] AS nodes,
+       edges
+"""
+
+
 def _coerce_metadata(value: object) -> dict[str, Any]:
+    # Neo4j properties cannot hold nested maps, so metadata is stored as a JSON string
     if isinstance(value, dict):
         return value
     if isinstance(value, str):
         try:
-            parsed = json.loads(value)
-        except (json.JSONDecodeError, TypeError, ValueError):
+            parsed = orjson.loads(value)
+        except orjson.JSONDecodeError:
             return {}
         if isinstance(parsed, dict):
             return parsed
@@ -135,26 +166,17 @@ def graph_overview(
     repository: GraphRepository = _GRAPH_REPOSITORY,
     identity: IdentityContext = _VIEWER_IDENTITY,
 ) -> GraphOverviewResponse:
-    nodes_result = list(
-        repository.run_cypher(
-            """
-            MATCH (n)
-            RETURN n.node_id AS node_id,
-                   head(labels(n)) AS label,
-                   n.cidr AS cidr,
-                   n.name AS name,
-                   n.kind AS kind,
-                   n.metadata AS metadata
-            LIMIT $limit
-            """,
-            {"limit": node_limit},
-        )
-    )
+    params = {"node_limit": node_limit, "edge_limit": edge_limit}
+    result = next(iter(repository.run_cypher(_CYPHER_OVERVIEW, params)), None)
+    if not result:
+        return GraphOverviewResponse(nodes=[], edges=[])
 
     nodes: list[GraphOverviewNode] = []
-    node_ids: list[str] = []
-    for record in nodes_result:
-        node_id = _parse_uuid(record.get("node_id"))
+    # Raw node_id as returned by Neo4j -> parsed UUID; edges reuse it instead of parsing
+    node_ids: dict[object, UUID] = {}
+    for record in result.get("nodes") or []:
+        raw_id = record.get("node_id")
+        node_id = _parse_uuid(raw_id)
         if not node_id:
             continue
         metadata = _coerce_metadata(record.get("metadata"))
@@ -174,30 +196,12 @@ def graph_overview(
             metadata=metadata,
         )
         nodes.append(node)
-        node_ids.append(str(node_id))
-
-    if not node_ids:
-        return GraphOverviewResponse(nodes=[], edges=[])
-
-    edges_result = list(
-        repository.run_cypher(
-            """
-            MATCH (a)-[r]->(b)
-            WHERE a.node_id IN $node_ids AND b.node_id IN $node_ids
-            RETURN a.node_id AS source,
-                   b.node_id AS target,
-                   type(r) AS type,
-                   r.confidence AS confidence
-            LIMIT $limit
-            """,
-            {"node_ids": node_ids, "limit": edge_limit},
-        )
-    )
+        node_ids[raw_id] = node_id
 
     edges: list[GraphOverviewEdge] = []
-    for record in edges_result:
-        source = _parse_uuid(record.get("source"))
-        target = _parse_uuid(record.get("target"))
+    for record in result.get("edges") or []:
+        source = node_ids.get(record.get("source"))
+        target = node_ids.get(record.get("target"))
         if not source or not target:
             continue
         edges.append(
@@ -217,7 +221,7 @@ def execute_cypher_query(
     request: GraphQueryRequest,
     repository: GraphRepository = _GRAPH_REPOSITORY,
     identity: IdentityContext = _VIEWER_IDENTITY,
-) -> GraphQueryResponse:
+) -> Response:
     """
     Execute a raw Cypher query against the graph database.
 
@@ -226,8 +230,15 @@ def execute_cypher_query(
     """
     try:
         results = repository.run_cypher(request.cypher, request.parameters or {})
-        records = [dict(record) for record in results]
-        return GraphQueryResponse(records=records)
+        # Records are plain dicts already; encode them straight to bytes rather than
+        # validating a response model and re-serializing it. Driver types such as
+        # temporal values fall back to str().
+        records = orjson.dumps(
+            [record if isinstance(record, dict) else dict(record) for record in results],
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+        return Response(content=b'{"records":' + records + b"}", media_type="application/json")
     except (Neo4jError, TypeError, ValueError, RuntimeError) as exc:
         raise HTTPException(
             status_code=400,
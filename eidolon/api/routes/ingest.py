@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
@@ -15,7 +17,7 @@ from eidolon.core.models.event import AuditEvent, CollectorEvent
 from eidolon.core.reasoning.entity import EntityResolver
 from eidolon.core.stores import AuditStore
 from eidolon.runtime.task_events import TaskEvent, task_event_bus
-from eidolon.worker.ingest import IngestWorker
+from eidolon.worker.ingest import IngestWorker, partition_events
 
 
 class IngestResponse(BaseModel):
@@ -28,6 +30,9 @@ _ENTITY_RESOLVER = Depends(get_entity_resolver)
 _AUDIT_STORE = Depends(get_audit_store)
 _EXECUTOR_IDENTITY = Depends(require_roles("executor"))
 
+# Graph writes are network-bound, so independent chunks of a large batch overlap well
+_INGEST_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ingest")
+
 
 @router.post("/events", response_model=IngestResponse)
 def ingest_events(
@@ -37,10 +42,23 @@ def ingest_events(
     audit_store: AuditStore = _AUDIT_STORE,
     identity: IdentityContext = _EXECUTOR_IDENTITY,
 ) -> IngestResponse:
+    node_chunks, edge_events = partition_events(events)
     worker = IngestWorker(repository, resolver)
-    worker.process(events)
+    if len(node_chunks) > 1:
+        # One worker per chunk; chunks never touch the same node
+        futures = [
+            _INGEST_EXECUTOR.submit(IngestWorker(repository, resolver).process, chunk)
+            for chunk in node_chunks
+        ]
+        for future in as_completed(futures):
+            future.result()
+    else:
+        for chunk in node_chunks:
+            worker.process(chunk)
+    # Edges resolve their endpoints against the nodes written above
+    worker.process(edge_events)
     audit_store.add(
-        AuditEvent(
+        AuditEvent.model_construct(
             event_type="ingest",
             details={"accepted": len(events)},
             status="ok",
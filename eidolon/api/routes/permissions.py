@@ -24,7 +24,8 @@ def get_permissions(
     store: SettingsStore = _SETTINGS_STORE,
 ) -> PermissionsResponse:
     """Get sandbox permissions."""
-    return PermissionsResponse(sandbox=store.get_settings())
+    # The store hands back a validated model; skip validating it a second time
+    return PermissionsResponse.model_construct(sandbox=store.get_settings())
 
 
 @router.put("/", response_model=PermissionsResponse)
@@ -35,4 +36,4 @@ def update_permissions(
 ) -> PermissionsResponse:
     """Update sandbox permissions."""
     store.update_settings(permissions)
-    return PermissionsResponse(sandbox=store.get_settings())
+    return PermissionsResponse.model_construct(sandbox=store.get_settings())
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 from eidolon.api.dependencies import (
     get_approval_store,
+    get_audit_sink,
     get_audit_store,
+    get_execution_engine,
     get_graph_repository,
-    get_llm_client,
+    get_planner,
     require_roles,
 )
 from eidolon.api.middleware.auth import IdentityContext
-from eidolon.config.settings import get_settings
 from eidolon.core.graph.algorithms import blast_radius
 from eidolon.core.graph.repository import GraphRepository
 from eidolon.core.models.event import AuditEvent
@@ -23,11 +32,13 @@ from eidolon.core.models.plan import (
     PlanStep,
     ToolExecutionResult,
 )
-from eidolon.core.reasoning.llm import LiteLLMClient
 from eidolon.core.reasoning.planner import Planner
 from eidolon.core.stores import ApprovalStore, AuditStore
 from eidolon.runtime.executor import ExecutionEngine
-from eidolon.runtime.task_events import TaskEvent, task_event_bus
+from eidolon.runtime.task_events import TaskEvent, task_event_pump
+from eidolon.worker.audit_sink import AuditSink
+
+logger = logging.getLogger(__name__)
 
 
 class PlanRequest(BaseModel):
@@ -43,22 +54,64 @@ class PlanResponse(BaseModel):
 router = APIRouter(prefix="/plan", tags=["plan"])
 _APPROVAL_STORE = Depends(get_approval_store)
 _AUDIT_STORE = Depends(get_audit_store)
+_AUDIT_SINK = Depends(get_audit_sink)
+_EXECUTION_ENGINE = Depends(get_execution_engine)
 _GRAPH_REPOSITORY = Depends(get_graph_repository)
-_LLM_CLIENT = Depends(get_llm_client)
+_PLANNER = Depends(get_planner)
 _PLANNER_EXECUTOR_IDENTITY = Depends(require_roles("planner", "executor"))
 _EXECUTOR_IDENTITY = Depends(require_roles("executor"))
 
+# Dumps a whole result list in one pass instead of one model_dump() per step
+_RESULTS_ADAPTER = TypeAdapter(list[ToolExecutionResult])
+
+_PLAN_CACHE_SIZE = 512
+_PLAN_CACHE_TTL_SECONDS = 300.0
+# Recent LLM plans keyed by normalized intent, target and model. Fallback plans are
+# never cached, so a transient LLM failure is retried on the next request.
+_plan_cache: OrderedDict[bytes, tuple[float, list[PlanStep]]] = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _plan_cache_key(intent: str, target: EntityRef, model: str) -> bytes:
+    material = b"|".join(
+        (intent.strip().lower().encode(), target.model_dump_json().encode(), model.encode())
+    )
+    return hashlib.blake2b(material, digest_size=16).digest()
+
+
+def _generate_plan(planner: Planner, intent: str, target: EntityRef) -> list[PlanStep]:
+    key = _plan_cache_key(intent, target, planner.llm_client.settings.model)
+    now = time.monotonic()
+    with _plan_cache_lock:
+        cached = _plan_cache.get(key)
+        if cached is not None and now - cached[0] < _PLAN_CACHE_TTL_SECONDS:
+            _plan_cache.move_to_end(key)
+        else:
+            cached = None
+    if cached is not None:
+        # Fresh step ids and parameter dicts, so no two responses share state
+        return [step.model_copy(update={"step_id": str(uuid4())}, deep=True) for step in cached[1]]
+
+    steps = planner.draft_plan(intent, target)
+    if steps is None:
+        return planner.fallback_plan(intent, target)
+    with _plan_cache_lock:
+        _plan_cache[key] = (now, [step.model_copy(deep=True) for step in steps])
+        _plan_cache.move_to_end(key)
+        while len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return steps
+
 
 @router.post("/", response_model=PlanResponse)
 def plan_endpoint(
     request: PlanRequest,
     repository: GraphRepository = _GRAPH_REPOSITORY,
     audit_store: AuditStore = _AUDIT_STORE,
-    llm_client: LiteLLMClient = _LLM_CLIENT,
+    planner: Planner = _PLANNER,
     identity: IdentityContext = _PLANNER_EXECUTOR_IDENTITY,
 ) -> PlanResponse:
-    planner = Planner(llm_client=llm_client)
-    steps = planner.generate_plan(intent=request.intent, target=request.target)
+    steps = _generate_plan(planner, request.intent, request.target)
     radius = None
     if request.target.entity_id:
         radius = blast_radius(repository, [request.target.entity_id], depth=2)
@@ -76,27 +129,48 @@ def plan_endpoint(
     return PlanResponse(steps=steps, blast_radius=radius)
 
 
+def _step_dependencies(steps: list[PlanStep]) -> list[list[int]]:
+    """Indices of the steps each step waits for.
+
+    A step without ``depends_on`` waits for the one before it, so plans that do not
+    declare dependencies still run in order.
+    """
+    positions: dict[str, int] = {}
+    dependencies: list[list[int]] = []
+    for index, step in enumerate(steps):
+        if step.depends_on is None:
+            dependencies.append([index - 1] if index else [])
+        else:
+            predecessors = []
+            for step_id in step.depends_on:
+                if step_id not in positions:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"step {step.step_id} depends on unknown or later step {step_id}",
+                    )
+                predecessors.append(positions[step_id])
+            dependencies.append(predecessors)
+        positions.setdefault(step.step_id, index)
+    return dependencies
+
+
 @router.post("/execute", response_model=ExecutionResponse)
-def execute_endpoint(
+async def execute_endpoint(
     request: ExecutionRequest,
     approval_store: ApprovalStore = _APPROVAL_STORE,
-    audit_store: AuditStore = _AUDIT_STORE,
-    repository: GraphRepository = _GRAPH_REPOSITORY,
+    audit_sink: AuditSink = _AUDIT_SINK,
+    engine: ExecutionEngine = _EXECUTION_ENGINE,
     identity: IdentityContext = _EXECUTOR_IDENTITY,
 ) -> ExecutionResponse:
-    needs_approval = request.requires_approval or any(
-        step.requires_approval for step in request.steps
-    )
-    if not request.dry_run and needs_approval:
+    if not request.dry_run and request.needs_approval:
         if not request.approval_token:
             raise HTTPException(status_code=403, detail="approval token required for execution")
-        approval = approval_store.get_by_token(request.approval_token)
+        approval = await asyncio.to_thread(approval_store.get_by_token, request.approval_token)
         if not approval or approval.action != "execute":
             raise HTTPException(status_code=403, detail="invalid approval token")
 
-    settings = get_settings()
-    engine = ExecutionEngine(repository, runtime_settings=settings.sandbox)
-    task_event_bus.publish(
+    dependencies = _step_dependencies(request.steps)
+    task_event_pump.publish(
         TaskEvent(
             event_type="execute",
             status="started",
@@ -106,18 +180,40 @@ def execute_endpoint(
             },
         )
     )
-    results: list[ToolExecutionResult] = []
-    for step in request.steps:
-        task_event_bus.publish(
+
+    # Steps whose tool raised; anything waiting on them is skipped rather than run
+    failed: set[str] = set()
+
+    async def run_step(step: PlanStep, after: list[asyncio.Task]) -> ToolExecutionResult:
+        if after:
+            blocked = [
+                result.step_id
+                for result in await asyncio.gather(*after)
+                if result.step_id in failed
+            ]
+            if blocked:
+                failed.add(step.step_id)
+                return ToolExecutionResult(
+                    step_id=step.step_id,
+                    status="skipped",
+                    error=f"dependency failed: {', '.join(blocked)}",
+                )
+        task_event_pump.publish(
             TaskEvent(
                 event_type="execute.step",
                 status="started",
                 payload={"step_id": step.step_id, "action_type": step.action_type},
             )
         )
-        result = engine.execute_step(step, dry_run=request.dry_run)
-        results.append(result)
-        task_event_bus.publish(
+        try:
+            result = await asyncio.to_thread(engine.execute_step, step, dry_run=request.dry_run)
+        except Exception as exc:
+            # Recorded like any other failed step so the audit event still covers
+            # the independent steps that ran alongside it
+            logger.exception("Step %s failed", step.step_id)
+            failed.add(step.step_id)
+            result = ToolExecutionResult(step_id=step.step_id, status="error", error=str(exc))
+        task_event_pump.publish(
             TaskEvent(
                 event_type="execute.step",
                 status=result.status,
@@ -129,8 +225,16 @@ def execute_endpoint(
                 },
             )
         )
+        return result
+
+    # Independent steps run side by side; results keep the request's order
+    tasks: list[asyncio.Task] = []
+    for step, predecessors in zip(request.steps, dependencies, strict=True):
+        after = [tasks[index] for index in predecessors]
+        tasks.append(asyncio.create_task(run_step(step, after)))
+    results: list[ToolExecutionResult] = list(await asyncio.gather(*tasks))
     status = "ok" if all(result.status != "error" for result in results) else "partial_failure"
-    task_event_bus.publish(
+    task_event_pump.publish(
         TaskEvent(
             event_type="execute",
             status=status,
@@ -147,11 +251,12 @@ def execute_endpoint(
             "dry_run": request.dry_run,
             "steps": len(request.steps),
             "status": status,
-            "results": [result.model_dump() for result in results],
+            "results": _RESULTS_ADAPTER.dump_python(results, mode="json"),
         },
         status=status,
     )
-    audit_store.add(audit_event)
+    # Persisted by the sink shortly after the response; audit_id is final already
+    audit_sink.add(audit_event)
     return ExecutionResponse(
         request=request,
         results=results,
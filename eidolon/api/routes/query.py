@@ -49,6 +49,40 @@ _GRAPH_REPOSITORY = Depends(get_graph_repository)
 _LLM_CLIENT = Depends(get_llm_client)
 _VIEWER_IDENTITY = Depends(require_roles("viewer", "planner", "executor"))
 
+# Every rule's anchor in one pattern, each inside a lookahead so rules never consume
+# text another rule needs; one scan reports the leftmost match of every rule.
+_RULES_RE = re.compile(
+    r"(?=(?P<path>from\s+(?P<src>[\w\.-]+)\s+to\s+(?P<dst>[\w\.-]+)))"
+    r"|(?=(?P<network>assets? in network\s+(?P<net>[\w\./-]+)))"
+)
+
+
+# Keywords the rules are gated on, found in one scan and folded into a bitmap so each
+# rule's guard is a bitwise test rather than another substring search.
+_PATH, _NETWORK, _POLICY, _GOVERN, _ATTACHED = 1, 2, 4, 8, 16
+_KEYWORD_BITS = {
+    "path": _PATH,
+    "network": _NETWORK,
+    "policy": _POLICY,
+    "govern": _GOVERN,
+    "attached": _ATTACHED,
+}
+_KEYWORDS_RE = re.compile("|".join(_KEYWORD_BITS))
+
+
+def _keyword_bits(q: str) -> int:
+    bits = 0
+    for keyword in _KEYWORDS_RE.findall(q):
+        bits |= _KEYWORD_BITS[keyword]
+    return bits
+
+
+def _match_rules(q: str) -> dict[str, re.Match[str]]:
+    matches: dict[str, re.Match[str]] = {}
+    for match in _RULES_RE.finditer(q):
+        matches.setdefault(match.lastgroup or "", match)
+    return matches
+
 
 class NaturalLanguageQueryInterpreter:
     """
@@ -64,9 +98,12 @@ class NaturalLanguageQueryInterpreter:
 
     def _parse_rules(self, question: str) -> NLQueryPlan:
         q = question.lower()
+        bits = _keyword_bits(q)
+        # Both regex rules need one of their keywords; skip the scan when neither is there
+        matches = _match_rules(q) if bits & (_PATH | _NETWORK) else {}
 
-        path_match = re.search(r"from\s+(?P<src>[\w\.-]+)\s+to\s+(?P<dst>[\w\.-]+)", q)
-        if "path" in q and path_match:
+        path_match = matches.get("path") if bits & _PATH else None
+        if path_match:
             src = path_match.group("src")
             dst = path_match.group("dst")
             cypher = (
@@ -83,7 +120,7 @@ class NaturalLanguageQueryInterpreter:
                 ),
             )
 
-        assets_in_network = re.search(r"assets? in network\s+(?P<net>[\w\./-]+)", q)
+        assets_in_network = matches.get("network")
         if assets_in_network:
             network = assets_in_network.group("net")
             cypher = (
@@ -96,7 +133,7 @@ class NaturalLanguageQueryInterpreter:
                 graph_query=GraphQuery(cypher=cypher, parameters={"network": network}),
             )
 
-        if "policy" in q and ("govern" in q or "attached" in q):
+        if bits & _POLICY and bits & (_GOVERN | _ATTACHED):
             cypher = "MATCH (a:Asset)-[:GOVERNED_BY]->(p:Policy) " "RETURN a, p LIMIT 100"
             return NLQueryPlan(
                 answer="Fetching governed assets and their policies.",
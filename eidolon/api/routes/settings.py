@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel, Field
 
-from eidolon.api.dependencies import get_llm_client, get_settings_store, require_roles
+from eidolon.api.dependencies import build_planner, get_settings_store, require_roles
 from eidolon.api.middleware.auth import IdentityContext
 from eidolon.config.settings import LLMSettings, get_settings
 from eidolon.core.models.settings import AppSettings, ThemeSettings
+from eidolon.core.reasoning.llm import LiteLLMClient
 from eidolon.core.stores import SettingsStore
 
 router = APIRouter(prefix="/settings", tags=["settings"])
@@ -39,11 +40,13 @@ def get_app_settings(
     identity: IdentityContext = _VIEWER_IDENTITY,
 ) -> AppSettingsResponse:
     settings = store.get_app_settings()
-    return AppSettingsResponse(theme=settings.theme, llm=settings.llm)
+    # Both parts come from an already validated AppSettings
+    return AppSettingsResponse.model_construct(theme=settings.theme, llm=settings.llm)
 
 
 @router.put("/", response_model=AppSettingsResponse)
 def update_app_settings(
+    request: Request,
     payload: AppSettingsUpdate,
     store: SettingsStore = _SETTINGS_STORE,
     identity: IdentityContext = _EXECUTOR_IDENTITY,
@@ -66,5 +69,9 @@ def update_app_settings(
 
     updated = AppSettings(theme=theme, llm=llm)
     store.update_app_settings(updated)
-    get_llm_client.cache_clear()
-    return AppSettingsResponse(theme=updated.theme, llm=updated.llm)
+    # A theme-only update keeps the running client (and its planner) as they are
+    if updated.llm != current.llm:
+        llm_client = LiteLLMClient(settings=updated.llm)
+        request.app.state.llm_client = llm_client
+        request.app.state.planner = build_planner(llm_client)
+    return AppSettingsResponse.model_construct(theme=updated.theme, llm=updated.llm)
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 
+import orjson
 import uvicorn
+from neo4j.exceptions import ClientError
 
 from eidolon.api.app import app
-from eidolon.api.dependencies import get_scanner_store
+from eidolon.api.dependencies import build_pg_pool, build_scanner_store
 from eidolon.collectors.factory import build_manager
 from eidolon.core.graph.neo4j import Neo4jGraphRepository
 from eidolon.core.models.scanner import ScannerConfig
 from eidolon.core.reasoning.entity import EntityResolver
+from eidolon.db.postgres.store import open_pool
 from eidolon.worker.ingest import IngestWorker
+from eidolon.worker.ingest_queue import IngestQueue
+
+# Reads the count store instead of scanning every node and relationship
+_APOC_STATS = (
+    "CALL apoc.meta.stats() YIELD nodeCount, relCount, labels, relTypesCount "
+    "RETURN nodeCount, relCount, labels, relTypesCount"
+)
+
+
+def _dump(obj: object) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
 
 
 def _make_help_handler(parser: argparse.ArgumentParser):
@@ -29,6 +42,7 @@ def _build_scan_config(config: ScannerConfig) -> dict:
             "cidrs": config.network_cidrs,
             "ping_concurrency": config.options.ping_concurrency,
             "port_scan_workers": config.options.port_scan_workers,
+            "min_rate": config.options.min_rate,
             "ports": config.ports,
             "port_preset": config.port_preset,
             "dns_resolution": config.options.dns_resolution,
@@ -38,26 +52,38 @@ def _build_scan_config(config: ScannerConfig) -> dict:
 
 
 def cmd_scan(args: argparse.Namespace) -> int:
-    store = get_scanner_store()
-    record = store.get_config("cli-user")
+    pool = build_pg_pool()
+    if pool is not None:
+        open_pool(pool)
+    try:
+        record = build_scanner_store(pool).get_config("cli-user")
+    finally:
+        if pool is not None:
+            pool.close()
     config = _build_scan_config(record.config)
     repository = Neo4jGraphRepository()
     try:
         resolver = EntityResolver()
-        worker = IngestWorker(repository, resolver)
+        # Collectors hand events off; a background thread writes them to Neo4j
+        ingest_queue = IngestQueue(IngestWorker(repository, resolver))
+        ingest_queue.start()
 
         event_count = 0
 
         def emit_fn(event) -> None:
             nonlocal event_count
             event_count += 1
-            worker.process_event(event)
+            ingest_queue.put(event)
 
         manager = build_manager(config, emit_fn)
         collectors = manager.list_collectors()
         print(f"Starting network scan: {', '.join(collectors)}")
 
-        errors = manager.run_all()
+        try:
+            errors = manager.run_all()
+        finally:
+            ingest_queue.close()
+        errors.extend(ingest_queue.errors)
 
         print(f"Scan complete: {event_count} events ingested into Neo4j")
 
@@ -72,36 +98,67 @@ def cmd_scan(args: argparse.Namespace) -> int:
         repository.close()
 
 
+def _catalog_stats(repository: Neo4jGraphRepository) -> dict | None:
+    """Node and relationship counts from APOC's count store, or None without APOC."""
+    try:
+        return next(iter(repository.run_cypher(_APOC_STATS)), None)
+    except ClientError:
+        return None
+
+
+def _print_catalog_stats(stats: dict) -> None:
+    print("")
+    # The count store tracks single labels, so unlike the full scan a node
+    # with several labels is counted under each and unlabeled nodes are not
+    # listed; say so rather than print numbers that look comparable.
+    print("Node counts by label (per single label; multi-label nodes count once per label):")
+    for label, count in stats["labels"].items():
+        if count:
+            print(f"  {label}: {count}")
+    print("")
+    print(f"Total nodes: {stats['nodeCount']}")
+
+    print("")
+    print("Relationship counts by type:")
+    for rel_type, count in stats["relTypesCount"].items():
+        if count:
+            print(f"  {rel_type}: {count}")
+    print("")
+    print(f"Total relationships: {stats['relCount']}")
+
+
 def cmd_db(args: argparse.Namespace) -> int:
     repository = Neo4jGraphRepository()
     try:
         if args.action == "stats":
-            result = list(
-                repository.run_cypher("MATCH (n) RETURN labels(n) as label, count(*) as count")
-            )
-            print("")
-            print("Node counts by label:")
-            total = 0
-            for record in result:
-                labels = record.get("label") or []
-                count = record.get("count", 0)
-                label_str = ":".join(labels) if labels else "(unlabeled)"
-                print(f"  {label_str}: {count}")
-                total += count
-            print("")
-            print(f"Total nodes: {total}")
-
-            result = list(
-                repository.run_cypher("MATCH ()-[r]->() RETURN type(r) as type, count(*) as count")
-            )
-            print("")
-            print("Relationship counts by type:")
-            rel_total = 0
-            for record in result:
-                print(f"  {record.get('type')}: {record.get('count')}")
-                rel_total += record.get("count", 0)
-            print("")
-            print(f"Total relationships: {rel_total}")
+            stats = _catalog_stats(repository)
+            if stats is not None:
+                _print_catalog_stats(stats)
+            else:
+                print("")
+                print("Node counts by label combination:")
+                total = 0
+                for record in repository.iter_cypher(
+                    "MATCH (n) RETURN labels(n) as label, count(*) as count"
+                ):
+                    labels = record.get("label") or []
+                    count = record.get("count", 0)
+                    label_str = ":".join(labels) if labels else "(unlabeled)"
+                    print(f"  {label_str}: {count}")
+                    total += count
+                print("")
+                print(f"Total nodes: {total}")
+
+                print("")
+                print("Relationship counts by type:")
+                rel_total = 0
+                for record in repository.iter_cypher(
+                    "MATCH ()-[r]->() RETURN type(r) as type, count(*) as count"
+                ):
+                    print(f"  {record.get('type')}: {record.get('count')}")
+                    rel_total += record.get("count", 0)
+                print("")
+                print(f"Total relationships: {rel_total}")
 
         elif args.action == "clear":
             confirm = input(
@@ -117,9 +174,9 @@ def cmd_db(args: argparse.Namespace) -> int:
             if not args.cypher:
                 print("cypher is required for db query")
                 return 1
-            result = list(repository.run_cypher(args.cypher))
-            for record in result:
-                print(json.dumps(dict(record), indent=2, default=str))
+            # Print each record as it is fetched instead of buffering the whole result
+            for record in repository.iter_cypher(args.cypher):
+                print(_dump(record))
     finally:
         repository.close()
     return 0
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field, fields
 
 from eidolon.collectors.manager import CollectorManager
 from eidolon.collectors.network import NetworkCollector
 from eidolon.core.models.event import CollectorEvent
 
 
+@dataclass(frozen=True, slots=True)
+class NetworkConfig:
+    """Options of a scan config's ``network`` section, with the collector's defaults."""
+
+    cidrs: list[str] = field(default_factory=list)
+    ping_concurrency: int = 64
+    port_scan_workers: int = 32
+    min_rate: int = 0
+    ports: list[int] | None = None
+    port_preset: str | None = None
+    dns_resolution: bool = True
+    aggressive: bool = False
+    nmap_path: str = "nmap"
+
+    @classmethod
+    def from_dict(cls, config: dict) -> NetworkConfig:
+        # One pass over the keys present; anything missing keeps its default
+        return cls(**{key: value for key, value in config.items() if key in _NETWORK_FIELDS})
+
+
+_NETWORK_FIELDS = frozenset(f.name for f in fields(NetworkConfig))
+
+
 def build_manager(
     config: dict,
     emit_fn,
@@ -18,16 +42,18 @@ def build_manager(
     if network_cfg is None:
         return manager
 
+    network = NetworkConfig.from_dict(network_cfg)
     manager.register(
         NetworkCollector(
-            cidrs=network_cfg.get("cidrs", []),
-            ping_concurrency=network_cfg.get("ping_concurrency", 64),
-            port_scan_workers=network_cfg.get("port_scan_workers", 32),
-            ports=network_cfg.get("ports"),
-            port_preset=network_cfg.get("port_preset"),
-            dns_resolution=network_cfg.get("dns_resolution", True),
-            aggressive=network_cfg.get("aggressive", False),
-            nmap_path=network_cfg.get("nmap_path", "nmap"),
+            cidrs=network.cidrs,
+            ping_concurrency=network.ping_concurrency,
+            port_scan_workers=network.port_scan_workers,
+            min_rate=network.min_rate,
+            ports=network.ports,
+            port_preset=network.port_preset,
+            dns_resolution=network.dns_resolution,
+            aggressive=network.aggressive,
+            nmap_path=network.nmap_path,
             cancellation_checker=cancellation_checker,
             progress_callback=progress_callback,
         )
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from eidolon.collectors.base import BaseCollector
 from eidolon.core.models.event import CollectorEvent
@@ -12,18 +14,51 @@ class CollectorManager:
     def __init__(self, emit_fn: Callable[[CollectorEvent], None]) -> None:
         self.emit_fn = emit_fn
         self._collectors: dict[str, BaseCollector] = {}
+        # Registration-order snapshot for run_all, rebuilt on register
+        self._order: tuple[BaseCollector, ...] = ()
 
     def register(self, collector: BaseCollector) -> None:
         collector.emit_fn = self.emit_fn
         self._collectors[collector.name] = collector
+        self._order = tuple(self._collectors.values())
 
     def run_all(self) -> list[Exception]:
+        """Run every collector, concurrently when more than one is registered.
+
+        Concurrent collectors share one lock around ``emit_fn`` so callers never see
+        overlapping emits.
+        """
+        collectors = self._order
         errors: list[Exception] = []
-        for collector in self._collectors.values():
-            try:
-                collector.run()
-            except Exception as exc:  # noqa: BLE001
-                errors.append(exc)
+        if len(collectors) <= 1:
+            for collector in collectors:
+                try:
+                    collector.run()
+                except Exception as exc:  # noqa: BLE001
+                    errors.append(exc)
+            return errors
+
+        emit_lock = threading.Lock()
+
+        def emit(event: CollectorEvent) -> None:
+            with emit_lock:
+                self.emit_fn(event)
+
+        for collector in collectors:
+            collector.emit_fn = emit
+        try:
+            with ThreadPoolExecutor(
+                max_workers=len(collectors), thread_name_prefix="collector"
+            ) as pool:
+                futures = [pool.submit(collector.run) for collector in collectors]
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        errors.append(exc)
+        finally:
+            for collector in collectors:
+                collector.emit_fn = self.emit_fn
         return errors
 
     def run_selected(self, names: Iterable[str]) -> list[Exception]:
@@ -39,3 +74,7 @@ class CollectorManager:
 
     def list_collectors(self) -> list[str]:
         return list(self._collectors.keys())
+
+    def iter_collectors(self) -> Iterable[tuple[str, BaseCollector]]:
+        """Registered ``(name, collector)`` pairs in registration order."""
+        return self._collectors.items()
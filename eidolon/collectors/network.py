@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import ipaddress
+import queue
 import subprocess
-from collections.abc import Callable, Iterable
-from contextlib import suppress
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime
-from typing import Any
+from typing import IO, Any
 
 from defusedxml import ElementTree as DefusedET
 
 from eidolon.collectors.base import BaseCollector
 from eidolon.core.models.event import CollectorEvent
 
+# Block-buffered binary pipe: the XML parser pulls 16 KiB at a time, so each refill
+# takes up to a full pipe's worth from nmap in one read() instead of 8 KiB slices.
+_PIPE_BUFFER_SIZE = 64 * 1024
+
+# Upper bound on concurrent nmap processes for one port scan; each holds its own raw
+# sockets and, in aggressive mode, runs OS and version detection.
+_MAX_PORT_SCAN_SHARDS = 8
+
+# How often collect() rechecks cancellation and shard failures while no host arrives
+_SHARD_POLL_SECONDS = 0.25
+
 
 class ScanCancelledError(Exception):
     """Raised when a scan is cancelled."""
@@ -31,6 +46,7 @@ class NetworkCollector(BaseCollector):
         cidrs: list[str],
         ping_concurrency: int = 64,
         port_scan_workers: int = 32,
+        min_rate: int = 0,
         ports: list[int] | None = None,
         port_preset: str | None = None,
         dns_resolution: bool = True,
@@ -44,6 +60,7 @@ class NetworkCollector(BaseCollector):
         self.cidrs = cidrs
         self.ping_concurrency = ping_concurrency
         self.port_scan_workers = port_scan_workers
+        self.min_rate = min_rate
         self.ports = ports or []
         self.port_preset = port_preset
         self.dns_resolution = dns_resolution
@@ -52,7 +69,8 @@ class NetworkCollector(BaseCollector):
         self.nse_scripts = self._default_nse_scripts() if nse_scripts is None else nse_scripts
         self.cancellation_checker = cancellation_checker
         self.progress_callback = progress_callback
-        self._active_process: subprocess.Popen | None = None
+        self._active_processes: set[subprocess.Popen] = set()
+        self._process_lock = threading.Lock()
 
     def _send_progress(self, message: str) -> None:
         """Send formatted progress message to callback."""
@@ -64,32 +82,40 @@ class NetworkCollector(BaseCollector):
         host_to_cidr: dict[str, str] = {}
 
         self._send_progress(f"Starting scan of {len(self.cidrs)} network(s)...")
+        self._check_cancellation()
 
-        for cidr in self.cidrs:
-            # Check cancellation before each target
-            self._check_cancellation()
-
-            self._send_progress(f"Discovering hosts in {cidr}...")
-            sweep_args = ["-sn", "-oX", "-", cidr]
-            sweep_args = self._with_dns_flag(sweep_args)
-            sweep_args = self._with_parallelism(sweep_args, self.ping_concurrency)
-            sweep_xml = self._run_nmap(sweep_args, show_output=False)
-            hosts = self._parse_ping_sweep(sweep_xml, cidr)
-
-            if hosts:
-                self._send_progress(f"Found {len(hosts)} live host(s) in {cidr}")
-                for host in hosts:
+        # One sweep over every target: nmap's startup and raw-socket setup are paid once,
+        # and live hosts are mapped back to the target they came from afterwards.
+        hosts: list[dict] = []
+        if self.cidrs:
+            self._send_progress(f"Discovering hosts in {', '.join(self.cidrs)}...")
+            sweep_args = ["-sn", "-oX", "-", *self.cidrs]
+            self._add_dns_flag(sweep_args)
+            self._add_parallelism(sweep_args, self.ping_concurrency)
+            with self._nmap_output(sweep_args) as sweep_xml:
+                hosts = self._parse_ping_sweep(sweep_xml, self.cidrs)
+
+        hosts_by_cidr: dict[str | None, list[dict]] = {cidr: [] for cidr in self.cidrs}
+        for host in hosts:
+            hosts_by_cidr.setdefault(host.get("cidr"), []).append(host)
+
+        for cidr, cidr_hosts in hosts_by_cidr.items():
+            label = cidr or "other targets"
+            if cidr_hosts:
+                self._send_progress(f"Found {len(cidr_hosts)} live host(s) in {label}")
+                for host in cidr_hosts:
                     ip = host.get("ip")
                     hostname = host.get("hostname")
                     if ip:
                         discovered_hosts.append(ip)
-                        host_to_cidr[ip] = cidr
+                        if cidr:
+                            host_to_cidr[ip] = cidr
                         host_desc = f"{ip} ({hostname})" if hostname else ip
                         self._send_progress(f"  → {host_desc}")
             else:
-                self._send_progress(f"No live hosts found in {cidr}")
+                self._send_progress(f"No live hosts found in {label}")
 
-            for host in hosts:
+            for host in cidr_hosts:
                 yield self._build_event(host)
 
         # Check cancellation before port scan
@@ -97,10 +123,18 @@ class NetworkCollector(BaseCollector):
 
         port_spec = self._build_port_spec()
         if port_spec and discovered_hosts:
-            self._send_progress(f"\nScanning ports on {len(discovered_hosts)} host(s)...")
-            port_scan_args = ["-Pn", *port_spec, "-oX", "-", *discovered_hosts]
-            port_scan_args = self._with_dns_flag(port_scan_args)
-            port_scan_args = self._with_parallelism(port_scan_args, self.port_scan_workers)
+            # Shards run as separate nmap processes so one slow host only holds up its
+            # own shard; the parallelism and rate budgets are split between them.
+            shards = min(_MAX_PORT_SCAN_SHARDS, self.port_scan_workers, len(discovered_hosts))
+            shards = max(shards, 1)
+            self._send_progress(
+                f"\nScanning ports on {len(discovered_hosts)} host(s)"
+                + (f" in {shards} parallel batches..." if shards > 1 else "...")
+            )
+            port_scan_args = ["-Pn", *port_spec, "-oX", "-"]
+            self._add_dns_flag(port_scan_args)
+            self._add_parallelism(port_scan_args, max(self.port_scan_workers // shards, 1))
+            self._add_rate(port_scan_args, -(-self.min_rate // shards))
             if self.aggressive:
                 port_scan_args.extend(["-O", "-sV", "--version-all", "--traceroute", "--reason"])
                 script_args = self._build_script_args()
@@ -111,120 +145,249 @@ class NetworkCollector(BaseCollector):
                     "(OS detection + version detection + scripts + traceroute)"
                 )
 
-            port_scan_xml = self._run_nmap(port_scan_args, show_output=False)
-
-            for host_payload in self._parse_port_scan(port_scan_xml):
-                cidr = host_to_cidr.get(host_payload.get("ip", ""))
-                if cidr:
-                    host_payload["cidr"] = cidr
-
-                # Report open ports
-                ip = host_payload.get("ip")
-                ports = host_payload.get("ports", [])
-                open_ports = [p for p in ports if p.get("state") == "open"]
-                if open_ports:
-                    self._send_progress(f"  {ip}: {len(open_ports)} open port(s)")
-                    for port in open_ports:
-                        service = port.get("service", "unknown")
-                        self._send_progress(f"    → {port['port']}/{service}")
-                else:
-                    self._send_progress(f"  {ip}: No open ports found")
-
-                yield self._build_event(host_payload)
+            # Shards parse their own output and queue each host as soon as nmap reports
+            # it, so events flow while the slower shards are still scanning.
+            results: queue.Queue[dict] = queue.Queue()
+            pool = ThreadPoolExecutor(max_workers=shards, thread_name_prefix="nmap-shard")
+            futures = [
+                pool.submit(
+                    self._scan_ports, [*port_scan_args, *discovered_hosts[index::shards]], results
+                )
+                for index in range(shards)
+            ]
+            pending = set(futures)
+            try:
+                while pending or not results.empty():
+                    try:
+                        host_payload = results.get(timeout=_SHARD_POLL_SECONDS)
+                    except queue.Empty:
+                        self._check_cancellation()
+                        for future in [future for future in pending if future.done()]:
+                            pending.discard(future)
+                            future.result()  # re-raise a shard's failure
+                        continue
+
+                    cidr = host_to_cidr.get(host_payload.get("ip", ""))
+                    if cidr:
+                        host_payload["cidr"] = cidr
+
+                    # Report open ports
+                    ip = host_payload.get("ip")
+                    ports = host_payload.get("ports", [])
+                    open_ports = [p for p in ports if p.get("state") == "open"]
+                    if open_ports:
+                        self._send_progress(f"  {ip}: {len(open_ports)} open port(s)")
+                        for port in open_ports:
+                            service = port.get("service", "unknown")
+                            self._send_progress(f"    → {port['port']}/{service}")
+                    else:
+                        self._send_progress(f"  {ip}: No open ports found")
+
+                    yield self._build_event(host_payload)
+            finally:
+                # On failure or cancellation, stop the shards still running
+                for future in futures:
+                    future.cancel()
+                self._terminate_processes()
+                pool.shutdown(wait=True)
 
         self._send_progress("\nScan complete!")
 
     def _check_cancellation(self) -> None:
         """Check if scan was cancelled and raise exception if so."""
         if self.cancellation_checker and self.cancellation_checker():
-            # Kill active process if running
-            if self._active_process:
-                with suppress(Exception):
-                    self._active_process.terminate()
-                    self._active_process.wait(timeout=2)
-                with suppress(Exception):
-                    self._active_process.kill()
-                self._active_process = None
+            self._terminate_processes()
             raise ScanCancelledError("Scan was cancelled")
 
-    def _run_nmap(self, args: list[str], show_output: bool = True) -> str:
+    def _terminate_processes(self) -> None:
+        """Stop every nmap process this collector still has running."""
+        with self._process_lock:
+            processes = list(self._active_processes)
+        for process in processes:
+            with suppress(Exception):
+                process.terminate()
+                process.wait(timeout=2)
+            with suppress(Exception):
+                process.kill()
+
+    def _scan_ports(self, args: list[str], results: queue.Queue[dict]) -> None:
+        """Run one port-scan shard, putting each host on ``results`` once it is parsed."""
+        with self._nmap_output(args) as xml:
+            for host_payload in self._iter_port_scan(xml):
+                results.put(host_payload)
+
+    @contextmanager
+    def _nmap_output(self, args: list[str]) -> Iterator[IO[bytes]]:
+        """Run nmap and hand its XML stdout to the caller as a stream.
+
+        The report is parsed straight off the pipe instead of being collected first.
+        stderr is drained on a side thread so neither pipe can fill up and stall nmap.
+        A non-zero exit raises ``RuntimeError`` with nmap's stderr, including when the
+        output it left behind was not parseable.
+        """
         cmd = [self.nmap_path, *args]
+        process = subprocess.Popen(  # noqa: S603
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=_PIPE_BUFFER_SIZE,
+        )
+        with self._process_lock:
+            self._active_processes.add(process)
+        stderr = bytearray()
+        drain = threading.Thread(
+            target=lambda: stderr.extend(process.stderr.read()), name="nmap-stderr", daemon=True
+        )
+        drain.start()
         try:
-            self._active_process = subprocess.Popen(  # noqa: S603
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-            )
-
-            # Capture output line by line
-            stdout_lines = []
-            # Read stdout in real-time
-            if self._active_process.stdout:
-                for line in iter(self._active_process.stdout.readline, ""):
-                    if not line:
-                        break
-                    stdout_lines.append(line)
-                    # Only send raw output to UI if show_output is True (for debugging)
-                    # Normally we send custom formatted messages via _send_progress
-                    # Check cancellation while reading
-                    if self.cancellation_checker and self.cancellation_checker():
-                        self._check_cancellation()
-
-            # Wait for process to complete and get stderr
-            _, stderr = self._active_process.communicate()
-            returncode = self._active_process.returncode
-            self._active_process = None
-
-            stdout = "".join(stdout_lines)
-
+            try:
+                yield process.stdout
+            except DefusedET.ParseError:
+                # A failed run usually leaves empty or truncated XML; report nmap's error
+                if process.wait() == 0:
+                    raise
+            returncode = process.wait()
+            drain.join()
             if returncode != 0:
-                raise RuntimeError(f"nmap failed ({returncode}): {stderr.strip()}")
-            return stdout
-        except ScanCancelledError:
-            # Re-raise cancellation without wrapping
-            raise
-        except (OSError, subprocess.SubprocessError, RuntimeError):
-            self._active_process = None
-            raise
+                message = stderr.decode(errors="replace").strip()
+                raise RuntimeError(f"nmap failed ({returncode}): {message}")
+        finally:
+            if process.poll() is None:
+                with suppress(Exception):
+                    process.kill()
+                    process.wait(timeout=2)
+            drain.join(timeout=2)
+            for pipe in (process.stdout, process.stderr):
+                with suppress(Exception):
+                    pipe.close()
+            with self._process_lock:
+                self._active_processes.discard(process)
 
     def _build_port_spec(self) -> list[str]:
         if self.port_preset == "full":
             return ["-p-"]
         if self.ports:
-            return ["-p", ",".join(str(p) for p in self.ports)]
+            return ["-p", self._compact_ports(self.ports)]
         return []
 
-    def _with_dns_flag(self, args: list[str]) -> list[str]:
-        return args + (["-R"] if self.dns_resolution else ["-n"])
+    @staticmethod
+    def _compact_ports(ports: Iterable[int]) -> str:
+        """Render ports as an nmap list, collapsing consecutive runs (``20-25,80``)."""
+        ordered = sorted(set(ports))
+        parts: list[str] = []
+        run_start = 0
+        for index in range(1, len(ordered) + 1):
+            if index == len(ordered) or ordered[index] != ordered[index - 1] + 1:
+                first, last = ordered[run_start], ordered[index - 1]
+                parts.append(str(first) if first == last else f"{first}-{last}")
+                run_start = index
+        return ",".join(parts)
+
+    def _add_dns_flag(self, args: list[str]) -> None:
+        args.append("-R" if self.dns_resolution else "-n")
+
+    def _add_parallelism(self, args: list[str], value: int) -> None:
+        # Only a floor: nmap's congestion control may still grow past it on a fast link
+        if value > 0:
+            args.extend(("--min-parallelism", str(value)))
+
+    def _add_rate(self, args: list[str], rate: int) -> None:
+        """Ask nmap to send at least ``rate`` probes per second (0 leaves timing alone)."""
+        if rate > 0:
+            args.extend(("--min-rate", str(rate)))
+
+    def _iter_hosts(self, source: IO) -> Iterator[DefusedET.Element]:
+        """Yield each ``<host>`` of an nmap XML report as soon as it is parsed.
+
+        The document root is cleared after every host, so hosts already handed out (and
+        any progress elements between them) do not accumulate in memory. Cancellation
+        is checked once per host while the report streams in.
+
+        The parsers look children up with single-tag ``find``/``findall`` only: those run
+        in C, while ``iterfind`` and multi-step paths (``"a/b"``) go through the
+        pure-Python ElementPath code and cost several times more per call.
+        """
+        events = DefusedET.iterparse(source, events=("start", "end"))
+        _, root = next(events)
+        for event, elem in events:
+            if event == "end" and elem.tag == "host":
+                self._check_cancellation()
+                yield elem
+                root.clear()
 
-    def _with_parallelism(self, args: list[str], value: int) -> list[str]:
-        if value <= 0:
-            return args
-        return [*args, "--min-parallelism", str(value), "--max-parallelism", str(value)]
+    @staticmethod
+    def _target_ranges(targets: list[str]) -> list[tuple[int, int, int, str]]:
+        """``(version, first, last, target)`` address spans, narrowest first.
+
+        Covers single addresses, CIDRs and ``a.b.c.d-e`` ranges; anything else (host
+        names, nmap octet wildcards) is left out and matched by name instead.
+        """
+        spans: list[tuple[int, int, int, int, str]] = []
+        for target in targets:
+            try:
+                if "-" in target and "/" not in target:
+                    start_str, end_str = target.split("-", 1)
+                    start = ipaddress.ip_address(start_str)
+                    if "." in end_str or ":" in end_str:
+                        end = ipaddress.ip_address(end_str)
+                    else:
+                        end = ipaddress.ip_address(start_str.rsplit(".", 1)[0] + "." + end_str)
+                    version, first, last = start.version, int(start), int(end)
+                else:
+                    network = ipaddress.ip_network(target, strict=False)
+                    version = network.version
+                    first = int(network.network_address)
+                    last = int(network.broadcast_address)
+            except ValueError:
+                continue
+            spans.append((last - first, version, first, last, target))
+        spans.sort()
+        return [(version, first, last, target) for _, version, first, last, target in spans]
+
+    @staticmethod
+    def _match_target(
+        ip: str,
+        user_names: list[str],
+        targets: list[str],
+        ranges: list[tuple[int, int, int, str]],
+    ) -> str | None:
+        """Target a swept host belongs to; the most specific range wins on overlap."""
+        if len(targets) == 1:
+            return targets[0]
+        for name in user_names:
+            if name in targets:
+                return name
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return None
+        value = int(address)
+        for version, first, last, target in ranges:
+            if version == address.version and first <= value <= last:
+                return target
+        return None
 
-    def _parse_ping_sweep(self, xml_text: str, cidr: str) -> list[dict]:
+    def _parse_ping_sweep(self, source: IO, targets: list[str]) -> list[dict]:
+        ranges = self._target_ranges(targets)
         hosts: list[dict] = []
-        root = DefusedET.fromstring(xml_text)
-        for host in root.findall("host"):
+        for host in self._iter_hosts(source):
             status = host.find("status")
-            if status is None or status.attrib.get("state") != "up":
+            if status is None or status.get("state") != "up":
                 continue
-            addr = host.find("address")
-            if addr is None:
-                continue
-            ip = addr.attrib.get("addr")
+            ip, mac_address, mac_vendor = self._parse_addresses(host)
             if not ip:
                 continue
 
-            hostname, hostnames = self._parse_hostnames(host)
-            mac_address, mac_vendor = self._parse_mac_address(host)
+            hostname, hostnames, user_names = self._parse_hostnames(host)
+            cidr = self._match_target(ip, user_names, targets, ranges)
 
-            host_data = {"ip": ip, "cidr": cidr, "status": "online"}
+            host_data: dict[str, Any] = {"ip": ip}
+            if cidr:
+                host_data["cidr"] = cidr
+            host_data["status"] = "online"
             if status is not None:
-                status_reason = status.attrib.get("reason")
-                status_ttl = status.attrib.get("reason_ttl")
+                status_reason = status.get("reason")
+                status_ttl = status.get("reason_ttl")
                 if status_reason:
                     host_data["status_reason"] = status_reason
                 if status_ttl:
@@ -240,24 +403,23 @@ class NetworkCollector(BaseCollector):
             hosts.append(host_data)
         return hosts
 
-    def _parse_port_scan(self, xml_text: str) -> list[dict]:
-        results: list[dict] = []
-        root = DefusedET.fromstring(xml_text)
-        for host in root.findall("host"):
-            ip = self._parse_ip_address(host)
+    def _parse_port_scan(self, source: IO) -> list[dict]:
+        return list(self._iter_port_scan(source))
+
+    def _iter_port_scan(self, source: IO) -> Iterator[dict]:
+        for host in self._iter_hosts(source):
+            ip, mac_address, mac_vendor = self._parse_addresses(host)
             if not ip:
                 continue
 
             host_data = {"ip": ip}
 
-            hostname, hostnames = self._parse_hostnames(host)
+            hostname, hostnames, _ = self._parse_hostnames(host)
             if hostname:
                 host_data["hostname"] = hostname
             if hostnames:
                 host_data["hostnames"] = hostnames
 
-            # Extract MAC address and vendor
-            mac_address, mac_vendor = self._parse_mac_address(host)
             if mac_address:
                 host_data["mac_address"] = mac_address
             if mac_vendor:
@@ -268,14 +430,12 @@ class NetworkCollector(BaseCollector):
             ports_element = host.find("ports")
             if ports_element is not None:
                 for port_elem in ports_element.findall("port"):
-                    port_id = int(port_elem.attrib.get("portid", "0"))
-                    protocol = port_elem.attrib.get("protocol")
+                    port_id = int(port_elem.get("portid", "0"))
+                    protocol = port_elem.get("protocol")
                     state_elem = port_elem.find("state")
-                    state = state_elem.attrib.get("state") if state_elem is not None else "unknown"
-                    reason = state_elem.attrib.get("reason") if state_elem is not None else None
-                    reason_ttl = (
-                        state_elem.attrib.get("reason_ttl") if state_elem is not None else None
-                    )
+                    state = state_elem.get("state") if state_elem is not None else "unknown"
+                    reason = state_elem.get("reason") if state_elem is not None else None
+                    reason_ttl = state_elem.get("reason_ttl") if state_elem is not None else None
 
                     # Extract detailed service information
                     service_elem = port_elem.find("service")
@@ -290,15 +450,15 @@ class NetworkCollector(BaseCollector):
                     service_hostname = None
                     service_cpes: list[str] = []
                     if service_elem is not None:
-                        service_name = service_elem.attrib.get("name")
-                        service_product = service_elem.attrib.get("product")
-                        service_version = service_elem.attrib.get("version")
-                        service_extrainfo = service_elem.attrib.get("extrainfo")
-                        service_tunnel = service_elem.attrib.get("tunnel")
-                        service_method = service_elem.attrib.get("method")
-                        service_conf = service_elem.attrib.get("conf")
-                        service_ostype = service_elem.attrib.get("ostype")
-                        service_hostname = service_elem.attrib.get("hostname")
+                        service_name = service_elem.get("name")
+                        service_product = service_elem.get("product")
+                        service_version = service_elem.get("version")
+                        service_extrainfo = service_elem.get("extrainfo")
+                        service_tunnel = service_elem.get("tunnel")
+                        service_method = service_elem.get("method")
+                        service_conf = service_elem.get("conf")
+                        service_ostype = service_elem.get("ostype")
+                        service_hostname = service_elem.get("hostname")
                         for cpe_elem in service_elem.findall("cpe"):
                             if cpe_elem.text:
                                 service_cpes.append(cpe_elem.text)
@@ -351,8 +511,7 @@ class NetworkCollector(BaseCollector):
             self._parse_traceroute(host, host_data)
             self._parse_host_scripts(host, host_data)
 
-            results.append(host_data)
-        return results
+            yield host_data
 
     def _build_event(self, payload: dict) -> CollectorEvent:
         now = datetime.utcnow()
@@ -395,40 +554,48 @@ class NetworkCollector(BaseCollector):
         return ["--script", ",".join(normalized)]
 
     @staticmethod
-    def _parse_ip_address(host: DefusedET.Element) -> str | None:
+    def _parse_addresses(host: DefusedET.Element) -> tuple[str | None, str | None, str | None]:
+        """``(ip, mac, vendor)`` from one pass over the host's ``<address>`` elements.
+
+        The IP prefers IPv4, then IPv6, then whatever the first address is.
+        """
+        ipv4 = ipv6 = first = mac = vendor = None
         for address_elem in host.findall("address"):
-            addr_type = address_elem.attrib.get("addrtype")
-            if addr_type in {"ipv4", "ipv6"}:
-                ip = address_elem.attrib.get("addr")
-                if ip:
-                    return ip
-        addr = host.find("address")
-        if addr is not None:
-            ip = addr.attrib.get("addr")
-            if ip:
-                return ip
-        return None
+            addr = address_elem.get("addr")
+            if not addr:
+                continue
+            addr_type = address_elem.get("addrtype")
+            if addr_type == "ipv4":
+                ipv4 = ipv4 or addr
+            elif addr_type == "ipv6":
+                ipv6 = ipv6 or addr
+            elif addr_type == "mac" and mac is None:
+                mac, vendor = addr, address_elem.get("vendor")
+            first = first or addr
+        return ipv4 or ipv6 or first, mac, vendor
 
     @staticmethod
-    def _parse_hostnames(host: DefusedET.Element) -> tuple[str | None, list[str]]:
+    def _parse_hostnames(host: DefusedET.Element) -> tuple[str | None, list[str], list[str]]:
+        """Primary name, all distinct names, and the names nmap tagged ``type="user"``.
+
+        User names are the ones given on the command line, used to map a host back to a
+        host-name target.
+        """
         hostnames: list[str] = []
+        user_names: list[str] = []
         hostnames_elem = host.find("hostnames")
         if hostnames_elem is None:
-            return None, hostnames
+            return None, hostnames, user_names
         for hostname_elem in hostnames_elem.findall("hostname"):
-            name = hostname_elem.attrib.get("name")
-            if name and name not in hostnames:
+            name = hostname_elem.get("name")
+            if not name:
+                continue
+            if name not in hostnames:
                 hostnames.append(name)
+            if hostname_elem.get("type") == "user":
+                user_names.append(name)
         primary = hostnames[0] if hostnames else None
-        return primary, hostnames
-
-    @staticmethod
-    def _parse_mac_address(host: DefusedET.Element) -> tuple[str | None, str | None]:
-        for address_elem in host.findall("address"):
-            addr_type = address_elem.attrib.get("addrtype")
-            if addr_type == "mac":
-                return address_elem.attrib.get("addr"), address_elem.attrib.get("vendor")
-        return None, None
+        return primary, hostnames, user_names
 
     def _parse_scripts(self, parent: DefusedET.Element) -> list[dict]:
         scripts: list[dict] = []
@@ -439,8 +606,8 @@ class NetworkCollector(BaseCollector):
         return scripts
 
     def _parse_script(self, script_elem: DefusedET.Element) -> dict[str, Any] | None:
-        script_id = script_elem.attrib.get("id")
-        output = script_elem.attrib.get("output")
+        script_id = script_elem.get("id")
+        output = script_elem.get("output")
         data = self._parse_script_data(script_elem)
         if not script_id and not output and data is None:
             return None
@@ -460,7 +627,7 @@ class NetworkCollector(BaseCollector):
         items: list[Any] = []
         for child in script_elem:
             if child.tag == "elem":
-                key = child.attrib.get("key")
+                key = child.get("key")
                 value = (child.text or "").strip()
                 if key:
                     self._merge_script_value(data, key, value)
@@ -468,7 +635,7 @@ class NetworkCollector(BaseCollector):
                     items.append(value)
             elif child.tag == "table":
                 table_value = self._parse_script_table(child)
-                key = child.attrib.get("key")
+                key = child.get("key")
                 if key:
                     self._merge_script_value(data, key, table_value)
                 else:
@@ -487,7 +654,7 @@ class NetworkCollector(BaseCollector):
         items: list[Any] = []
         for child in table_elem:
             if child.tag == "elem":
-                key = child.attrib.get("key")
+                key = child.get("key")
                 value = (child.text or "").strip()
                 if key:
                     self._merge_script_value(data, key, value)
@@ -495,7 +662,7 @@ class NetworkCollector(BaseCollector):
                     items.append(value)
             elif child.tag == "table":
                 nested_value = self._parse_script_table(child)
-                key = child.attrib.get("key")
+                key = child.get("key")
                 if key:
                     self._merge_script_value(data, key, nested_value)
                 else:
@@ -525,26 +692,26 @@ class NetworkCollector(BaseCollector):
         best_name: str | None = None
         for osmatch in os_element.findall("osmatch"):
             match_data: dict[str, Any] = {}
-            match_name = osmatch.attrib.get("name")
+            match_name = osmatch.get("name")
             if match_name:
                 match_data["name"] = match_name
-            accuracy_raw = osmatch.attrib.get("accuracy")
+            accuracy_raw = osmatch.get("accuracy")
             accuracy = None
             if accuracy_raw and accuracy_raw.isdigit():
                 accuracy = int(accuracy_raw)
                 match_data["accuracy"] = accuracy
-            line = osmatch.attrib.get("line")
+            line = osmatch.get("line")
             if line:
                 match_data["line"] = line
 
             classes: list[dict[str, Any]] = []
             for osclass in osmatch.findall("osclass"):
                 class_data: dict[str, Any] = {}
-                os_type = osclass.attrib.get("type")
-                vendor = osclass.attrib.get("vendor")
-                family = osclass.attrib.get("osfamily")
-                os_gen = osclass.attrib.get("osgen")
-                class_accuracy = osclass.attrib.get("accuracy")
+                os_type = osclass.get("type")
+                vendor = osclass.get("vendor")
+                family = osclass.get("osfamily")
+                os_gen = osclass.get("osgen")
+                class_accuracy = osclass.get("accuracy")
                 if os_type:
                     class_data["type"] = os_type
                 if vendor:
@@ -584,16 +751,16 @@ class NetworkCollector(BaseCollector):
         if "os" not in data:
             osclass = os_element.find("osclass")
             if osclass is not None:
-                os_family = osclass.attrib.get("osfamily")
+                os_family = osclass.get("osfamily")
                 if os_family:
                     data["os"] = os_family
-                os_vendor = osclass.attrib.get("vendor")
+                os_vendor = osclass.get("vendor")
                 if os_vendor:
                     data["os_vendor"] = os_vendor
-                os_type = osclass.attrib.get("type")
+                os_type = osclass.get("type")
                 if os_type:
                     data["os_type"] = os_type
-                os_gen = osclass.attrib.get("osgen")
+                os_gen = osclass.get("osgen")
                 if os_gen:
                     data["os_gen"] = os_gen
 
@@ -604,10 +771,10 @@ class NetworkCollector(BaseCollector):
         uptime_elem = host.find("uptime")
         if uptime_elem is None:
             return
-        seconds = uptime_elem.attrib.get("seconds")
+        seconds = uptime_elem.get("seconds")
         if seconds and seconds.isdigit():
             host_data["uptime_seconds"] = int(seconds)
-        lastboot = uptime_elem.attrib.get("lastboot")
+        lastboot = uptime_elem.get("lastboot")
         if lastboot:
             host_data["uptime_last_boot"] = lastboot
 
@@ -616,7 +783,7 @@ class NetworkCollector(BaseCollector):
         distance_elem = host.find("distance")
         if distance_elem is None:
             return
-        value = distance_elem.attrib.get("value")
+        value = distance_elem.get("value")
         if value and value.isdigit():
             host_data["distance"] = int(value)
 
@@ -625,9 +792,9 @@ class NetworkCollector(BaseCollector):
         times_elem = host.find("times")
         if times_elem is None:
             return
-        srtt = times_elem.attrib.get("srtt")
-        rttvar = times_elem.attrib.get("rttvar")
-        timeout = times_elem.attrib.get("to")
+        srtt = times_elem.get("srtt")
+        rttvar = times_elem.get("rttvar")
+        timeout = times_elem.get("to")
         if srtt and srtt.isdigit():
             host_data["rtt_srtt_us"] = int(srtt)
         if rttvar and rttvar.isdigit():
@@ -643,10 +810,10 @@ class NetworkCollector(BaseCollector):
         hops: list[dict[str, Any]] = []
         for hop in trace_elem.findall("hop"):
             hop_data: dict[str, Any] = {}
-            ttl = hop.attrib.get("ttl")
-            rtt = hop.attrib.get("rtt")
-            ipaddr = hop.attrib.get("ipaddr")
-            hostname = hop.attrib.get("host")
+            ttl = hop.get("ttl")
+            rtt = hop.get("rtt")
+            ipaddr = hop.get("ipaddr")
+            hostname = hop.get("host")
             if ttl and ttl.isdigit():
                 hop_data["ttl"] = int(ttl)
             if rtt:
@@ -663,8 +830,8 @@ class NetworkCollector(BaseCollector):
         if not hops:
             return
         trace_data: dict[str, Any] = {"hops": hops}
-        proto = trace_elem.attrib.get("proto")
-        port = trace_elem.attrib.get("port")
+        proto = trace_elem.get("proto")
+        port = trace_elem.get("port")
         if proto:
             trace_data["proto"] = proto
         if port and port.isdigit():
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from contextlib import suppress
 from datetime import datetime
 from uuid import UUID
 
-from neo4j import GraphDatabase, Session
+from neo4j import READ_ACCESS, GraphDatabase, Session
 from pydantic import ValidationError
 
 from eidolon.config.settings import get_settings
@@ -265,6 +265,15 @@ class Neo4jGraphRepository(GraphRepository):
             result = session.execute_read(lambda tx: tx.run(cypher, parameters or {}).data())
         return result
 
+    def iter_cypher(self, cypher: str, parameters: dict | None = None) -> Iterator[dict]:
+        # Auto-commit read: records are pulled from the server in fetch-size batches
+        # rather than buffered whole, at the cost of execute_read's retries.
+        with self._driver.session(
+            database=self._database, default_access_mode=READ_ACCESS
+        ) as session:
+            for record in session.run(cypher, parameters or {}):
+                yield record.data()
+
     def find_asset_by_identifier(self, identifier: str) -> Asset | None:
         cypher = """
         MATCH (n:Asset)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from uuid import UUID
 
 from eidolon.core.models.asset import Asset, Identity, NetworkContainer, Policy
@@ -57,6 +57,10 @@ class GraphRepository(ABC):
     def run_cypher(self, cypher: str, parameters: dict | None = None) -> Iterable[dict]:
         """Execute arbitrary Cypher for advanced queries (used sparingly)."""
 
+    def iter_cypher(self, cypher: str, parameters: dict | None = None) -> Iterator[dict]:
+        """Like :meth:`run_cypher`, but yields records as they arrive where supported."""
+        yield from self.run_cypher(cypher, parameters)
+
     @abstractmethod
     def find_asset_by_identifier(self, identifier: str) -> Asset | None:
         """Return an Asset node that matches the identifier (IP, hostname, MAC)."""
@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Any, Literal
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ChatMessage(BaseModel):
@@ -15,6 +15,14 @@ class ChatMessage(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ChatSessionSummary(BaseModel):
+    session_id: UUID
+    title: str | None
+    created_at: datetime
+    updated_at: datetime
+    message_count: int
+
+
 class ChatSession(BaseModel):
     session_id: UUID = Field(default_factory=uuid4)
     user_id: str = Field(default="anonymous")
@@ -22,3 +30,55 @@ class ChatSession(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     messages: list[ChatMessage] = Field(default_factory=list)
+
+    # Derived from ``messages`` so per-turn lookups don't rescan the history.
+    _last_request_id: str | None = PrivateAttr(default=None)
+    _pending_tool_calls: list[Any] | None = PrivateAttr(default=None)
+    _has_pending_request: bool = PrivateAttr(default=False)
+
+    def model_post_init(self, context: Any) -> None:
+        self.reindex_messages()
+
+    @property
+    def last_request_id(self) -> str | None:
+        """Most recent ``request_id`` found in message metadata."""
+        return self._last_request_id
+
+    @property
+    def pending_tool_calls(self) -> list[Any] | None:
+        """Tool calls of the last message when it is an assistant turn awaiting tool output."""
+        return self._pending_tool_calls
+
+    @property
+    def has_pending_request(self) -> bool:
+        """Whether the last message still awaits an assistant reply or tool output."""
+        return self._has_pending_request
+
+    def add_message(self, message: ChatMessage) -> None:
+        self.messages.append(message)
+        self._track(message)
+
+    def reindex_messages(self) -> None:
+        """Recompute the cached lookups after ``messages`` was replaced."""
+        self._last_request_id = None
+        self._pending_tool_calls = None
+        self._has_pending_request = False
+        for message in self.messages:
+            self._track(message)
+
+    def _track(self, message: ChatMessage) -> None:
+        request_id = message.metadata.get("request_id")
+        if isinstance(request_id, str) and request_id:
+            self._last_request_id = request_id
+        tool_calls = None
+        if message.role == "assistant" and "tool_calls" in message.metadata:
+            tool_calls = message.metadata["tool_calls"]
+            if not isinstance(tool_calls, list):
+                tool_calls = []
+        self._pending_tool_calls = tool_calls
+        if message.role != "assistant":
+            self._has_pending_request = True
+        else:
+            self._has_pending_request = (
+                tool_calls is not None and message.metadata.get("cancelled") is not True
+            )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import cached_property
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
@@ -40,6 +41,10 @@ class PlanStep(BaseModel):
         default_factory=dict,
         description="Execution payload or tool parameters for this step",
     )
+    depends_on: list[str] | None = Field(
+        default=None,
+        description="Earlier step_ids that must finish first; unset means the preceding step",
+    )
 
 
 class BlastRadius(BaseModel):
@@ -61,6 +66,15 @@ class ExecutionRequest(BaseModel):
         default=None, description="Token proving approval for execution"
     )
 
+    @cached_property
+    def any_step_requires_approval(self) -> bool:
+        """Whether some step asks for approval; computed once, not serialized."""
+        return any(step.requires_approval for step in self.steps)
+
+    @property
+    def needs_approval(self) -> bool:
+        return self.requires_approval or self.any_step_requires_approval
+
 
 class PlanDraft(BaseModel):
     """LLM-friendly wrapper for plan steps."""
@@ -8,6 +8,7 @@ from pydantic import BaseModel, ConfigDict, Field
 class ScannerOptions(BaseModel):
     ping_concurrency: int = Field(default=128, ge=32, le=512)
     port_scan_workers: int = Field(default=32, ge=8, le=64)
+    min_rate: int = Field(default=0, ge=0, le=100_000)
     dns_resolution: bool = True
     aggressive: bool = False
 
@@ -2,6 +2,18 @@
 
 from collections.abc import Callable
 
+# Optional tokenizers are imported once here; a failed import inside a method is not
+# cached by Python and would rescan sys.path on every token count.
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+try:
+    import litellm
+except ImportError:  # pragma: no cover - optional dependency
+    litellm = None
+
 SUMMARY_PROMPT = """Summarize the following conversation segment for an infrastructure assistant.
 The summary will be used to continue the task, so preserve operational details and decisions.
 
@@ -44,20 +56,13 @@ class ConversationMemory:
     @property
     def encoder(self):
         """Lazy load the tokenizer."""
-        if self._encoder is None:
-            try:
-                import tiktoken
-
-                self._encoder = tiktoken.get_encoding("cl100k_base")
-            except ImportError:
-                self._encoder = None
+        if self._encoder is None and tiktoken is not None:
+            self._encoder = tiktoken.get_encoding("cl100k_base")
         return self._encoder
 
     def _count_tokens_with_litellm(self, text: str, model: str) -> int | None:
         """Try to count tokens using litellm for better accuracy."""
-        try:
-            import litellm
-        except ImportError:
+        if litellm is None:
             return None
 
         try:
@@ -27,8 +27,9 @@ class Planner:
     def __init__(self, llm_client: LiteLLMClient | None = None) -> None:
         self.llm_client = llm_client
 
-    def generate_plan(self, intent: str, target: EntityRef) -> list[PlanStep]:
-        fallback = [
+    @staticmethod
+    def fallback_plan(intent: str, target: EntityRef) -> list[PlanStep]:
+        return [
             PlanStep(
                 action_type="analyze",
                 target=target,
@@ -39,17 +40,19 @@ class Planner:
             )
         ]
 
+    def draft_plan(self, intent: str, target: EntityRef) -> list[PlanStep] | None:
+        """Ask the LLM for a plan; ``None`` when it is unavailable, fails or returns no steps."""
         if not self.llm_client or not self.llm_client.is_available():
-            return fallback
+            return None
 
         prompt = PLAN_PROMPT_TEMPLATE.format(intent=intent, target=target.model_dump())
         try:
             draft = self.llm_client.generate_structured(prompt, LLMPlanDraft)
         except Exception:  # noqa: BLE001
-            return fallback
+            return None
 
         if not draft.steps:
-            return fallback
+            return None
 
         steps: list[PlanStep] = []
         for draft_step in draft.steps:
@@ -66,3 +69,6 @@ class Planner:
                 )
             )
         return steps
+
+    def generate_plan(self, intent: str, target: EntityRef) -> list[PlanStep]:
+        return self.draft_plan(intent, target) or self.fallback_plan(intent, target)
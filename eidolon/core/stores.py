@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from uuid import UUID
 
 from eidolon.config.settings import SandboxPermissions
 from eidolon.core.models.approval import ApprovalRecord
-from eidolon.core.models.chat import ChatMessage, ChatSession
+from eidolon.core.models.chat import ChatMessage, ChatSession, ChatSessionSummary
 from eidolon.core.models.event import AuditEvent
 from eidolon.core.models.scanner import (
     ScannerConfig,
@@ -109,6 +110,11 @@ class AuditStore(ABC):
     def add(self, event: AuditEvent) -> None:
         """Persist an audit event."""
 
+    def add_many(self, events: Sequence[AuditEvent]) -> None:
+        """Persist several audit events; stores override this to write them in one go."""
+        for event in events:
+            self.add(event)
+
     @abstractmethod
     def get(self, audit_id: UUID) -> AuditEvent | None:
         """Fetch a single audit event."""
@@ -128,6 +134,22 @@ class AuditStore(ABC):
     ) -> list[AuditEvent]:
         """Return filtered and paginated audit events."""
 
+    def iter_filtered(
+        self,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        chunk_size: int = 50,
+    ) -> Iterator[AuditEvent]:
+        """Yield filtered events newest first, fetching ``chunk_size`` at a time."""
+        page = 1
+        while True:
+            events = self.list_filtered(page, chunk_size, event_type, start_date, end_date)
+            yield from events
+            if len(events) < chunk_size:
+                return
+            page += 1
+
     @abstractmethod
     def count_filtered(
         self,
@@ -137,10 +159,26 @@ class AuditStore(ABC):
     ) -> int:
         """Count events matching filters."""
 
+    def list_filtered_with_count(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> tuple[list[AuditEvent], int]:
+        """Return one page of filtered events together with the total match count."""
+        events = self.list_filtered(page, page_size, event_type, start_date, end_date)
+        return events, self.count_filtered(event_type, start_date, end_date)
+
     @abstractmethod
     def delete_older_than(self, cutoff_date: datetime) -> int:
         """Delete events older than cutoff date. Returns count deleted."""
 
+    @abstractmethod
+    def truncate(self) -> int:
+        """Delete every event. Returns count deleted."""
+
 
 class InMemoryAuditStore(AuditStore):
     def __init__(self) -> None:
@@ -149,6 +187,9 @@ class InMemoryAuditStore(AuditStore):
     def add(self, event: AuditEvent) -> None:
         self._events.append(event)
 
+    def add_many(self, events: Sequence[AuditEvent]) -> None:
+        self._events.extend(events)
+
     def get(self, audit_id: UUID) -> AuditEvent | None:
         for ev in self._events:
             if ev.audit_id == audit_id:
@@ -158,6 +199,20 @@ class InMemoryAuditStore(AuditStore):
     def list_all(self, limit: int = 100) -> list[AuditEvent]:
         return list(self._events)[-limit:]
 
+    def _filter(
+        self,
+        event_type: str | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> list[AuditEvent]:
+        return [
+            e
+            for e in self._events
+            if (not event_type or e.event_type == event_type)
+            and (not start_date or e.timestamp >= start_date)
+            and (not end_date or e.timestamp <= end_date)
+        ]
+
     def list_filtered(
         self,
         page: int = 1,
@@ -166,21 +221,7 @@ class InMemoryAuditStore(AuditStore):
         start_date: datetime | None = None,
         end_date: datetime | None = None,
     ) -> list[AuditEvent]:
-        filtered = self._events
-
-        if event_type:
-            filtered = [e for e in filtered if e.event_type == event_type]
-        if start_date:
-            filtered = [e for e in filtered if e.timestamp >= start_date]
-        if end_date:
-            filtered = [e for e in filtered if e.timestamp <= end_date]
-
-        # Sort by timestamp desc
-        filtered = sorted(filtered, key=lambda e: e.timestamp, reverse=True)
-
-        # Paginate
-        offset = (page - 1) * page_size
-        return filtered[offset : offset + page_size]
+        return self.list_filtered_with_count(page, page_size, event_type, start_date, end_date)[0]
 
     def count_filtered(
         self,
@@ -188,22 +229,45 @@ class InMemoryAuditStore(AuditStore):
         start_date: datetime | None = None,
         end_date: datetime | None = None,
     ) -> int:
-        filtered = self._events
+        return len(self._filter(event_type, start_date, end_date))
 
-        if event_type:
-            filtered = [e for e in filtered if e.event_type == event_type]
-        if start_date:
-            filtered = [e for e in filtered if e.timestamp >= start_date]
-        if end_date:
-            filtered = [e for e in filtered if e.timestamp <= end_date]
+    def iter_filtered(
+        self,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        chunk_size: int = 50,
+    ) -> Iterator[AuditEvent]:
+        filtered = self._filter(event_type, start_date, end_date)
+        filtered.sort(key=lambda e: e.timestamp, reverse=True)
+        yield from filtered
 
-        return len(filtered)
+    def list_filtered_with_count(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> tuple[list[AuditEvent], int]:
+        filtered = self._filter(event_type, start_date, end_date)
+        # Sort by timestamp desc
+        filtered.sort(key=lambda e: e.timestamp, reverse=True)
+
+        # Paginate
+        offset = (page - 1) * page_size
+        return filtered[offset : offset + page_size], len(filtered)
 
     def delete_older_than(self, cutoff_date: datetime) -> int:
         original_count = len(self._events)
         self._events = [e for e in self._events if e.timestamp >= cutoff_date]
         return original_count - len(self._events)
 
+    def truncate(self) -> int:
+        deleted = len(self._events)
+        self._events.clear()
+        return deleted
+
 
 class ApprovalStore(ABC):
     """Abstract persistence for approval tokens."""
@@ -244,6 +308,27 @@ class ChatStore(ABC):
     def list_sessions(self, limit: int = 50, user_id: str | None = None) -> list[ChatSession]:
         """Return recent chat sessions."""
 
+    def list_session_summaries(
+        self, limit: int = 50, user_id: str | None = None
+    ) -> list[ChatSessionSummary]:
+        """Return recent chat sessions with message counts instead of messages."""
+        return [
+            ChatSessionSummary(
+                session_id=session.session_id,
+                title=session.title,
+                created_at=session.created_at,
+                updated_at=session.updated_at,
+                message_count=len(session.messages),
+            )
+            for session in self.list_sessions(limit=limit, user_id=user_id)
+        ]
+
+    def iter_session_summaries(
+        self, limit: int = 50, user_id: str | None = None
+    ) -> Iterator[ChatSessionSummary]:
+        """Yield the same summaries as :meth:`list_session_summaries` without a full list."""
+        yield from self.list_session_summaries(limit=limit, user_id=user_id)
+
     @abstractmethod
     def get_session(self, session_id: UUID, user_id: str | None = None) -> ChatSession | None:
         """Fetch a single chat session."""
@@ -258,6 +343,37 @@ class ChatStore(ABC):
     ) -> ChatSession | None:
         """Append a message to an existing session."""
 
+    def append_messages(
+        self, session_id: UUID, messages: Sequence[ChatMessage], user_id: str | None = None
+    ) -> ChatSession | None:
+        """Append several messages to an existing session in one write."""
+        if not messages:
+            return self.get_session(session_id, user_id=user_id)
+        session = None
+        for message in messages:
+            session = self.append_message(session_id, message, user_id=user_id)
+            if session is None:
+                return None
+        return session
+
+    def delete_sessions(self, session_ids: Sequence[UUID], user_id: str | None = None) -> int:
+        """Delete several chat sessions. Returns count deleted."""
+        return sum(
+            1 for session_id in session_ids if self.delete_session(session_id, user_id=user_id)
+        )
+
+    def delete_all_sessions(self, user_id: str | None = None) -> int:
+        """Delete every chat session, or every one owned by ``user_id``. Returns count deleted."""
+        deleted = 0
+        while True:
+            sessions = self.list_sessions(limit=200, user_id=user_id)
+            removed = self.delete_sessions(
+                [session.session_id for session in sessions], user_id=user_id
+            )
+            if not removed:
+                return deleted
+            deleted += removed
+
     @abstractmethod
     def cleanup_request_messages(
         self, session_id: UUID, request_id: str, user_id: str | None = None
@@ -295,6 +411,16 @@ class InMemoryChatStore(ChatStore):
         del self._sessions[session_id]
         return True
 
+    def delete_all_sessions(self, user_id: str | None = None) -> int:
+        doomed = [
+            session_id
+            for session_id, session in self._sessions.items()
+            if not user_id or session.user_id == user_id
+        ]
+        for session_id in doomed:
+            del self._sessions[session_id]
+        return len(doomed)
+
     def append_message(
         self, session_id: UUID, message: ChatMessage, user_id: str | None = None
     ) -> ChatSession | None:
@@ -303,7 +429,7 @@ class InMemoryChatStore(ChatStore):
             return None
         if user_id and session.user_id != user_id:
             return None
-        session.messages.append(message)
+        session.add_message(message)
         session.updated_at = datetime.utcnow()
         return session
 
@@ -318,5 +444,6 @@ class InMemoryChatStore(ChatStore):
         session.messages = [
             msg for msg in session.messages if msg.metadata.get("request_id") != request_id
         ]
+        session.reindex_messages()
         session.updated_at = datetime.utcnow()
         return session
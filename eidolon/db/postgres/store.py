@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from eidolon.config.settings import SandboxPermissions
+import orjson
+
+from eidolon.config.settings import PostgresSettings, SandboxPermissions
 from eidolon.core.models.approval import ApprovalRecord
-from eidolon.core.models.chat import ChatMessage, ChatSession
+from eidolon.core.models.chat import ChatMessage, ChatSession, ChatSessionSummary
 from eidolon.core.models.event import AuditEvent
 from eidolon.core.models.scanner import (
     ScannerConfig,
@@ -22,44 +25,111 @@ try:
     import psycopg
     from psycopg import sql
     from psycopg.rows import dict_row
+    from psycopg.types.json import set_json_loads
 except ImportError:  # pragma: no cover - optional dependency
     psycopg = None
     sql = None
     dict_row = None
+    set_json_loads = None
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    ConnectionPool = None
 
 if psycopg is None:
     POSTGRES_ERRORS: tuple[type[Exception], ...] = (RuntimeError, TypeError, ValueError)
 else:
     POSTGRES_ERRORS = (psycopg.Error, RuntimeError, TypeError, ValueError)
 
+# Session summaries read per connection checkout while a listing is streamed
+_SUMMARY_PAGE_SIZE = 200
+
 
 def _ensure_uuid(value) -> UUID:
     """Convert database UUID value to UUID object if needed."""
     return value if isinstance(value, UUID) else UUID(value)
 
 
+_METADATA_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+
+
+def _dump_metadata(metadata: dict) -> str:
+    # Chat metadata is written on the streaming path. Datetimes and dataclasses are
+    # passed through to str() so rows match what json.dumps(default=str) wrote;
+    # integers wider than 64 bits, which orjson rejects, take the json path.
+    try:
+        return orjson.dumps(metadata, default=str, option=_METADATA_OPTIONS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(metadata, default=str)
+
+
+def _dump_details(details: dict) -> str:
+    try:
+        return orjson.dumps(details, option=orjson.OPT_NON_STR_KEYS).decode()
+    except orjson.JSONEncodeError:
+        return json.dumps(details)
+
+
+def _configure_connection(conn: psycopg.Connection) -> None:
+    # Decode json/jsonb columns (chat metadata, audit details, settings) with orjson
+    set_json_loads(orjson.loads, conn)
+
+
 def postgres_available() -> bool:
-    return psycopg is not None
+    return psycopg is not None and ConnectionPool is not None
+
+
+def create_pool(settings: PostgresSettings) -> ConnectionPool:
+    """Build the process-wide connection pool shared by every Postgres store.
+
+    The pool is created closed; owners open it with :func:`open_pool` and close it on exit.
+    """
+    return ConnectionPool(
+        settings.url,
+        min_size=settings.pool_min_size,
+        max_size=settings.pool_max_size,
+        timeout=settings.pool_timeout,
+        max_lifetime=settings.pool_max_lifetime,
+        kwargs={"row_factory": dict_row},
+        configure=_configure_connection,
+        name="eidolon",
+        open=False,
+    )
+
+
+def open_pool(pool: ConnectionPool, connect_timeout: int = 3) -> bool:
+    """Open ``pool`` if Postgres is reachable and report whether it was opened.
+
+    An unreachable server leaves the pool closed. Borrowing from a closed pool raises
+    PoolClosed (a psycopg.Error) immediately, so stores fall back to their in-memory
+    implementations instead of waiting out the pool timeout on every call.
+    """
+    try:
+        psycopg.connect(pool.conninfo, connect_timeout=connect_timeout).close()
+    except psycopg.Error:
+        return False
+    pool.open(wait=False)
+    return True
 
 
 class PostgresStoreBase:
-    def __init__(self, dsn: str) -> None:
-        self._dsn = dsn
+    def __init__(self, pool: ConnectionPool) -> None:
+        self._pool = pool
 
     @contextmanager
     def _connect(self) -> Iterator[psycopg.Connection]:
         if psycopg is None:
             raise RuntimeError("psycopg is not installed")
-        conn = psycopg.connect(self._dsn, row_factory=dict_row)
-        try:
+        with self._pool.connection() as conn:
             yield conn
-        finally:
-            conn.close()
 
 
 class PostgresAuditStore(PostgresStoreBase, AuditStore):
-    def __init__(self, dsn: str, fallback: AuditStore | None = None) -> None:
-        super().__init__(dsn)
+    def __init__(self, pool: ConnectionPool, fallback: AuditStore | None = None) -> None:
+        super().__init__(pool)
         self._fallback = fallback
 
     def add(self, event: AuditEvent) -> None:
@@ -74,7 +144,7 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                         (
                             str(event.audit_id),
                             event.event_type,
-                            json.dumps(event.details),
+                            _dump_details(event.details),
                             event.status,
                             event.timestamp,
                         ),
@@ -85,6 +155,34 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                 return self._fallback.add(event)
             raise
 
+    def add_many(self, events: Sequence[AuditEvent]) -> None:
+        if not events:
+            return None
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.executemany(
+                        """
+                        INSERT INTO audit_events (id, event_type, details, status, created_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        [
+                            (
+                                str(event.audit_id),
+                                event.event_type,
+                                _dump_details(event.details),
+                                event.status,
+                                event.timestamp,
+                            )
+                            for event in events
+                        ],
+                    )
+                conn.commit()
+        except POSTGRES_ERRORS:
+            if self._fallback:
+                return self._fallback.add_many(events)
+            raise
+
     def get(self, audit_id: UUID) -> AuditEvent | None:
         try:
             with self._connect() as conn:
@@ -143,6 +241,41 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                 return self._fallback.list_all(limit=limit)
             raise
 
+    @staticmethod
+    def _filter_clause(
+        event_type: str | None,
+        start_date: datetime | None,
+        end_date: datetime | None,
+    ) -> tuple[sql.Composable, list]:
+        if sql is None:
+            raise RuntimeError("psycopg is not installed")
+        conditions: list[sql.Composable] = []
+        params: list = []
+
+        if event_type:
+            conditions.append(sql.SQL("event_type = %s"))
+            params.append(event_type)
+        if start_date:
+            conditions.append(sql.SQL("created_at >= %s"))
+            params.append(start_date)
+        if end_date:
+            conditions.append(sql.SQL("created_at <= %s"))
+            params.append(end_date)
+
+        where_clause = sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("TRUE")
+        return where_clause, params
+
+    @staticmethod
+    def _row_to_event(row) -> AuditEvent:
+        payload = {
+            "audit_id": _ensure_uuid(row["id"]),
+            "event_type": row["event_type"],
+            "details": row["details"],
+            "status": row["status"],
+            "timestamp": row["created_at"],
+        }
+        return AuditEvent.model_validate(payload)
+
     def list_filtered(
         self,
         page: int = 1,
@@ -152,23 +285,7 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
         end_date: datetime | None = None,
     ) -> list[AuditEvent]:
         try:
-            if sql is None:
-                raise RuntimeError("psycopg is not installed")
-            # Build dynamic WHERE clause
-            conditions: list[sql.Composable] = []
-            params: list = []
-
-            if event_type:
-                conditions.append(sql.SQL("event_type = %s"))
-                params.append(event_type)
-            if start_date:
-                conditions.append(sql.SQL("created_at >= %s"))
-                params.append(start_date)
-            if end_date:
-                conditions.append(sql.SQL("created_at <= %s"))
-                params.append(end_date)
-
-            where_clause = sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("TRUE")
+            where_clause, params = self._filter_clause(event_type, start_date, end_date)
             offset = (page - 1) * page_size
             params.extend([page_size, offset])
 
@@ -184,17 +301,7 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                     cur.execute(query, tuple(params))
                     rows = cur.fetchall()
 
-            events: list[AuditEvent] = []
-            for row in rows:
-                payload = {
-                    "audit_id": _ensure_uuid(row["id"]),
-                    "event_type": row["event_type"],
-                    "details": row["details"],
-                    "status": row["status"],
-                    "timestamp": row["created_at"],
-                }
-                events.append(AuditEvent.model_validate(payload))
-            return events
+            return [self._row_to_event(row) for row in rows]
         except POSTGRES_ERRORS:
             if self._fallback:
                 return self._fallback.list_filtered(
@@ -202,6 +309,82 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                 )
             raise
 
+    def iter_filtered(
+        self,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        chunk_size: int = 50,
+    ) -> Iterator[AuditEvent]:
+        where_clause, params = self._filter_clause(event_type, start_date, end_date)
+        yielded = False
+        try:
+            with self._connect() as conn:
+                # Server-side cursor: rows arrive chunk_size at a time as the caller consumes
+                with conn.cursor(name="audit_events_filtered") as cur:
+                    cur.itersize = chunk_size
+                    query = sql.SQL("""
+                        SELECT id, event_type, details, status, created_at
+                        FROM audit_events
+                        WHERE {where_clause}
+                        ORDER BY created_at DESC
+                        """).format(where_clause=where_clause)
+                    cur.execute(query, tuple(params))
+                    for row in cur:
+                        yielded = True
+                        yield self._row_to_event(row)
+        except POSTGRES_ERRORS:
+            if yielded or not self._fallback:
+                raise
+            yield from self._fallback.iter_filtered(event_type, start_date, end_date, chunk_size)
+
+    def list_filtered_with_count(
+        self,
+        page: int = 1,
+        page_size: int = 50,
+        event_type: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> tuple[list[AuditEvent], int]:
+        try:
+            where_clause, params = self._filter_clause(event_type, start_date, end_date)
+            offset = (page - 1) * page_size
+
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    # COUNT(*) OVER () is evaluated before LIMIT, so one scan yields both
+                    # the page and the total number of matches.
+                    query = sql.SQL("""
+                        SELECT id, event_type, details, status, created_at,
+                               COUNT(*) OVER () AS total
+                        FROM audit_events
+                        WHERE {where_clause}
+                        ORDER BY created_at DESC
+                        LIMIT %s OFFSET %s
+                        """).format(where_clause=where_clause)
+                    cur.execute(query, (*params, page_size, offset))
+                    rows = cur.fetchall()
+                    if rows:
+                        total = int(rows[0]["total"])
+                    elif offset:
+                        # Past the last page there is no row to carry the window count.
+                        count_query = sql.SQL(
+                            "SELECT COUNT(*) AS total FROM audit_events WHERE {where_clause}"
+                        ).format(where_clause=where_clause)
+                        cur.execute(count_query, tuple(params))
+                        result = cur.fetchone()
+                        total = int(result["total"]) if result else 0
+                    else:
+                        total = 0
+
+            return [self._row_to_event(row) for row in rows], total
+        except POSTGRES_ERRORS:
+            if self._fallback:
+                return self._fallback.list_filtered_with_count(
+                    page, page_size, event_type, start_date, end_date
+                )
+            raise
+
     def count_filtered(
         self,
         event_type: str | None = None,
@@ -209,22 +392,7 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
         end_date: datetime | None = None,
     ) -> int:
         try:
-            if sql is None:
-                raise RuntimeError("psycopg is not installed")
-            conditions: list[sql.Composable] = []
-            params: list = []
-
-            if event_type:
-                conditions.append(sql.SQL("event_type = %s"))
-                params.append(event_type)
-            if start_date:
-                conditions.append(sql.SQL("created_at >= %s"))
-                params.append(start_date)
-            if end_date:
-                conditions.append(sql.SQL("created_at <= %s"))
-                params.append(end_date)
-
-            where_clause = sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("TRUE")
+            where_clause, params = self._filter_clause(event_type, start_date, end_date)
 
             with self._connect() as conn:
                 with conn.cursor() as cur:
@@ -255,10 +423,27 @@ class PostgresAuditStore(PostgresStoreBase, AuditStore):
                 return self._fallback.delete_older_than(cutoff_date)
             raise
 
+    def truncate(self) -> int:
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    # TRUNCATE skips the per-row delete and WAL work of DELETE; the lock
+                    # keeps the reported count consistent with what was removed.
+                    cur.execute("LOCK TABLE audit_events IN ACCESS EXCLUSIVE MODE")
+                    cur.execute("SELECT COUNT(*) AS total FROM audit_events")
+                    row = cur.fetchone()
+                    cur.execute("TRUNCATE audit_events")
+                conn.commit()
+            return int(row["total"]) if row else 0
+        except POSTGRES_ERRORS:
+            if self._fallback:
+                return self._fallback.truncate()
+            raise
+
 
 class PostgresApprovalStore(PostgresStoreBase, ApprovalStore):
-    def __init__(self, dsn: str, fallback: ApprovalStore | None = None) -> None:
-        super().__init__(dsn)
+    def __init__(self, pool: ConnectionPool, fallback: ApprovalStore | None = None) -> None:
+        super().__init__(pool)
         self._fallback = fallback
 
     def create(self, user_id: str, action: str, ttl_seconds: int) -> ApprovalRecord:
@@ -322,9 +507,18 @@ class PostgresApprovalStore(PostgresStoreBase, ApprovalStore):
 
 
 class PostgresChatStore(PostgresStoreBase, ChatStore):
-    def __init__(self, dsn: str, fallback: ChatStore | None = None) -> None:
-        super().__init__(dsn)
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        fallback: ChatStore | None = None,
+        synchronous_commit: bool = True,
+    ) -> None:
+        super().__init__(pool)
         self._fallback = fallback
+        # Chat appends sit on the streaming path. Operators can turn synchronous commit off:
+        # a crash can then lose the last few hundred milliseconds of messages but never
+        # corrupts data.
+        self._synchronous_commit = synchronous_commit
         self._supports_metadata: bool | None = None
 
     def _metadata_supported(self, conn) -> bool:
@@ -392,20 +586,7 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
                             (limit,),
                         )
                     rows = cur.fetchall()
-            sessions: list[ChatSession] = []
-            for row in rows:
-                session_id = _ensure_uuid(row["id"])
-                messages = self._get_messages(session_id)
-                sessions.append(
-                    ChatSession(
-                        session_id=session_id,
-                        user_id=row["user_id"],
-                        title=row["title"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                        messages=messages,
-                    )
-                )
+                sessions = [self._session_from_row(conn, row) for row in rows]
             if not sessions and self._fallback:
                 fallback_sessions = self._fallback.list_sessions(limit=limit, user_id=user_id)
                 if fallback_sessions:
@@ -416,42 +597,83 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
                 return self._fallback.list_sessions(limit=limit, user_id=user_id)
             raise
 
+    def list_session_summaries(
+        self, limit: int = 50, user_id: str | None = None
+    ) -> list[ChatSessionSummary]:
+        return list(self.iter_session_summaries(limit=limit, user_id=user_id))
+
+    def iter_session_summaries(
+        self, limit: int = 50, user_id: str | None = None
+    ) -> Iterator[ChatSessionSummary]:
+        # Counted in the database from the session_id index; no message rows are fetched.
+        # Rows come in keyset pages, each read on its own short connection checkout, so a
+        # slow client streaming the result never holds a pool connection while it reads.
+        yielded = False
+        after: tuple[Any, Any] | None = None
+        remaining = limit
+        while remaining > 0:
+            page_size = min(remaining, _SUMMARY_PAGE_SIZE)
+            try:
+                rows = self._session_summary_page(user_id, after, page_size)
+            except POSTGRES_ERRORS:
+                # Once rows have gone out the response can't switch sources
+                if yielded or not self._fallback:
+                    raise
+                break
+            for row in rows:
+                yielded = True
+                yield ChatSessionSummary(
+                    session_id=_ensure_uuid(row["id"]),
+                    title=row["title"],
+                    created_at=row["created_at"],
+                    updated_at=row["updated_at"],
+                    message_count=row["message_count"],
+                )
+            if len(rows) < page_size:
+                break
+            remaining -= len(rows)
+            after = (rows[-1]["updated_at"], rows[-1]["id"])
+        if not yielded and self._fallback:
+            yield from self._fallback.iter_session_summaries(limit=limit, user_id=user_id)
+
+    def _session_summary_page(
+        self, user_id: str | None, after: tuple[Any, Any] | None, page_size: int
+    ) -> list[dict[str, Any]]:
+        conditions: list[sql.Composable] = []
+        params: list[Any] = []
+        if user_id:
+            conditions.append(sql.SQL("s.user_id = %s"))
+            params.append(user_id)
+        if after is not None:
+            conditions.append(sql.SQL("(s.updated_at, s.id) < (%s, %s)"))
+            params.extend(after)
+        where = sql.SQL("WHERE ") + sql.SQL(" AND ").join(conditions) if conditions else sql.SQL("")
+        params.append(page_size)
+        with self._connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    sql.SQL(
+                        """
+                        SELECT s.id, s.title, s.created_at, s.updated_at,
+                               (SELECT count(*) FROM chat_messages m
+                                WHERE m.session_id = s.id) AS message_count
+                        FROM chat_sessions s
+                        {}
+                        ORDER BY s.updated_at DESC, s.id DESC
+                        LIMIT %s
+                        """
+                    ).format(where),
+                    params,
+                )
+                return cur.fetchall()
+
     def get_session(self, session_id: UUID, user_id: str | None = None) -> ChatSession | None:
         try:
             with self._connect() as conn:
-                with conn.cursor() as cur:
-                    if user_id:
-                        cur.execute(
-                            """
-                            SELECT id, user_id, title, created_at, updated_at
-                            FROM chat_sessions
-                            WHERE id = %s AND user_id = %s
-                            """,
-                            (str(session_id), user_id),
-                        )
-                    else:
-                        cur.execute(
-                            """
-                            SELECT id, user_id, title, created_at, updated_at
-                            FROM chat_sessions
-                            WHERE id = %s
-                            """,
-                            (str(session_id),),
-                        )
-                    row = cur.fetchone()
-            if not row:
-                if self._fallback:
-                    return self._fallback.get_session(session_id, user_id=user_id)
-                return None
-            messages = self._get_messages(session_id)
-            return ChatSession(
-                session_id=_ensure_uuid(row["id"]),
-                user_id=row["user_id"],
-                title=row["title"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-                messages=messages,
-            )
+                session = self._load_session(conn, session_id, user_id)
+            if not session and self._fallback:
+                return self._fallback.get_session(session_id, user_id=user_id)
+            return session
         except POSTGRES_ERRORS:
             if self._fallback:
                 return self._fallback.get_session(session_id, user_id=user_id)
@@ -493,10 +715,19 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
     def append_message(
         self, session_id: UUID, message: ChatMessage, user_id: str | None = None
     ) -> ChatSession | None:
+        return self.append_messages(session_id, [message], user_id=user_id)
+
+    def append_messages(
+        self, session_id: UUID, messages: Sequence[ChatMessage], user_id: str | None = None
+    ) -> ChatSession | None:
+        if not messages:
+            return self.get_session(session_id, user_id=user_id)
         try:
             with self._connect() as conn:
                 supports_metadata = self._metadata_supported(conn)
                 with conn.cursor() as cur:
+                    if not self._synchronous_commit:
+                        cur.execute("SET LOCAL synchronous_commit TO off")
                     # Check if session exists (with or without user_id constraint)
                     if user_id:
                         cur.execute(
@@ -511,57 +742,121 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
 
                     if not cur.fetchone():
                         if self._fallback:
-                            fallback_session = self._fallback.append_message(
-                                session_id, message, user_id=user_id
+                            fallback_session = self._fallback.append_messages(
+                                session_id, messages, user_id=user_id
                             )
                             if fallback_session:
                                 return fallback_session
                         return None
 
-                    # Session exists, insert message with or without metadata
+                    # Session exists, insert all messages in one transaction
                     if supports_metadata:
-                        cur.execute(
+                        cur.executemany(
                             """
                             INSERT INTO chat_messages (
                                 id, session_id, role, content, metadata, created_at
                             )
                             VALUES (%s, %s, %s, %s, %s, %s)
                             """,
-                            (
-                                str(message.message_id),
-                                str(session_id),
-                                message.role,
-                                message.content,
-                                json.dumps(message.metadata, default=str),
-                                message.timestamp,
-                            ),
+                            [
+                                (
+                                    str(message.message_id),
+                                    str(session_id),
+                                    message.role,
+                                    message.content,
+                                    _dump_metadata(message.metadata),
+                                    message.timestamp,
+                                )
+                                for message in messages
+                            ],
                         )
                     else:
-                        cur.execute(
+                        cur.executemany(
                             """
                             INSERT INTO chat_messages (
                                 id, session_id, role, content, created_at
                             )
                             VALUES (%s, %s, %s, %s, %s)
                             """,
-                            (
-                                str(message.message_id),
-                                str(session_id),
-                                message.role,
-                                message.content,
-                                message.timestamp,
-                            ),
+                            [
+                                (
+                                    str(message.message_id),
+                                    str(session_id),
+                                    message.role,
+                                    message.content,
+                                    message.timestamp,
+                                )
+                                for message in messages
+                            ],
                         )
                     cur.execute(
                         "UPDATE chat_sessions SET updated_at = %s WHERE id = %s",
-                        (message.timestamp, str(session_id)),
+                        (messages[-1].timestamp, str(session_id)),
                     )
                 conn.commit()
-            return self.get_session(session_id, user_id=user_id)
+                return self._load_session(conn, session_id, user_id)
+        except POSTGRES_ERRORS:
+            if self._fallback:
+                return self._fallback.append_messages(session_id, messages, user_id=user_id)
+            raise
+
+    def delete_sessions(self, session_ids: Sequence[UUID], user_id: str | None = None) -> int:
+        if not session_ids:
+            return 0
+        ids = [_ensure_uuid(session_id) for session_id in session_ids]
+        owner = sql.SQL(" AND user_id = %s") if user_id else sql.SQL("")
+        params: tuple = (ids, user_id) if user_id else (ids,)
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        sql.SQL(
+                            "DELETE FROM chat_messages WHERE session_id IN "
+                            "(SELECT id FROM chat_sessions WHERE id = ANY(%s){})"
+                        ).format(owner),
+                        params,
+                    )
+                    cur.execute(
+                        sql.SQL(
+                            "DELETE FROM chat_sessions WHERE id = ANY(%s){} RETURNING id"
+                        ).format(owner),
+                        params,
+                    )
+                    deleted = {_ensure_uuid(row["id"]) for row in cur.fetchall()}
+                conn.commit()
         except POSTGRES_ERRORS:
             if self._fallback:
-                return self._fallback.append_message(session_id, message, user_id=user_id)
+                return self._fallback.delete_sessions(session_ids, user_id=user_id)
             raise
+        missing = [session_id for session_id in ids if session_id not in deleted]
+        if missing and self._fallback:
+            return len(deleted) + self._fallback.delete_sessions(missing, user_id=user_id)
+        return len(deleted)
+
+    def delete_all_sessions(self, user_id: str | None = None) -> int:
+        owner = sql.SQL(" WHERE user_id = %s") if user_id else sql.SQL("")
+        params = (user_id,) if user_id else ()
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        sql.SQL(
+                            "DELETE FROM chat_messages WHERE session_id IN "
+                            "(SELECT id FROM chat_sessions{})"
+                        ).format(owner),
+                        params,
+                    )
+                    cur.execute(sql.SQL("DELETE FROM chat_sessions{}").format(owner), params)
+                    deleted = cur.rowcount
+                conn.commit()
+        except POSTGRES_ERRORS:
+            if self._fallback:
+                return self._fallback.delete_all_sessions(user_id=user_id)
+            raise
+        # Sessions created while Postgres was unreachable live only in the fallback
+        if self._fallback:
+            deleted += self._fallback.delete_all_sessions(user_id=user_id)
+        return deleted
 
     def cleanup_request_messages(
         self, session_id: UUID, request_id: str, user_id: str | None = None
@@ -605,7 +900,7 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
                         (datetime.utcnow(), str(session_id)),
                     )
                 conn.commit()
-            return self.get_session(session_id, user_id=user_id)
+                return self._load_session(conn, session_id, user_id)
         except POSTGRES_ERRORS:
             if self._fallback:
                 return self._fallback.cleanup_request_messages(
@@ -613,31 +908,71 @@ class PostgresChatStore(PostgresStoreBase, ChatStore):
                 )
             raise
 
-    def _get_messages(self, session_id: UUID) -> list[ChatMessage]:
-        with self._connect() as conn:
-            supports_metadata = self._metadata_supported(conn)
-            with conn.cursor() as cur:
-                if supports_metadata:
-                    cur.execute(
-                        """
-                        SELECT id, role, content, metadata, created_at
-                        FROM chat_messages
-                        WHERE session_id = %s
-                        ORDER BY created_at ASC
-                        """,
-                        (str(session_id),),
-                    )
-                else:
-                    cur.execute(
-                        """
-                        SELECT id, role, content, created_at
-                        FROM chat_messages
-                        WHERE session_id = %s
-                        ORDER BY created_at ASC
-                        """,
-                        (str(session_id),),
-                    )
-                rows = cur.fetchall()
+    # Read helpers take the caller's connection so one store call borrows from the
+    # pool once instead of once per session and once more for its messages.
+
+    def _load_session(
+        self, conn: psycopg.Connection, session_id: UUID, user_id: str | None
+    ) -> ChatSession | None:
+        with conn.cursor() as cur:
+            if user_id:
+                cur.execute(
+                    """
+                    SELECT id, user_id, title, created_at, updated_at
+                    FROM chat_sessions
+                    WHERE id = %s AND user_id = %s
+                    """,
+                    (str(session_id), user_id),
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT id, user_id, title, created_at, updated_at
+                    FROM chat_sessions
+                    WHERE id = %s
+                    """,
+                    (str(session_id),),
+                )
+            row = cur.fetchone()
+        if not row:
+            return None
+        return self._session_from_row(conn, row)
+
+    def _session_from_row(self, conn: psycopg.Connection, row: dict) -> ChatSession:
+        session_id = _ensure_uuid(row["id"])
+        return ChatSession(
+            session_id=session_id,
+            user_id=row["user_id"],
+            title=row["title"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            messages=self._get_messages(conn, session_id),
+        )
+
+    def _get_messages(self, conn: psycopg.Connection, session_id: UUID) -> list[ChatMessage]:
+        supports_metadata = self._metadata_supported(conn)
+        with conn.cursor() as cur:
+            if supports_metadata:
+                cur.execute(
+                    """
+                    SELECT id, role, content, metadata, created_at
+                    FROM chat_messages
+                    WHERE session_id = %s
+                    ORDER BY created_at ASC
+                    """,
+                    (str(session_id),),
+                )
+            else:
+                cur.execute(
+                    """
+                    SELECT id, role, content, created_at
+                    FROM chat_messages
+                    WHERE session_id = %s
+                    ORDER BY created_at ASC
+                    """,
+                    (str(session_id),),
+                )
+            rows = cur.fetchall()
         messages: list[ChatMessage] = []
         for row in rows:
             metadata = row.get("metadata") or {}
@@ -730,8 +1065,8 @@ class PostgresSettingsStore(PostgresStoreBase, SettingsStore):
 
 
 class PostgresScannerStore(PostgresStoreBase, ScannerStore):
-    def __init__(self, dsn: str, fallback: ScannerStore | None = None) -> None:
-        super().__init__(dsn)
+    def __init__(self, pool: ConnectionPool, fallback: ScannerStore | None = None) -> None:
+        super().__init__(pool)
         self._fallback = fallback
 
     @staticmethod
@@ -38,6 +38,7 @@ class Agent:
     ) -> None:
         self.tools = tools or {}
         self.llm_client = llm_client
+        self.planner = Planner(llm_client=llm_client)
         self.repository = repository
         self.approval_store = approval_store
         self.runtime_settings = runtime_settings
@@ -81,8 +82,7 @@ class Agent:
         self.state = AgentState.RUNNING
         self.trace = []
         resolved_target = target or EntityRef(entity_type="Asset", display_name="unknown")
-        planner = Planner(llm_client=self.llm_client)
-        steps = planner.generate_plan(intent=intent, target=resolved_target)
+        steps = self.planner.generate_plan(intent=intent, target=resolved_target)
         if len(steps) > self.max_iterations:
             steps = steps[: self.max_iterations]
             self.trace.append({"event": "plan.truncated", "limit": self.max_iterations})
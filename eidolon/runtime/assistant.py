@@ -7,6 +7,7 @@ import sys
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
 from typing import Any
 
 from eidolon.config.settings import SandboxPermissions
@@ -40,8 +41,12 @@ INFRASTRUCTURE_TOOLS = {
 }
 
 
+@cache
 def detect_available_tools() -> dict[str, list[str]]:
-    """Detect which infrastructure tools are available on the system."""
+    """Detect which infrastructure tools are available on the system.
+
+    Probed once per process: each lookup walks ``PATH``, and the result is read-only.
+    """
     available = {}
     for category, tools in INFRASTRUCTURE_TOOLS.items():
         found = []
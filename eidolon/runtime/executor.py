@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 from collections.abc import Iterable
 
 from eidolon.config.settings import SandboxPermissions, get_settings
@@ -33,6 +34,7 @@ class ExecutionEngine:
         extra_tools: Iterable[Tool] | None = None,
     ) -> None:
         settings = runtime_settings or get_settings().sandbox
+        self.repository = repository
         self.runtime = SandboxRuntime(settings=settings)
         self.runtime.register_tool(TerminalTool())
         self.runtime.register_tool(BrowserTool())
@@ -44,6 +46,14 @@ class ExecutionEngine:
         for tool in extra_tools or []:
             self.runtime.register_tool(tool)
 
+    def for_request(self) -> ExecutionEngine:
+        """Engine for one request: the stateless tools are shared, the todo list is not."""
+        engine = copy.copy(self)
+        engine.runtime = SandboxRuntime(settings=self.runtime.settings)
+        for tool in self.runtime.active_tools.values():
+            engine.runtime.register_tool(TodoTool() if isinstance(tool, TodoTool) else tool)
+        return engine
+
     def _resolve_tool(self, step: PlanStep) -> str | None:
         if step.tool_hint:
             return step.tool_hint
@@ -4,13 +4,16 @@ import asyncio
 import queue
 import threading
 from collections import deque
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
+from functools import cached_property
 from typing import Any
 from uuid import UUID, uuid4
 
+import orjson
+
 
 @dataclass(frozen=True)
 class TaskEvent:
@@ -31,41 +34,108 @@ class TaskEvent:
             "timestamp": self.timestamp.isoformat(),
         }
 
+    @cached_property
+    def serialized(self) -> bytes:
+        """JSON encoding of :meth:`to_payload`, computed once and shared by all subscribers."""
+        return orjson.dumps(self.to_payload(), option=orjson.OPT_NON_STR_KEYS)
+
+
+class AsyncSubscriber(asyncio.Queue):
+    """Bounded event queue owned by one event loop that drops the oldest item on overflow.
+
+    ``dropped`` counts events discarded since the consumer last called :meth:`take_dropped`.
+    """
+
+    def __init__(self, maxsize: int, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(maxsize=maxsize)
+        self.loop = loop
+        self.dropped = 0
+
+    def offer(self, item: TaskEvent | None) -> None:
+        """Enqueue without blocking; must run on the subscriber's loop."""
+        try:
+            self.put_nowait(item)
+        except asyncio.QueueFull:
+            with suppress(asyncio.QueueEmpty):
+                self.get_nowait()
+                self.dropped += 1
+            with suppress(asyncio.QueueFull):
+                self.put_nowait(item)
+
+    def offer_many(self, items: Sequence[TaskEvent]) -> None:
+        for item in items:
+            self.offer(item)
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+def _deliver(subscriber: AsyncSubscriber, item: TaskEvent | None) -> None:
+    # asyncio queues are not thread-safe: publishers on worker threads (scans, plan
+    # execution) hand the event to the subscriber's loop instead of touching the queue.
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is subscriber.loop:
+        subscriber.offer(item)
+        return
+    with suppress(RuntimeError):  # loop already closed
+        subscriber.loop.call_soon_threadsafe(subscriber.offer, item)
+
+
+def _deliver_many(subscriber: AsyncSubscriber, items: Sequence[TaskEvent]) -> None:
+    # One loop wake-up for the whole batch rather than one per event
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is subscriber.loop:
+        subscriber.offer_many(items)
+        return
+    with suppress(RuntimeError):  # loop already closed
+        subscriber.loop.call_soon_threadsafe(subscriber.offer_many, items)
+
 
 class TaskEventBus:
-    def __init__(self, history_size: int = 200, queue_size: int = 200) -> None:
+    def __init__(self, history_size: int = 200, queue_size: int = 1024) -> None:
         self._history: deque[TaskEvent] = deque(maxlen=history_size)
         self._subscribers: set[queue.Queue[TaskEvent]] = set()
-        self._async_subscribers: set[asyncio.Queue[TaskEvent]] = set()
+        self._async_subscribers: set[AsyncSubscriber] = set()
         self._lock = threading.Lock()
         self._queue_size = queue_size
         self._shutdown = False
 
     def publish(self, event: TaskEvent) -> None:
+        self.publish_many((event,))
+
+    def publish_many(self, events: Sequence[TaskEvent]) -> None:
+        """Publish events in order, taking the lock and waking each subscriber once."""
+        if not events:
+            return
         with self._lock:
-            self._history.append(event)
+            self._history.extend(events)
             subscribers = list(self._subscribers)
             async_subscribers = list(self._async_subscribers)
 
         # Publish to sync subscribers
         for subscriber in subscribers:
-            try:
-                subscriber.put_nowait(event)
-            except queue.Full:
-                with suppress(queue.Empty):
-                    subscriber.get_nowait()
-                with suppress(queue.Full):
+            for event in events:
+                try:
                     subscriber.put_nowait(event)
+                except queue.Full:
+                    with suppress(queue.Empty):
+                        subscriber.get_nowait()
+                    with suppress(queue.Full):
+                        subscriber.put_nowait(event)
 
         # Publish to async subscribers
         for subscriber in async_subscribers:
-            try:
-                subscriber.put_nowait(event)
-            except asyncio.QueueFull:
-                with suppress(asyncio.QueueEmpty):
-                    subscriber.get_nowait()
-                with suppress(asyncio.QueueFull):
-                    subscriber.put_nowait(event)
+            if len(events) == 1:
+                _deliver(subscriber, events[0])
+            else:
+                _deliver_many(subscriber, events)
 
     def subscribe(self) -> queue.Queue[TaskEvent]:
         subscriber: queue.Queue[TaskEvent] = queue.Queue(maxsize=self._queue_size)
@@ -77,14 +147,14 @@ class TaskEventBus:
         with self._lock:
             self._subscribers.discard(subscriber)
 
-    def subscribe_async(self) -> asyncio.Queue[TaskEvent]:
+    def subscribe_async(self) -> AsyncSubscriber:
         """Subscribe with an async queue for proper cancellation support."""
-        subscriber: asyncio.Queue[TaskEvent] = asyncio.Queue(maxsize=self._queue_size)
+        subscriber = AsyncSubscriber(self._queue_size, asyncio.get_running_loop())
         with self._lock:
             self._async_subscribers.add(subscriber)
         return subscriber
 
-    def unsubscribe_async(self, subscriber: asyncio.Queue[TaskEvent]) -> None:
+    def unsubscribe_async(self, subscriber: AsyncSubscriber) -> None:
         with self._lock:
             self._async_subscribers.discard(subscriber)
 
@@ -98,8 +168,63 @@ class TaskEventBus:
             self._shutdown = True
             # Wake up all async subscribers with None sentinel
             for subscriber in self._async_subscribers:
-                with suppress(asyncio.QueueFull):
-                    subscriber.put_nowait(None)  # type: ignore
+                _deliver(subscriber, None)
+
+
+class TaskEventPump:
+    """Publish to a :class:`TaskEventBus` from a background thread.
+
+    ``publish`` only appends to a bounded deque; a daemon thread, started by the first
+    publish, drains it in batches through :meth:`TaskEventBus.publish_many`. When the
+    pump falls ``max_pending`` events behind, the oldest undelivered events are dropped.
+    """
+
+    def __init__(self, bus: TaskEventBus, max_pending: int = 4096) -> None:
+        self.bus = bus
+        self._pending: deque[TaskEvent] = deque(maxlen=max_pending)
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closing = False
+
+    def publish(self, event: TaskEvent) -> None:
+        with self._cond:
+            if not self._closing:
+                self._pending.append(event)
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="task-event-pump", daemon=True
+                    )
+                    self._thread.start()
+                self._cond.notify()
+                return
+        # Shutting down: deliver inline rather than start a second pump
+        self.bus.publish(event)
+
+    def close(self) -> None:
+        """Deliver everything pending and stop the thread; a later publish restarts it."""
+        with self._cond:
+            thread = self._thread
+            if thread is None:
+                return
+            self._closing = True
+            self._cond.notify()
+        thread.join()
+        with self._cond:
+            self._thread = None
+            self._closing = False
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closing)
+                batch = list(self._pending)
+                self._pending.clear()
+                closing = self._closing
+            if batch:
+                self.bus.publish_many(batch)
+            elif closing:
+                return
 
 
 task_event_bus = TaskEventBus()
+task_event_pump = TaskEventPump(task_event_bus)
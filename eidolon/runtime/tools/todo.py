@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import Any
 
 from eidolon.runtime.tools.base import Tool
@@ -13,6 +14,8 @@ class TodoTool(Tool):
     def __init__(self) -> None:
         self.items: list[dict[str, Any]] = []
         self._next_id = 1
+        # Plan steps without dependencies between them run on separate threads
+        self._lock = threading.Lock()
 
     @property
     def parameters_schema(self) -> dict[str, Any]:
@@ -67,6 +70,10 @@ class TodoTool(Tool):
         return item
 
     def run(self, payload: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            return self._run(payload)
+
+    def _run(self, payload: dict[str, Any]) -> dict[str, Any]:
         action = str(payload.get("action", "list")).lower()
 
         if action == "add":
@@ -1,44 +1,205 @@
 from __future__ import annotations
 
+import asyncio
+from types import SimpleNamespace
+
 from fastapi.testclient import TestClient
 
 from eidolon.api.app import create_app
-from eidolon.api.dependencies import get_graph_repository
+from eidolon.api.dependencies import (
+    get_audit_sink,
+    get_execution_engine,
+    get_graph_repository,
+    get_planner,
+)
+from eidolon.api.routes.plan import _generate_plan
+from eidolon.core.models.plan import EntityRef, ToolExecutionResult
+from eidolon.core.reasoning.llm import LiteLLMClient
+from eidolon.core.reasoning.planner import LLMPlanDraft, LLMPlanStep, Planner
+from eidolon.core.stores import InMemoryAuditStore
+from eidolon.runtime.executor import ExecutionEngine
 from eidolon.tests.conftest import InMemoryGraphRepository
+from eidolon.worker.audit_sink import AuditSink
 
 
 def test_plan_endpoint_generates_steps(planner_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = InMemoryGraphRepository
-    client = TestClient(app)
-
-    payload = {
-        "intent": "Explain how to isolate subnet X safely.",
-        "target": {
-            "entity_type": "NetworkContainer",
-            "display_name": "subnet-x",
-            "confidence": 0.7,
-        },
-    }
-
-    response = client.post("/plan/", json=payload, headers=planner_headers)
+    with TestClient(app) as client:
+        payload = {
+            "intent": "Explain how to isolate subnet X safely.",
+            "target": {
+                "entity_type": "NetworkContainer",
+                "display_name": "subnet-x",
+                "confidence": 0.7,
+            },
+        }
+
+        response = client.post("/plan/", json=payload, headers=planner_headers)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["steps"]
+        assert body["decision"]["effect"] in {"allow", "needs_approval"}
+
+
+def test_execute_requires_token_for_non_dry_run(executor_headers) -> None:
+    app = create_app()
+    with TestClient(app) as client:
+        response = client.post(
+            "/plan/execute",
+            json={
+                "dry_run": False,
+                "requires_approval": True,
+                "steps": [],
+            },
+            headers=executor_headers,
+        )
+        assert response.status_code == 403
+
+        response = client.post(
+            "/plan/execute",
+            json={"dry_run": False, "steps": [], "approval_token": "not-a-token"},
+            headers=executor_headers,
+        )
+        assert response.status_code == 403
+        assert response.json()["detail"] == "invalid approval token"
+
+
+def test_execute_dry_run_honours_step_dependencies(executor_headers) -> None:
+    app = create_app()
+    target = {"entity_type": "Asset", "display_name": "web-1"}
+    steps = [
+        {"step_id": "a", "action_type": "run_command", "target": target, "depends_on": []},
+        {"step_id": "b", "action_type": "open_url", "target": target, "depends_on": []},
+        {"step_id": "c", "action_type": "noop", "target": target, "depends_on": ["a", "b"]},
+    ]
+    with TestClient(app) as client:
+        response = client.post(
+            "/plan/execute",
+            json={"dry_run": True, "steps": steps},
+            headers=executor_headers,
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [result["step_id"] for result in results] == ["a", "b", "c"]
+        assert [result["status"] for result in results] == ["dry_run", "dry_run", "skipped"]
+
+        steps[0]["depends_on"] = ["c"]
+        response = client.post(
+            "/plan/execute",
+            json={"dry_run": True, "steps": steps},
+            headers=executor_headers,
+        )
+        assert response.status_code == 400
+
+
+class _RaisingEngine(ExecutionEngine):
+    def execute_step(self, step, dry_run=True):
+        if step.step_id == "boom":
+            raise RuntimeError("tool crashed")
+        return ToolExecutionResult(step_id=step.step_id, tool="terminal", status="ok")
+
+
+def test_execute_records_every_step_when_one_raises(executor_headers) -> None:
+    app = create_app()
+    audit_store = InMemoryAuditStore()
+    app.dependency_overrides[get_execution_engine] = lambda: _RaisingEngine(
+        InMemoryGraphRepository()
+    )
+    app.dependency_overrides[get_audit_sink] = lambda: AuditSink(audit_store)
+    target = {"entity_type": "Asset", "display_name": "web-1"}
+    steps = [
+        {"step_id": "boom", "action_type": "run_command", "target": target, "depends_on": []},
+        {"step_id": "ok", "action_type": "run_command", "target": target, "depends_on": []},
+        {"step_id": "after", "action_type": "run_command", "target": target},
+    ]
+    with TestClient(app) as client:
+        response = client.post(
+            "/plan/execute",
+            json={"dry_run": True, "steps": steps},
+            headers=executor_headers,
+        )
     assert response.status_code == 200
     body = response.json()
-    assert body["steps"]
-    assert body["decision"]["effect"] in {"allow", "needs_approval"}
+    assert body["status"] == "partial_failure"
+    assert [result["status"] for result in body["results"]] == ["error", "ok", "ok"]
+    assert body["results"][0]["error"] == "tool crashed"
 
+    (event,) = audit_store.list_all()
+    assert [result["step_id"] for result in event.details["results"]] == ["boom", "ok", "after"]
 
-def test_execute_requires_token_for_non_dry_run(executor_headers) -> None:
+
+def test_execute_skips_steps_waiting_on_a_raised_step(executor_headers) -> None:
     app = create_app()
-    client = TestClient(app)
-
-    response = client.post(
-        "/plan/execute",
-        json={
-            "dry_run": False,
-            "requires_approval": True,
-            "steps": [],
-        },
-        headers=executor_headers,
+    app.dependency_overrides[get_execution_engine] = lambda: _RaisingEngine(
+        InMemoryGraphRepository()
     )
-    assert response.status_code == 403
+    target = {"entity_type": "Asset", "display_name": "web-1"}
+    steps = [
+        {"step_id": "boom", "action_type": "run_command", "target": target},
+        {"step_id": "next", "action_type": "run_command", "target": target},
+    ]
+    with TestClient(app) as client:
+        response = client.post(
+            "/plan/execute",
+            json={"dry_run": True, "steps": steps},
+            headers=executor_headers,
+        )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["error", "skipped"]
+    assert results[1]["error"] == "dependency failed: boom"
+
+
+class _CountingLLMClient(LiteLLMClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate_structured(self, prompt, schema):
+        self.calls += 1
+        return LLMPlanDraft(steps=[LLMPlanStep(action_type="isolate", parameters={"a": 1})])
+
+
+def test_plan_cache_reuses_llm_plans() -> None:
+    client = _CountingLLMClient()
+    planner = Planner(llm_client=client)
+    target = EntityRef(entity_type="Asset", display_name="db-cache-test")
+
+    first = _generate_plan(planner, "Isolate DB", target)
+    second = _generate_plan(planner, "  isolate db ", target)
+
+    assert client.calls == 1
+    assert [step.action_type for step in second] == ["isolate"]
+    assert second[0].step_id != first[0].step_id
+    second[0].parameters["a"] = 2
+    assert _generate_plan(planner, "isolate db", target)[0].parameters == {"a": 1}
+
+
+def test_request_engines_share_tools_but_not_todo_state() -> None:
+    shared = ExecutionEngine(InMemoryGraphRepository())
+    first, second = shared.for_request(), shared.for_request()
+    assert first.runtime.active_tools["terminal"] is second.runtime.active_tools["terminal"]
+
+    first.runtime.active_tools["todo"].run({"action": "set", "items": ["scan"]})
+    assert second.runtime.active_tools["todo"].run({"action": "list"}) == {"items": []}
+    assert shared.runtime.active_tools["todo"].items == []
+
+
+def test_planner_and_engine_follow_overridden_dependencies() -> None:
+    app = create_app()
+    with TestClient(app):
+        request = SimpleNamespace(app=app)
+        state = app.state
+        assert asyncio.run(get_planner(request, state.llm_client)) is state.planner
+        shared = asyncio.run(get_execution_engine(request, state.graph_repository))
+        assert shared.repository is state.graph_repository
+
+        llm_client = _CountingLLMClient()
+        assert asyncio.run(get_planner(request, llm_client)).llm_client is llm_client
+        repository = InMemoryGraphRepository()
+        engine = asyncio.run(get_execution_engine(request, repository))
+        assert engine.runtime.active_tools["graph_query"].repository is repository
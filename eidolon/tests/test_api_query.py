@@ -6,56 +6,72 @@ from fastapi.testclient import TestClient
 
 from eidolon.api.app import create_app
 from eidolon.api.dependencies import get_graph_repository
+from eidolon.api.routes.query import NaturalLanguageQueryInterpreter, _match_rules
 from eidolon.core.models.graph import Edge, Node
 
 
 def test_query_path_endpoint(in_memory_repo, viewer_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
-    client = TestClient(app)
-
-    source = Node(label="Asset")
-    target = Node(label="Asset")
-    in_memory_repo.upsert_node(source)
-    in_memory_repo.upsert_node(target)
-    in_memory_repo.upsert_edge(
-        Edge(
-            type="CAN_REACH",
-            source=source.node_id,
-            target=target.node_id,
-            first_seen=datetime.utcnow(),
-            last_seen=datetime.utcnow(),
+    with TestClient(app) as client:
+        source = Node(label="Asset")
+        target = Node(label="Asset")
+        in_memory_repo.upsert_node(source)
+        in_memory_repo.upsert_node(target)
+        in_memory_repo.upsert_edge(
+            Edge(
+                type="CAN_REACH",
+                source=source.node_id,
+                target=target.node_id,
+                first_seen=datetime.utcnow(),
+                last_seen=datetime.utcnow(),
+            )
         )
-    )
 
-    response = client.post(
-        "/query/",
-        json={
-            "question": "find path",
-            "source_id": str(source.node_id),
-            "target_id": str(target.node_id),
-            "max_depth": 3,
-        },
-        headers=viewer_headers,
-    )
+        response = client.post(
+            "/query/",
+            json={
+                "question": "find path",
+                "source_id": str(source.node_id),
+                "target_id": str(target.node_id),
+                "max_depth": 3,
+            },
+            headers=viewer_headers,
+        )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["answer"] == "Path search completed."
-    assert data["paths"][0]["nodes"][0] == str(source.node_id)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["answer"] == "Path search completed."
+        assert data["paths"][0]["nodes"][0] == str(source.node_id)
 
 
 def test_nl_query_generates_cypher(in_memory_repo, viewer_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
-    client = TestClient(app)
-
-    response = client.post(
-        "/query/",
-        json={"question": "list assets in network 10.0.0.0/24"},
-        headers=viewer_headers,
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["graph_query"] is not None
-    assert "network" in data["graph_query"]["parameters"]
+    with TestClient(app) as client:
+        response = client.post(
+            "/query/",
+            json={"question": "list assets in network 10.0.0.0/24"},
+            headers=viewer_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["graph_query"] is not None
+        assert "network" in data["graph_query"]["parameters"]
+
+
+def test_rule_matcher_reports_overlapping_rules() -> None:
+    # The network capture swallows "from"; the path rule must still see it
+    matches = _match_rules("assets in network from a to b")
+    assert matches["network"].group("net") == "from"
+    assert (matches["path"].group("src"), matches["path"].group("dst")) == ("a", "b")
+
+
+def test_keyword_bits_match_substrings(in_memory_repo) -> None:
+    interpreter = NaturalLanguageQueryInterpreter(in_memory_repo)
+    governed = interpreter._parse_rules("Which assets are governed by a policy?")
+    assert governed.graph_query is not None
+    assert "GOVERNED_BY" in governed.graph_query.cypher
+    # "to" without "path" in the question is not a path query
+    plain = interpreter._parse_rules("Move from a to b")
+    assert plain.graph_query is None
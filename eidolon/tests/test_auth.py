@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+from eidolon.api.middleware import auth
+from eidolon.api.middleware.auth import _raw_bearer_token, build_identity_resolver
+from eidolon.config.settings import AuthSettings
+
+SECRET = "test-secret"  # noqa: S105
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _make_token(secret: str, claims: dict) -> str:
+    header = _b64(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64(json.dumps(claims).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256)
+    return f"{header}.{payload}.{_b64(signature.digest())}"
+
+
+def test_jwt_resolver_reuses_verified_identity() -> None:
+    settings = AuthSettings(mode="jwt", jwt_secret=SECRET)
+    resolve = build_identity_resolver(settings)
+    token = _make_token(SECRET, {"sub": "alice", "roles": ["planner"]})
+
+    first, error = resolve([], token)
+    second, _ = resolve([], token)
+
+    assert error is None
+    assert first is second
+    assert first.user_id == "alice"
+    assert first.has_role("planner")
+
+
+def test_jwt_resolver_rejects_bad_signature_and_expired() -> None:
+    settings = AuthSettings(mode="jwt", jwt_secret=SECRET)
+    resolve = build_identity_resolver(settings)
+
+    forged = _make_token("other", {"sub": "mallory"})
+    expired = _make_token(SECRET, {"sub": "alice", "exp": int(time.time()) - 10})
+
+    assert resolve([], forged) == (None, "invalid token signature")
+    assert resolve([], expired) == (None, "token expired")
+
+
+def test_jwt_cache_evicts_least_recently_used(monkeypatch) -> None:
+    monkeypatch.setattr(auth, "_VERIFIED_TOKEN_CACHE_SIZE", 2)
+    resolve = build_identity_resolver(AuthSettings(mode="jwt", jwt_secret=SECRET))
+    alice, bob, carol = (_make_token(SECRET, {"sub": name}) for name in ("a", "b", "c"))
+
+    first_alice, _ = resolve([], alice)
+    resolve([], bob)
+    resolve([], alice)  # refresh alice, so bob is the oldest entry
+    resolve([], carol)
+
+    assert resolve([], alice)[0] is first_alice
+
+
+def test_raw_bearer_token_accepts_any_whitespace() -> None:
+    for value in (b"Bearer abc", b"bearer\tabc", b"  Bearer   abc  "):
+        assert _raw_bearer_token([(b"authorization", value)]) == "abc"
+    for value in (b"Bearer", b"Bearer a b", b"Basic abc"):
+        assert _raw_bearer_token([(b"authorization", value)]) is None
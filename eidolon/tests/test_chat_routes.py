@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import threading
+import weakref
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from eidolon.api.app import create_app
+from eidolon.api.dependencies import get_graph_repository, get_llm_client
+from eidolon.api.routes import chat
+from eidolon.api.routes.chat import CancellationRegistry, CancellationToken, _stream_agent
+from eidolon.core.models.chat import ChatMessage
+from eidolon.core.reasoning.llm import LiteLLMClient, LLMResponse
+from eidolon.core.stores import InMemoryChatStore, InMemorySettingsStore
+from eidolon.tests.conftest import InMemoryGraphRepository
+
+
+class ScriptedLLMClient(LiteLLMClient):
+    def __init__(self, replies: list[str | Exception]) -> None:
+        super().__init__()
+        self.replies = list(replies)
+
+    def is_available(self) -> bool:
+        return True
+
+    def generate(self, *args, **kwargs) -> LLMResponse:
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return LLMResponse(content=reply, tool_calls=None, usage=None)
+
+
+def test_streamed_reply_is_persisted(in_memory_repo, viewer_headers) -> None:
+    app = create_app()
+    app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
+    app.dependency_overrides[get_llm_client] = lambda: ScriptedLLMClient(["hello there"])
+    with TestClient(app) as client:
+        session_id = client.post("/chat/sessions", json={}, headers=viewer_headers).json()[
+            "session_id"
+        ]
+        response = client.post(
+            f"/chat/sessions/{session_id}/messages?stream=true",
+            json={"content": "hi", "request_id": "req-1"},
+            headers=viewer_headers,
+        )
+        assert response.status_code == 200
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+        assert events[-1] == {"type": "done"}
+        assert events[0]["message"]["content"] == "hello there"
+        assert events[0]["message"]["metadata"]["request_id"] == "req-1"
+
+        session = client.get(f"/chat/sessions/{session_id}", headers=viewer_headers).json()
+        assert [msg["content"] for msg in session["messages"]] == ["hi", "hello there"]
+
+
+def test_stream_reports_agent_errors(in_memory_repo, viewer_headers) -> None:
+    app = create_app()
+    app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
+    app.dependency_overrides[get_llm_client] = lambda: ScriptedLLMClient([RuntimeError("down")])
+    with TestClient(app) as client:
+        session_id = client.post("/chat/sessions", json={}, headers=viewer_headers).json()[
+            "session_id"
+        ]
+        response = client.post(
+            f"/chat/sessions/{session_id}/messages?stream=true",
+            json={"content": "hi"},
+            headers=viewer_headers,
+        )
+        events = [json.loads(line) for line in response.text.splitlines() if line]
+        assert [event["type"] for event in events] == ["message", "done"]
+        assert events[0]["message"]["metadata"]["kind"] == "error"
+        assert "down" in events[0]["message"]["content"]
+
+
+def test_delete_all_sessions(executor_headers) -> None:
+    app = create_app()
+    with TestClient(app) as client:
+        for _ in range(3):
+            client.post("/chat/sessions", json={}, headers=executor_headers)
+        response = client.delete("/chat/sessions", headers=executor_headers)
+        assert response.status_code == 200
+        assert response.json() == {"status": "deleted", "deleted": 3}
+        assert client.get("/chat/sessions", headers=executor_headers).json() == []
+
+
+def test_scoped_cancellation_token_is_cleared_on_error() -> None:
+    registry = CancellationRegistry()
+    session_id = uuid4()
+    with pytest.raises(RuntimeError):
+        with registry.scoped(session_id, "req-1") as token:
+            assert registry.cancel(session_id, "req-1")
+            assert token.is_set()
+            raise RuntimeError("boom")
+
+    assert not registry.cancel(session_id, "req-1")
+
+
+class _ToolCallAgent:
+    def run_iter(self, history, cancellation_token=None):
+        yield ChatMessage(role="assistant", content="", metadata={"tool_calls": [{"id": "c1"}]})
+        yield ChatMessage(role="tool", content="ok")
+
+
+class _IdleRequest:
+    async def receive(self):
+        await asyncio.Event().wait()
+
+
+def test_stream_saves_tool_calls_before_sending_them() -> None:
+    store = InMemoryChatStore()
+    session = store.create_session(user_id="u1")
+    token = CancellationToken(
+        session.session_id, "req-1", CancellationRegistry(), threading.Event()
+    )
+
+    async def consume() -> list[bytes]:
+        lines = _stream_agent(
+            _ToolCallAgent(), session, store, "u1", "req-1", _IdleRequest(), token
+        )
+        first = await lines.__anext__()
+        # A concurrent cancel or newer message would read this session now
+        saved = store.get_session(session.session_id, user_id="u1")
+        assert saved.pending_tool_calls == [{"id": "c1"}]
+        return [first] + [line async for line in lines]
+
+    lines = asyncio.run(consume())
+    assert json.loads(lines[-1]) == {"type": "done"}
+    saved = store.get_session(session.session_id, user_id="u1")
+    assert [msg.role for msg in saved.messages] == ["assistant", "tool"]
+
+
+def test_system_prompt_cache_is_per_repository_object(monkeypatch) -> None:
+    built = []
+
+    def fake_build(tools, settings, repository):
+        built.append(repository)
+        return f"prompt {len(built)}"
+
+    monkeypatch.setattr(chat, "build_system_prompt", fake_build)
+    monkeypatch.setattr(chat, "_system_prompt_cache", weakref.WeakKeyDictionary())
+    settings_store = InMemorySettingsStore()
+    first = InMemoryGraphRepository()
+    sandbox = chat._build_sandbox(first, settings_store)
+
+    assert chat._system_prompt(sandbox, first) == "prompt 1"
+    assert chat._system_prompt(sandbox, first) == "prompt 1"
+    second = InMemoryGraphRepository()
+    assert chat._system_prompt(sandbox, second) == "prompt 2"
+
+    del first, sandbox
+    built.clear()
+    gc.collect()
+    assert list(chat._system_prompt_cache) == [second]
@@ -1,19 +1,268 @@
 from __future__ import annotations
 
+import io
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
 from eidolon.api.app import create_app
 from eidolon.api.dependencies import get_entity_resolver, get_graph_repository
+from eidolon.api.routes import collector
+from eidolon.api.routes.collector import _parse_target_range
+from eidolon.collectors.base import BaseCollector
+from eidolon.collectors.manager import CollectorManager
+from eidolon.collectors.network import NetworkCollector, ScanCancelledError
+from eidolon.core.models.event import CollectorEvent
+from eidolon.core.models.scanner import ScannerConfig
+from eidolon.core.reasoning.entity import EntityResolver
+from eidolon.core.stores import InMemoryAuditStore
 
 
 def test_collector_scan_route(in_memory_repo, planner_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
     app.dependency_overrides[get_entity_resolver] = get_entity_resolver
-    client = TestClient(app)
+    with TestClient(app) as client:
+        response = client.post("/collector/scan", headers=planner_headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["events_processed"] >= 0
+        assert data["status"] in {"ok", "partial_failure"}
+
+
+@pytest.mark.parametrize(
+    ("target", "expected"),
+    [
+        ("10.1.2.3", (0x0A010203, 0x0A010203)),
+        ("10.1.2.3/8", (0x0A000000, 0x0AFFFFFF)),
+        ("10.0.0.5-10.0.0.9", (0x0A000005, 0x0A000009)),
+        ("10.0.0.5-9", (0x0A000005, 0x0A000009)),
+    ],
+)
+def test_parse_target_range(target: str, expected: tuple[int, int]) -> None:
+    assert _parse_target_range(target) == expected
+
+
+@pytest.mark.parametrize("target", ["::1", "10.0.0.9-5", "010.0.0.1", "10.0.0.1/33"])
+def test_parse_target_range_rejects_invalid(target: str) -> None:
+    with pytest.raises(ValueError):
+        _parse_target_range(target)
+
+
+def test_stored_config_normalization_is_cached(monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(collector, "_validate_targets", calls.append)
+    config = ScannerConfig(network_cidrs=[" 10.0.0.0/24 "], port_preset="fast")
+
+    first = collector._normalize_stored_config("cache-user", config.model_copy(deep=True))
+    second = collector._normalize_stored_config("cache-user", config.model_copy(deep=True))
+    assert first.network_cidrs == second.network_cidrs == ["10.0.0.0/24"]
+    assert second.ports == [80, 443]
+    assert len(calls) == 1
+
+    collector._forget_normalized_config("cache-user")
+    collector._normalize_stored_config("cache-user", config.model_copy(deep=True))
+    assert len(calls) == 2
+
+
+def test_validate_targets_names_duplicate() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        collector._validate_targets(["10.0.0.1", " 10.0.0.2", "10.0.0.2 "])
+    assert exc_info.value.detail == "Duplicate target 10.0.0.2 is not allowed"
+
+
+def test_port_spec_collapses_consecutive_ports() -> None:
+    collector = NetworkCollector(cidrs=["10.0.0.0/24"], ports=[8080, 22, 21, 23, 80, 25, 22])
+    assert collector._build_port_spec() == ["-p", "21-23,25,80,8080"]
+
+
+def test_timing_flags_set_floors_only() -> None:
+    collector = NetworkCollector(cidrs=["10.0.0.0/24"], min_rate=500)
+    args: list[str] = []
+    collector._add_parallelism(args, 16)
+    collector._add_rate(args, collector.min_rate)
+    collector._add_rate(args, 0)
+    assert args == ["--min-parallelism", "16", "--min-rate", "500"]
+    # The rate floor is opt-in
+    assert NetworkCollector(cidrs=[]).min_rate == ScannerConfig().options.min_rate == 0
+
+
+class _BarrierCollector(BaseCollector):
+    def __init__(self, name: str, barrier: threading.Barrier, fail: bool = False) -> None:
+        super().__init__(name)
+        self.barrier = barrier
+        self.fail = fail
+
+    def collect(self):
+        # Only passes once every collector is running at the same time
+        self.barrier.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return [CollectorEvent(source_type=self.name, entity_type="Asset")]
+
+
+def test_run_all_runs_collectors_concurrently() -> None:
+    events: list[CollectorEvent] = []
+    manager = CollectorManager(emit_fn=events.append)
+    barrier = threading.Barrier(3)
+    for name, fail in (("a", False), ("b", False), ("c", True)):
+        manager.register(_BarrierCollector(name, barrier, fail=fail))
+
+    errors = manager.run_all()
+
+    assert [str(error) for error in errors] == ["c failed"]
+    assert sorted(event.source_type for event in events) == ["a", "b"]
+
+
+_NMAP_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap">
+  <host><status state="up" reason="arp-response"/>
+    <address addr="02:00:00:00:00:05" addrtype="mac" vendor="Acme"/>
+    <address addr="10.0.0.5" addrtype="ipv4"/>
+    <hostnames><hostname name="db.local" type="user"/></hostnames>
+    <ports><port protocol="tcp" portid="22"><state state="open" reason="syn-ack"/>
+      <service name="ssh" product="OpenSSH"/></port></ports>
+  </host>
+  <taskprogress task="Ping Scan" percent="50.00"/>
+  <host><status state="down" reason="no-response"/><address addr="10.0.0.6" addrtype="ipv4"/>
+  </host>
+  <runstats><finished time="1"/></runstats>
+</nmaprun>
+"""
+
+
+def test_nmap_parsers_stream_hosts() -> None:
+    network = NetworkCollector(cidrs=[])
+
+    sweep = network._parse_ping_sweep(io.BytesIO(_NMAP_XML.encode()), ["10.0.0.0/24"])
+    assert [(host["ip"], host["hostname"]) for host in sweep] == [("10.0.0.5", "db.local")]
+    assert (sweep[0]["mac_address"], sweep[0]["vendor"]) == ("02:00:00:00:00:05", "Acme")
+    by_name = network._parse_ping_sweep(io.BytesIO(_NMAP_XML.encode()), ["10.9.0.0/24", "db.local"])
+    assert by_name[0]["cidr"] == "db.local"
+
+    scanned = network._parse_port_scan(io.BytesIO(_NMAP_XML.encode()))
+    assert [host["ip"] for host in scanned] == ["10.0.0.5", "10.0.0.6"]
+    assert scanned[0]["ports"][0]["product"] == "OpenSSH"
+
+
+def test_ping_sweep_hosts_map_to_most_specific_target() -> None:
+    targets = ["10.0.0.0/16", "10.0.0.0/24", "10.1.0.1-20", "db.example"]
+    ranges = NetworkCollector._target_ranges(targets)
+    match = NetworkCollector._match_target
+    assert match("10.0.0.5", [], targets, ranges) == "10.0.0.0/24"
+    assert match("10.0.9.5", [], targets, ranges) == "10.0.0.0/16"
+    assert match("10.1.0.20", [], targets, ranges) == "10.1.0.1-20"
+    assert match("10.1.0.21", [], targets, ranges) is None
+    assert match("192.0.2.7", ["db.example"], targets, ranges) == "db.example"
+
+
+def test_nmap_output_streams_stdout_and_reports_failures() -> None:
+    # Stand in for nmap with the interpreter so the pipe handling runs for real
+    network = NetworkCollector(cidrs=[], nmap_path=sys.executable)
+    script = f"import sys; sys.stdout.write({_NMAP_XML!r})"
+    with network._nmap_output(["-c", script]) as stdout:
+        hosts = network._parse_port_scan(stdout)
+    assert [host["ip"] for host in hosts] == ["10.0.0.5", "10.0.0.6"]
+
+    failing = "import sys; sys.stderr.write('bad target'); sys.exit(1)"
+    with pytest.raises(RuntimeError, match="bad target"):
+        with network._nmap_output(["-c", failing]) as stdout:
+            network._parse_ping_sweep(stdout, ["10.0.0.0/24"])
+
+
+_FAKE_NMAP = """
+import ipaddress, sys
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+hosts = []
+for arg in sys.argv[1:]:
+    try:
+        hosts.append(str(ipaddress.ip_address(arg)))
+    except ValueError:
+        pass
+port = "" if "-sn" in sys.argv else (
+    '<ports><port protocol="tcp" portid="22"><state state="open"/></port></ports>'
+)
+print("<nmaprun>")
+for ip in hosts:
+    print(f'<host><status state="up"/><address addr="{ip}" addrtype="ipv4"/>{port}</host>')
+print("</nmaprun>")
+"""
+
+
+def _fake_nmap(tmp_path, extra: str = "") -> str:
+    fake_nmap = tmp_path / "nmap"
+    fake_nmap.write_text(f"#!{sys.executable}\n" + textwrap.dedent(_FAKE_NMAP) + extra)
+    fake_nmap.chmod(0o755)
+    return str(fake_nmap)
+
+
+def test_collect_sweeps_once_and_shards_port_scan(tmp_path) -> None:
+    targets = ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    network = NetworkCollector(cidrs=targets, ports=[22], nmap_path=_fake_nmap(tmp_path))
+
+    events = list(network.collect())
+
+    runs = (tmp_path / "nmap.log").read_text().splitlines()
+    assert sum("-sn" in run.split() for run in runs) == 1
+    assert len(runs) == 4
+    scanned = {event.payload["ip"]: event.payload for event in events[3:]}
+    assert sorted(scanned) == targets
+    assert all(payload["cidr"] == ip for ip, payload in scanned.items())
+    assert all(payload["ports"][0]["state"] == "open" for payload in scanned.values())
+    assert not network._active_processes
+
+
+def test_collect_surfaces_port_scan_shard_failure(tmp_path) -> None:
+    fake_nmap = _fake_nmap(tmp_path, "if '-sn' not in sys.argv:\n    sys.exit(3)\n")
+    network = NetworkCollector(cidrs=["10.0.0.1", "10.0.0.2"], ports=[22], nmap_path=fake_nmap)
+    with pytest.raises(RuntimeError, match=r"nmap failed \(3\)"):
+        list(network.collect())
+    assert not network._active_processes
+
+
+def test_scan_clears_registry_when_flush_fails(in_memory_repo, monkeypatch, caplog) -> None:
+    def broken_flush(self) -> None:
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(collector._ScanEventBatch, "flush", broken_flush)
+    collector._scan_registry.register("task-1")
+    with pytest.raises(RuntimeError, match="database down"):
+        collector._run_scan_sync(
+            task_id="task-1",
+            config={},
+            config_summary="",
+            repository=in_memory_repo,
+            resolver=EntityResolver(),
+            audit_store=InMemoryAuditStore(),
+        )
+
+    assert not collector._scan_registry.cancel("task-1")
+    assert "Failed to write the results of scan task-1" in caplog.text
+
+
+def test_shutdown_scans_cancels_running_scans(monkeypatch, caplog) -> None:
+    started = threading.Event()
+
+    def fake_scan(task_id: str, **kwargs) -> None:
+        started.set()
+        while not collector._scan_registry.is_cancelled(task_id):
+            time.sleep(0.01)
+        collector._scan_registry.clear(task_id)
+        raise ScanCancelledError("stopped")
+
+    monkeypatch.setattr(collector, "_run_scan_sync", fake_scan)
+    collector._scan_registry.register("task-2")
+    collector._submit_scan(task_id="task-2")
+    assert started.wait(timeout=5)
+
+    collector.shutdown_scans()
 
-    response = client.post("/collector/scan", headers=planner_headers)
-    assert response.status_code == 200
-    data = response.json()
-    assert data["events_processed"] >= 0
-    assert data["status"] in {"ok", "partial_failure"}
+    assert collector._scan_executor is None
+    assert not collector._scan_registry.cancel("task-2")
+    assert "Scan task-2 failed" in caplog.text
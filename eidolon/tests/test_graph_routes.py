@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from datetime import datetime
+from uuid import uuid4
+
 from fastapi.testclient import TestClient
 
 from eidolon.api.app import create_app
@@ -10,36 +13,84 @@ from eidolon.core.models.graph import Edge, Node
 def test_graph_assets_endpoints(in_memory_repo, viewer_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
-    client = TestClient(app)
-
-    asset = Node(label="Asset")
-    in_memory_repo.upsert_node(asset)
+    with TestClient(app) as client:
+        asset = Node(label="Asset")
+        in_memory_repo.upsert_node(asset)
 
-    resp = client.get(f"/graph/assets/{asset.node_id}", headers=viewer_headers)
-    assert resp.status_code == 200
-    assert resp.json()["label"] == "Asset"
+        resp = client.get(f"/graph/assets/{asset.node_id}", headers=viewer_headers)
+        assert resp.status_code == 200
+        assert resp.json()["label"] == "Asset"
 
-    resp_list = client.get("/graph/assets", headers=viewer_headers)
-    assert resp_list.status_code == 200
-    assert len(resp_list.json()) >= 1
+        resp_list = client.get("/graph/assets", headers=viewer_headers)
+        assert resp_list.status_code == 200
+        assert len(resp_list.json()) >= 1
 
 
 def test_graph_paths_endpoint(in_memory_repo, viewer_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
-    client = TestClient(app)
-
-    a = Node(label="Asset")
-    b = Node(label="Asset")
-    in_memory_repo.upsert_node(a)
-    in_memory_repo.upsert_node(b)
-    in_memory_repo.upsert_edge(Edge(type="CAN_REACH", source=a.node_id, target=b.node_id))
-
-    resp = client.get(
-        "/graph/paths",
-        params={"source_id": str(a.node_id), "target_id": str(b.node_id), "max_depth": 3},
-        headers=viewer_headers,
+    with TestClient(app) as client:
+        a = Node(label="Asset")
+        b = Node(label="Asset")
+        in_memory_repo.upsert_node(a)
+        in_memory_repo.upsert_node(b)
+        in_memory_repo.upsert_edge(Edge(type="CAN_REACH", source=a.node_id, target=b.node_id))
+
+        resp = client.get(
+            "/graph/paths",
+            params={"source_id": str(a.node_id), "target_id": str(b.node_id), "max_depth": 3},
+            headers=viewer_headers,
+        )
+        assert resp.status_code == 200
+        paths = resp.json()
+        assert paths and paths[0]["nodes"][0] == str(a.node_id)
+
+
+def test_graph_overview_single_round_trip(in_memory_repo, viewer_headers, monkeypatch) -> None:
+    a, b, stray = uuid4(), uuid4(), uuid4()
+    calls = []
+
+    def run_cypher(cypher, parameters=None):
+        calls.append(parameters)
+        return [
+            {
+                "nodes": [
+                    {"node_id": str(a), "label": "Asset", "metadata": '{"ip": "10.0.0.1"}'},
+                    {"node_id": str(b), "label": "NetworkContainer", "cidr": "10.0.0.0/24"},
+                ],
+                "edges": [
+                    {"source": str(a), "target": str(b), "type": "MEMBER_OF"},
+                    {"source": str(a), "target": str(stray), "type": "CAN_REACH"},
+                ],
+            }
+        ]
+
+    monkeypatch.setattr(in_memory_repo, "run_cypher", run_cypher)
+    app = create_app()
+    app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
+    with TestClient(app) as client:
+        resp = client.get("/graph/overview", headers=viewer_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+
+    assert len(calls) == 1
+    assert [node["name"] for node in data["nodes"]] == ["10.0.0.1", "10.0.0.0/24"]
+    assert data["edges"] == [
+        {"source": str(a), "target": str(b), "type": "MEMBER_OF", "confidence": None}
+    ]
+
+
+def test_graph_query_encodes_records(in_memory_repo, viewer_headers, monkeypatch) -> None:
+    collected_at = datetime(2024, 1, 2, 3, 4, 5)
+    monkeypatch.setattr(
+        in_memory_repo,
+        "run_cypher",
+        lambda cypher, parameters=None: [{"n": 1, "seen": collected_at}],
     )
+    app = create_app()
+    app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
+    with TestClient(app) as client:
+        resp = client.post("/graph/query", json={"cypher": "RETURN 1"}, headers=viewer_headers)
+
     assert resp.status_code == 200
-    paths = resp.json()
-    assert paths and paths[0]["nodes"][0] == str(a.node_id)
+    assert resp.json() == {"records": [{"n": 1, "seen": "2024-01-02T03:04:05"}]}
@@ -7,29 +7,74 @@ from fastapi.testclient import TestClient
 from eidolon.api.app import create_app
 from eidolon.api.dependencies import get_entity_resolver, get_graph_repository
 from eidolon.core.models.event import CollectorEvent
+from eidolon.core.reasoning.entity import EntityResolver
+from eidolon.worker.ingest import IngestWorker, partition_events
+from eidolon.worker.ingest_queue import IngestQueue
 
 
 def test_ingest_events(in_memory_repo, executor_headers) -> None:
     app = create_app()
     app.dependency_overrides[get_graph_repository] = lambda: in_memory_repo
     app.dependency_overrides[get_entity_resolver] = get_entity_resolver
-    client = TestClient(app)
+    with TestClient(app) as client:
+        event = CollectorEvent(
+            source_type="network",
+            source_id="ingest-test",
+            entity_type="Asset",
+            payload={"ip": "10.0.0.10", "cidr": "10.0.0.0/24"},
+            collected_at=datetime.utcnow(),
+        )
 
-    event = CollectorEvent(
+        response = client.post(
+            "/ingest/events",
+            json=[event.model_dump(mode="json")],
+            headers=executor_headers,
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["accepted"] == 1
+        assert len(in_memory_repo.nodes) == 2
+        assert any(edge.type == "MEMBER_OF" for edge in in_memory_repo.edges)
+
+
+def test_partition_events_keeps_related_events_together() -> None:
+    def asset(**payload) -> CollectorEvent:
+        return CollectorEvent(source_type="network", entity_type="Asset", payload=payload)
+
+    first = asset(ip="10.0.0.1")
+    alias = asset(ip="10.0.0.1", hostname="db")
+    renamed = asset(hostname="db", cidr="10.0.0.0/24")
+    network = CollectorEvent(
+        source_type="network", entity_type="NetworkContainer", payload={"cidr": "10.0.0.0/24"}
+    )
+    unrelated = asset(ip="10.0.1.1")
+    edge = CollectorEvent(
         source_type="network",
-        source_id="ingest-test",
-        entity_type="Asset",
-        payload={"ip": "10.0.0.10", "cidr": "10.0.0.0/24"},
-        collected_at=datetime.utcnow(),
+        entity_type="Edge",
+        payload={"type": "CAN_REACH", "source": "10.0.0.1", "target": "10.0.1.1"},
     )
 
-    response = client.post(
-        "/ingest/events",
-        json=[event.model_dump(mode="json")],
-        headers=executor_headers,
+    chunks, edges = partition_events(
+        [first, edge, unrelated, alias, network, renamed], chunk_size=1
     )
-    assert response.status_code == 200
-    body = response.json()
-    assert body["accepted"] == 1
-    assert len(in_memory_repo.nodes) == 2
-    assert any(edge.type == "MEMBER_OF" for edge in in_memory_repo.edges)
+
+    assert edges == [edge]
+    assert chunks == [[first, alias, network, renamed], [unrelated]]
+
+
+def test_ingest_queue_drains_on_close(in_memory_repo) -> None:
+    worker = IngestWorker(in_memory_repo, EntityResolver())
+    ingest_queue = IngestQueue(worker, batch_size=2, max_pending=3)
+    ingest_queue.start()
+    for index in range(5):
+        ingest_queue.put(
+            CollectorEvent(
+                source_type="network",
+                entity_type="Asset",
+                payload={"ip": f"10.0.2.{index}"},
+            )
+        )
+    ingest_queue.close()
+
+    assert ingest_queue.errors == []
+    assert len(in_memory_repo.nodes) == 5
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from eidolon.api.middleware.rate_limit import SlidingWindowLimiter
+
+
+def test_limiter_blocks_after_capacity() -> None:
+    limiter = SlidingWindowLimiter(capacity=2, window_seconds=60)
+
+    assert limiter.allow("client")[0]
+    assert limiter.allow("client")[0]
+    allowed, reset_at = limiter.allow("client")
+    assert not allowed
+    assert reset_at == limiter.reset_at("client")
+    assert limiter.allow("other")[0]
+
+
+def test_limiter_evicts_least_recent_key() -> None:
+    limiter = SlidingWindowLimiter(capacity=5, window_seconds=60, max_keys=2)
+
+    limiter.allow("a")
+    limiter.allow("b")
+    limiter.allow("a")
+    limiter.allow("c")
+
+    assert list(limiter.buckets) == ["a", "c"]
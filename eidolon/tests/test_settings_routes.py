@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from eidolon.api.app import create_app
+from eidolon.api.dependencies import get_settings_store
+from eidolon.core.stores import InMemorySettingsStore
+
+
+def test_llm_client_is_only_rebuilt_when_llm_settings_change(executor_headers) -> None:
+    app = create_app()
+    store = InMemorySettingsStore()
+    app.dependency_overrides[get_settings_store] = lambda: store
+    with TestClient(app) as client:
+        llm_client = app.state.llm_client
+        response = client.put(
+            "/settings/", json={"theme": {"mode": "light"}}, headers=executor_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["theme"] == {"mode": "light"}
+        assert app.state.llm_client is llm_client
+
+        response = client.put(
+            "/settings/", json={"llm": {"max_tokens": 4096}}, headers=executor_headers
+        )
+        assert response.status_code == 200
+        assert app.state.llm_client is not llm_client
+        assert app.state.llm_client.settings.max_tokens == 4096
+        assert app.state.planner.llm_client is app.state.llm_client
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from uuid import UUID
+
+from eidolon.core.models.chat import ChatMessage
+from eidolon.core.models.event import AuditEvent
+from eidolon.core.stores import AuditStore, InMemoryAuditStore, InMemoryChatStore
+from eidolon.db.postgres.store import _dump_metadata
+from eidolon.worker.audit_sink import AuditSink
+
+
+def test_audit_truncate_reports_deleted_count() -> None:
+    store = InMemoryAuditStore()
+    for _ in range(3):
+        store.add(AuditEvent(event_type="scan", details={}))
+
+    assert store.truncate() == 3
+    assert store.list_all() == []
+
+
+def test_audit_list_filtered_with_count_pages_matches() -> None:
+    store = InMemoryAuditStore()
+    for index in range(5):
+        store.add(AuditEvent(event_type="scan" if index % 2 == 0 else "plan", details={}))
+
+    events, total = store.list_filtered_with_count(page=2, page_size=2, event_type="scan")
+
+    assert total == 3
+    assert len(events) == 1
+    assert events[0].event_type == "scan"
+
+
+def test_audit_iter_filtered_pages_through_matches() -> None:
+    store = InMemoryAuditStore()
+    for index in range(7):
+        store.add(AuditEvent(event_type="scan" if index % 2 == 0 else "plan", details={}))
+
+    expected = store.list_filtered(page_size=10, event_type="scan")
+    paged = list(AuditStore.iter_filtered(store, event_type="scan", chunk_size=2))
+
+    assert len(expected) == 4
+    assert paged == expected
+    assert list(store.iter_filtered(event_type="scan")) == expected
+
+
+def test_audit_sink_flushes_queued_events_on_close() -> None:
+    store = InMemoryAuditStore()
+    sink = AuditSink(store, batch_size=4, flush_interval=60)
+    sink.start()
+    for _ in range(6):
+        sink.add(AuditEvent(event_type="execution", details={}))
+    sink.close()
+
+    assert len(store.list_all()) == 6
+    sink.add(AuditEvent(event_type="execution", details={}))
+    assert len(store.list_all()) == 7
+
+
+class _FlakyBatchAuditStore(InMemoryAuditStore):
+    def add_many(self, events) -> None:
+        raise RuntimeError("batch insert failed")
+
+
+def test_audit_sink_falls_back_to_single_writes() -> None:
+    store = _FlakyBatchAuditStore()
+    sink = AuditSink(store, batch_size=4, flush_interval=60)
+    sink.start()
+    for _ in range(3):
+        sink.add(AuditEvent(event_type="execution", details={}))
+    sink.close()
+
+    assert len(store.list_all()) == 3
+
+
+def test_chat_session_tracks_request_id_and_pending_tool_calls() -> None:
+    store = InMemoryChatStore()
+    session = store.create_session(user_id="alice")
+    calls = [{"id": "call-1", "name": "terminal"}]
+    store.append_message(
+        session.session_id,
+        ChatMessage(role="user", content="hi", metadata={"request_id": "req-1"}),
+        user_id="alice",
+    )
+    session = store.append_message(
+        session.session_id,
+        ChatMessage(role="assistant", content="", metadata={"tool_calls": calls}),
+        user_id="alice",
+    )
+
+    assert session.last_request_id == "req-1"
+    assert session.pending_tool_calls == calls
+    assert session.has_pending_request
+
+    session = store.cleanup_request_messages(session.session_id, "req-1", user_id="alice")
+
+    assert session.last_request_id is None
+    assert session.pending_tool_calls == calls
+
+
+def test_chat_session_settled_by_plain_assistant_reply() -> None:
+    store = InMemoryChatStore()
+    session = store.create_session()
+    session = store.append_message(session.session_id, ChatMessage(role="user", content="hi"))
+    assert session.has_pending_request
+
+    session = store.append_message(
+        session.session_id, ChatMessage(role="assistant", content="hello")
+    )
+    assert not session.has_pending_request
+
+
+def test_chat_metadata_dump_matches_json_default_str() -> None:
+    metadata = {
+        "at": datetime(2024, 1, 2, 3, 4, 5),
+        "id": UUID(int=5),
+        "wide": 2**70,
+        1: "int key",
+    }
+
+    assert json.loads(_dump_metadata(metadata)) == json.loads(json.dumps(metadata, default=str))
+    assert json.loads(_dump_metadata({"at": metadata["at"]})) == {"at": "2024-01-02 03:04:05"}
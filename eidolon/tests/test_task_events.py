@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from eidolon.runtime.task_events import TaskEvent, TaskEventBus, TaskEventPump
+
+
+async def test_async_subscriber_drops_oldest_and_counts() -> None:
+    bus = TaskEventBus(queue_size=2)
+    subscriber = bus.subscribe_async()
+
+    for index in range(4):
+        bus.publish(TaskEvent(event_type=f"event-{index}", status="running"))
+
+    assert subscriber.take_dropped() == 2
+    assert subscriber.take_dropped() == 0
+    assert (await subscriber.get()).event_type == "event-2"
+    assert (await subscriber.get()).event_type == "event-3"
+
+
+async def test_publish_from_worker_thread_reaches_loop_subscriber() -> None:
+    bus = TaskEventBus()
+    subscriber = bus.subscribe_async()
+
+    thread = threading.Thread(target=bus.publish, args=(TaskEvent("scan", "complete"),))
+    thread.start()
+    thread.join()
+
+    event = await asyncio.wait_for(subscriber.get(), timeout=1.0)
+    assert event.event_type == "scan"
+
+
+async def test_publish_many_preserves_order_across_threads() -> None:
+    bus = TaskEventBus()
+    subscriber = bus.subscribe_async()
+    events = [TaskEvent(event_type=f"line-{index}", status="progress") for index in range(5)]
+
+    thread = threading.Thread(target=bus.publish_many, args=(events,))
+    thread.start()
+    thread.join()
+
+    received = [await asyncio.wait_for(subscriber.get(), timeout=1.0) for _ in events]
+    assert [event.event_type for event in received] == [event.event_type for event in events]
+    assert list(bus.history()) == events
+
+
+def test_pump_delivers_in_order_before_close_returns() -> None:
+    bus = TaskEventBus()
+    pump = TaskEventPump(bus)
+    events = [TaskEvent(event_type=f"step-{index}", status="ok") for index in range(10)]
+    for event in events:
+        pump.publish(event)
+    pump.close()
+    assert list(bus.history()) == events
+
+    # A publish after close starts a fresh pump
+    pump.publish(TaskEvent(event_type="again", status="ok"))
+    pump.close()
+    assert list(bus.history())[-1].event_type == "again"
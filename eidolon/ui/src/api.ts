@@ -171,6 +171,7 @@ export type CollectorRunResponse = {
 export type ScannerOptions = {
   ping_concurrency: number;
   port_scan_workers: number;
+  min_rate: number;
   dns_resolution: boolean;
   aggressive: boolean;
 };
@@ -35,6 +35,7 @@ const DEFAULT_CONFIG: ScannerConfig = {
   options: {
     ping_concurrency: 128,
     port_scan_workers: 32,
+    min_rate: 0,
     dns_resolution: true,
     aggressive: false,
   },
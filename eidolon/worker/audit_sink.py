@@ -0,0 +1,107 @@
+"""Background writer that persists audit events in batches."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+
+from eidolon.core.models.event import AuditEvent
+from eidolon.core.stores import AuditStore
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class AuditSink:
+    """Queue audit events and write them from one thread with ``AuditStore.add_many``.
+
+    A batch is flushed once ``batch_size`` events are waiting or ``flush_interval``
+    seconds after its first event arrived. When the queue is full, or the sink is not
+    running, events are written synchronously instead of being dropped. A batch whose
+    ``add_many`` fails is retried event by event; only events that still fail are lost.
+    """
+
+    def __init__(
+        self,
+        audit_store: AuditStore,
+        batch_size: int = 64,
+        flush_interval: float = 0.02,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.audit_store = audit_store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+            self._thread.start()
+
+    def add(self, event: AuditEvent) -> None:
+        if self._thread is not None:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except queue.Full:
+                pass
+        self.audit_store.add(event)
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+        # Events a concurrent add() queued behind the stop marker
+        leftovers: list[AuditEvent] = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftovers:
+            self._write(leftovers)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch: list[AuditEvent] = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else None
+                except queue.Empty:
+                    item = None
+                if item is None:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch: list[AuditEvent]) -> None:
+        try:
+            self.audit_store.add_many(batch)
+            return
+        except Exception:
+            logger.warning(
+                "Batch write of %d audit events failed; writing them one at a time",
+                len(batch),
+                exc_info=True,
+            )
+        for event in batch:
+            try:
+                self.audit_store.add(event)
+            except Exception:
+                logger.exception("Failed to write audit event %s", event.audit_id)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from typing import Any
 from uuid import NAMESPACE_URL, UUID, uuid5
 
@@ -269,3 +269,66 @@ class IngestWorker:
     def process(self, events: Iterable[CollectorEvent]) -> None:
         for event in events:
             self.process_event(event)
+
+
+def _event_keys(event: CollectorEvent) -> list[tuple[str, str]]:
+    """Graph lookups an event's read-merge-write can touch, as used by :class:`IngestWorker`."""
+    payload = event.payload or {}
+    if event.entity_type == "Asset":
+        keys = [
+            ("asset", str(payload[key])) for key in ("ip", "hostname", "mac") if payload.get(key)
+        ]
+        cidr = payload.get("cidr") or payload.get("network_cidr")
+        if cidr:
+            keys.append(("network", str(cidr)))
+        return keys
+    if event.entity_type == "NetworkContainer" and payload.get("cidr"):
+        return [("network", str(payload["cidr"]))]
+    if event.entity_type == "Identity" and payload.get("name"):
+        return [("identity", str(payload["name"]))]
+    return []
+
+
+def partition_events(
+    events: Sequence[CollectorEvent], chunk_size: int = 32
+) -> tuple[list[list[CollectorEvent]], list[CollectorEvent]]:
+    """Split events into independent node chunks plus the edge events that must follow them.
+
+    Node events that may resolve to the same graph node (shared identifier, CIDR or
+    identity name, directly or transitively) land in the same chunk in their original
+    order, so chunks can be processed concurrently without racing on a merge. Edge
+    events resolve references to nodes and are returned separately, to run afterwards.
+    """
+    node_events: list[CollectorEvent] = []
+    edge_events: list[CollectorEvent] = []
+    for event in events:
+        (edge_events if event.entity_type == "Edge" else node_events).append(event)
+
+    parent = list(range(len(node_events)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    owners: dict[tuple[str, str], int] = {}
+    for index, event in enumerate(node_events):
+        for key in _event_keys(event):
+            owner = owners.setdefault(key, index)
+            parent[find(index)] = find(owner)
+
+    groups: dict[int, list[CollectorEvent]] = {}
+    for index, event in enumerate(node_events):
+        groups.setdefault(find(index), []).append(event)
+
+    chunks: list[list[CollectorEvent]] = []
+    current: list[CollectorEvent] = []
+    for group in groups.values():
+        current.extend(group)
+        if len(current) >= chunk_size:
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks, edge_events
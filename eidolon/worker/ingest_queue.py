@@ -0,0 +1,93 @@
+"""Background ingestion so collectors are not blocked on graph writes."""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from eidolon.core.models.event import CollectorEvent
+from eidolon.worker.ingest import IngestWorker
+
+logger = logging.getLogger(__name__)
+
+
+class IngestQueue:
+    """Bounded hand-off from a collector's ``emit_fn`` to an :class:`IngestWorker`.
+
+    Double-buffered: collectors append to the active buffer while one thread ingests
+    the other, and the two are swapped under a lock whenever the drain is ready for
+    more. A swap happens once ``batch_size`` events are waiting or ``flush_interval``
+    seconds after the first one arrived. ``put`` blocks once ``max_pending`` events
+    are waiting, which keeps memory bounded when the graph falls behind. Failures are
+    collected in ``errors`` instead of stopping the drain.
+    """
+
+    def __init__(
+        self,
+        worker: IngestWorker,
+        batch_size: int = 256,
+        flush_interval: float = 0.05,
+        max_pending: int = 10_000,
+    ) -> None:
+        self.worker = worker
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.errors: list[Exception] = []
+        self._active: list[CollectorEvent] = []
+        self._lock = threading.Lock()
+        self._filled = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._closing = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._closing = False
+            self._thread = threading.Thread(target=self._run, name="ingest-queue", daemon=True)
+            self._thread.start()
+
+    def put(self, event: CollectorEvent) -> None:
+        with self._lock:
+            while len(self._active) >= self.max_pending:
+                self._drained.wait()
+            self._active.append(event)
+            pending = len(self._active)
+            if pending == 1 or pending >= self.batch_size:
+                self._filled.notify()
+
+    def close(self) -> None:
+        """Wait until every queued event has been ingested, then stop the thread."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self._lock:
+            self._closing = True
+            self._filled.notify()
+        thread.join()
+
+    def _batch_ready(self) -> bool:
+        return len(self._active) >= self.batch_size or self._closing
+
+    def _run(self) -> None:
+        spare: list[CollectorEvent] = []
+        while True:
+            with self._lock:
+                self._filled.wait_for(lambda: self._active or self._closing)
+                self._filled.wait_for(self._batch_ready, timeout=self.flush_interval)
+                batch, self._active = self._active, spare
+                done = self._closing and not batch
+                self._drained.notify_all()
+            if done:
+                return
+            self._ingest(batch)
+            batch.clear()
+            spare = batch
+
+    def _ingest(self, batch: list[CollectorEvent]) -> None:
+        for event in batch:
+            try:
+                self.worker.process_event(event)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to ingest event %s: %s", event.event_id, exc)
+                self.errors.append(exc)
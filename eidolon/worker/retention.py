@@ -21,7 +21,8 @@ class RetentionWorker:
         self._running = True
         while self._running:
             try:
-                deleted = self.cleanup()
+                # The store call is blocking I/O; keep it off the event loop.
+                deleted = await asyncio.to_thread(self.cleanup)
                 if deleted > 0:
                     print(
                         "[RetentionWorker] Deleted "